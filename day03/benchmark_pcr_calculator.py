@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the PCR calculator package.
+
+Times the scalar and batch volume calculations, the plate, fixed-point and
+CLI batch paths, CLI cold start (interpreter + imports + argparse) and the
+day02 GUI's time to first window. Results can be written as JSON and
+compared against a baseline JSON file; any benchmark slower than the
+baseline by more than the tolerance makes the run exit with status 1.
+
+Usage:
+    python benchmark_pcr_calculator.py --json results.json
+    python benchmark_pcr_calculator.py --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from pcr_calculator import PCRCalculator
+from pcr_batch import PRESET_NAMES
+from pcr_batch_runner import INPUT_FIELDS, run_batch
+from pcr_fixed_point import FixedPointEngine
+from plate_planner import PlatePlanner, Well, well_names
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GUI_DIR = os.path.join(os.path.dirname(HERE), "day02")
+
+# Benchmarks that may be skipped (no display); any other one without a
+# timing fails the run
+SKIPPABLE = ("gui_first_window",)
+
+# Builds the day02 GUI and exits once the first window has been drawn
+GUI_SCRIPT = (
+    "import tkinter as tk\n"
+    "from pcr_calculator_gui import PCRCalculatorGUI\n"
+    "root = tk.Tk()\n"
+    "PCRCalculatorGUI(root)\n"
+    "root.update()\n"
+    "root.destroy()\n"
+)
+
+
+def make_plate(num_wells, seed=0):
+    """Build random columnar inputs for a plate with mixed parameters."""
+    rng = np.random.default_rng(seed)
+    return {
+        "num_reactions": rng.integers(1, 4, num_wells).astype(np.float64),
+        "preset": rng.choice(PRESET_NAMES, num_wells),
+        "primer_concentration": rng.choice([np.nan, 5.0, 10.0, 20.0], num_wells),
+        "reaction_volume": rng.choice([np.nan, 15.0, 20.0, 25.0], num_wells),
+        "template_dna_ng": rng.choice([np.nan, 10.0, 50.0], num_wells),
+        "template_dna_concentration": rng.choice([np.nan, 20.0, 100.0], num_wells),
+    }
+
+
+def _rows(columns):
+    """Convert columnar inputs to calculate_volumes keyword dicts (NaN -> None)."""
+    return [
+        {name: (None if isinstance(value, float) and value != value else value)
+         for name, value in zip(columns, values)}
+        for values in zip(*(column.tolist() for column in columns.values()))
+    ]
+
+
+def _best(func, repeat):
+    """Return the fastest of several timed calls in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_scalar(columns, repeat=1):
+    """Time calculate_volumes called once per well."""
+    rows = _rows(columns)
+
+    def run():
+        for row in rows:
+            try:
+                PCRCalculator.calculate_volumes(**row)
+            except ValueError:
+                pass
+    return _best(run, repeat)
+
+
+def bench_batch(columns, repeat=1):
+    """Time a single calculate_volumes_batch call over all wells."""
+    return _best(lambda: PCRCalculator.calculate_volumes_batch(**columns), repeat)
+
+
+def bench_fixed_point(columns, repeat=1):
+    """Time the integer nanoliter engine over all wells."""
+    engine = FixedPointEngine()
+    return _best(lambda: engine.calculate_volumes_batch(**columns), repeat)
+
+
+def bench_plate_planner(num_plates, repeat=1):
+    """Time pooling and worklist generation for 384-well plates."""
+    presets = (None,) + tuple(PCRCalculator.PRESETS)
+    wells = [Well(f"P{plate}", name, presets[i % len(presets)])
+             for plate in range(num_plates)
+             for i, name in enumerate(well_names(384))]
+
+    def run():
+        planner = PlatePlanner(384)
+        planner.add_wells(wells)
+        planner.write_worklist(wells, io.StringIO())
+    return _best(run, repeat)
+
+
+def bench_batch_mode(columns, repeat=1):
+    """Time CLI batch mode (CSV in, CSV out) in one process."""
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=INPUT_FIELDS)
+    writer.writeheader()
+    for row in _rows(columns):
+        writer.writerow({k: ("" if v is None else v) for k, v in row.items()})
+    data = text.getvalue()
+    return _best(lambda: run_batch(io.StringIO(data), io.StringIO(), "csv"), repeat)
+
+
+def bench_process(args, cwd, repeat=5):
+    """
+    Time a fresh Python process from start to exit.
+
+    Returns:
+        tuple: (best wall time in seconds, or None if the process failed;
+            error message or None)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable] + args, cwd=cwd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return None, lines[-1] if lines else f"exit status {result.returncode}"
+        times.append(elapsed)
+    return min(times), None
+
+
+def run_benchmarks(quick=False, repeat=3):
+    """
+    Run every benchmark.
+
+    Args:
+        quick (bool): Use 10x smaller inputs
+        repeat (int): Timed runs per benchmark (the fastest is kept)
+
+    Returns:
+        dict: Benchmark name -> {"seconds", "items"} (seconds is None when
+            a benchmark could not run, with the reason in "skipped" for
+            SKIPPABLE benchmarks and in "error" for the others)
+    """
+    scale = 10 if quick else 1
+    scalar_wells = 10**5 // scale
+    batch_wells = 10**6 // scale
+    batch_mode_rows = 10**4 // scale
+    plates = 100 // scale
+
+    results = {}
+
+    def record(name, seconds, items=1, error=None):
+        results[name] = {"seconds": seconds, "items": items}
+        if error:
+            results[name]["skipped" if name in SKIPPABLE else "error"] = error
+
+    columns = make_plate(batch_wells)
+    scalar_columns = {name: values[:scalar_wells] for name, values in columns.items()}
+    record("scalar_calculate_volumes", bench_scalar(scalar_columns, repeat), scalar_wells)
+    record("batch_calculate_volumes", bench_batch(columns, repeat), batch_wells)
+    record("fixed_point_batch", bench_fixed_point(columns, repeat), batch_wells)
+    record("plate_planner_384", bench_plate_planner(plates, repeat), plates * 384)
+    batch_columns = {name: values[:batch_mode_rows] for name, values in columns.items()}
+    record("cli_batch_mode_csv", bench_batch_mode(batch_columns, repeat), batch_mode_rows)
+
+    startup_runs = max(repeat, 5)
+    seconds, error = bench_process(["-c", "pass"], HERE, startup_runs)
+    record("interpreter_start", seconds, error=error)
+    seconds, error = bench_process(["pcr_calculator_cli.py", "--reactions", "10"], HERE, startup_runs)
+    record("cli_cold_start", seconds, error=error)
+    seconds, error = bench_process(["-c", GUI_SCRIPT], GUI_DIR, startup_runs)
+    record("gui_first_window", seconds, error=error)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): Output of run_benchmarks
+        baseline (dict): Results loaded from a baseline JSON file
+        tolerance (float): Allowed slowdown (0.25 = 25% slower)
+
+    Returns:
+        list: Names of benchmarks that regressed, or that have a baseline
+            timing but did not run (unless SKIPPABLE)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name, {}).get("seconds")
+        if not reference:
+            continue
+        if result["seconds"] is None:
+            if name not in SKIPPABLE:
+                print(f"  {name:26s} {reference:9.4f} s -> no timing  FAILED ({result['error']})")
+                regressions.append(name)
+            continue
+        ratio = result["seconds"] / reference
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"  {name:26s} {reference:9.4f} s -> {result['seconds']:9.4f} s  "
+              f"({ratio:5.2f}x)  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PCR calculator package")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON to FILE")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare against a previous --json result; regressions exit 1")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (default: 0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per benchmark, fastest kept (default: 3)")
+    parser.add_argument("--quick", action="store_true", help="Use 10x smaller inputs")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PCR Calculator Benchmark")
+    print("=" * 60)
+    results = run_benchmarks(args.quick, args.repeat)
+    for name, result in results.items():
+        if result["seconds"] is None and name in SKIPPABLE:
+            print(f"  {name:26s} skipped ({result['skipped']})")
+        elif result["seconds"] is None:
+            print(f"  {name:26s} FAILED ({result['error']})")
+        elif result["items"] > 1:
+            rate = result["items"] / result["seconds"]
+            print(f"  {name:26s} {result['seconds']:9.4f} s  ({rate:,.0f} items/s)")
+        else:
+            print(f"  {name:26s} {result['seconds']:9.4f} s")
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if baseline.get("quick", False) != args.quick:
+            print("\nBaseline was recorded with a different --quick setting")
+            return 1
+        print(f"\nComparison with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            return 1
+
+    failures = [name for name, result in results.items()
+                if result["seconds"] is None and name not in SKIPPABLE]
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
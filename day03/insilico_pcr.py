@@ -0,0 +1,511 @@
+"""
+In-silico PCR against a genome FASTA.
+
+Predicts the products a primer pair would amplify before any reaction is
+set up with PCRCalculator. The genome FASTA is memory-mapped, never read
+into Python strings, and a k-mer seed index is built once and persisted
+next to it (``<fasta>.k<k>.cache``); later runs memory-map the index and
+only rebuild it when the FASTA's size or modification time changes.
+
+Every k-mer without N is encoded as a 2-bit packed uint32 and the genome
+positions are sorted by k-mer, so a seed lookup is a binary search. The
+build is external: contigs are cut into blocks of BLOCK_BASES, each block
+is sorted (in a process pool if workers > 1) and written to disk as a run,
+and the runs are merged straight into the memory-mapped index file one
+k-mer range at a time. Memory stays bounded by the block and merge sizes,
+so multi-GB genomes can be indexed.
+
+Like UCSC isPcr, a primer binds where its 3'-terminal k bases match the
+genome exactly; the rest of the primer may have up to max_mismatches
+mismatches. Every pair of sites facing each other within max_product
+bases is reported, including products primed by one primer alone.
+
+The FASTA must have equal line lengths within each record (as required by
+samtools faidx), so any base can be located by arithmetic.
+
+Index layout (little-endian):
+    header      magic, FASTA size, FASTA mtime, k, contig count, k-mer count
+    contigs     one CONTIG record per contig
+    names       UTF-8 contig names
+    k-mers      sorted uint32 k-mer codes, padded to 8 bytes
+    positions   int64 genome positions matching the k-mers
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections import namedtuple
+from multiprocessing import Pool
+
+import numpy as np
+
+from primer_thermo import OTHER, _ENCODE
+
+MAGIC = b"PCRKMER1"
+HEADER = struct.Struct("<8sQqIIQ")
+# Sequence offset in the file, length, genome start, bases per line, bytes
+# per line, then (offset, length) of the name
+CONTIG = struct.Struct("<QQQIIII")
+
+DEFAULT_K = 12
+MAX_K = 16
+
+# Bases per sorted run while building an index (about 20 bytes per base
+# of working memory in each worker)
+BLOCK_BASES = 1 << 24
+
+# Largest number of k-mers gathered at once while merging runs
+MERGE_ENTRIES = 1 << 24
+
+Contig = namedtuple(
+    "Contig", ["name", "offset", "length", "genome_start", "line_bases", "line_bytes"]
+)
+
+# Genome window a primer anneals to; strand "+" means the window equals the
+# primer, "-" means it equals the primer's reverse complement
+BindingSite = namedtuple("BindingSite", ["primer", "contig", "strand", "start", "end", "mismatches"])
+
+# left_primer binds the "+" strand at start, right_primer the "-" strand at end
+Amplicon = namedtuple(
+    "Amplicon", ["contig", "start", "end", "size", "left_primer", "right_primer", "mismatches"]
+)
+
+_COMPLEMENT = bytes.maketrans(b"ACGTacgt", b"TGCAtgca")
+
+
+def scan_fasta(buffer):
+    """
+    Locate every record of a FASTA file in a buffer.
+
+    Args:
+        buffer: mmap or bytes of the whole FASTA file
+
+    Returns:
+        list: Contig records with genome coordinates in file order
+
+    Raises:
+        ValueError: If the file has no records or uneven line lengths
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    contigs = []
+    genome_start = 0
+    position = buffer.find(b">")
+    if position < 0:
+        raise ValueError("No FASTA records found")
+
+    while position >= 0:
+        header_end = buffer.find(b"\n", position)
+        if header_end < 0:
+            header_end = len(buffer)
+        fields = bytes(buffer[position + 1:header_end]).split(None, 1)
+        name = fields[0].decode("utf-8", "replace") if fields else ""
+        start = header_end + 1
+        next_record = buffer.find(b"\n>", header_end)
+        end = next_record + 1 if next_record >= 0 else len(buffer)
+        while end > start and buffer[end - 1] in b"\r\n":
+            end -= 1
+
+        size = max(0, end - start)
+        first_newline = buffer.find(b"\n", start, end)
+        line_bytes = first_newline - start + 1 if first_newline >= 0 else size + 1
+        line_bases = line_bytes - 1
+        if first_newline > start and buffer[first_newline - 1] == ord("\r"):
+            line_bases -= 1
+
+        full_lines, remainder = divmod(size, line_bytes)
+        region = data[start:start + size]
+        newlines = region[line_bytes - 1:full_lines * line_bytes:line_bytes]
+        if (remainder > line_bases or np.count_nonzero(region == 10) != full_lines
+                or not (newlines == 10).all()):
+            raise ValueError(f"FASTA record {name!r} has uneven line lengths")
+
+        length = full_lines * line_bases + remainder
+        contigs.append(Contig(name, start, length, genome_start, line_bases, line_bytes))
+        genome_start += length
+        position = next_record + 1 if next_record >= 0 else -1
+    return contigs
+
+
+def _contig_codes(data, contig, start=0, length=None):
+    """Return length bases of a contig from start as codes (A=0, C=1, G=2, T=3, other=4)."""
+    if length is None:
+        length = contig.length - start
+    line_bases = contig.line_bases or 1
+    first_line = start // line_bases
+    lines = -(-(start + length) // line_bases) - first_line
+    begin = contig.offset + first_line * contig.line_bytes
+    region = data[begin:begin + lines * contig.line_bytes]
+    if len(region) < lines * contig.line_bytes:
+        # Last line of the file without a line break
+        region = np.concatenate([region, np.zeros(lines * contig.line_bytes - len(region), dtype=np.uint8)])
+    bases = region.reshape(lines, contig.line_bytes)[:, :line_bases].ravel()
+    skip = start - first_line * line_bases
+    return _ENCODE[bases[skip:skip + length]]
+
+
+def kmer_codes(codes, k):
+    """
+    Pack every k-mer of a coded sequence into a uint32.
+
+    Args:
+        codes (numpy.ndarray): Base codes from primer_thermo encoding
+        k (int): k-mer length (at most MAX_K)
+
+    Returns:
+        tuple: (k-mer values, mask of k-mers without unknown bases)
+    """
+    windows = len(codes) - k + 1
+    if windows <= 0:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=bool)
+    values = np.zeros(windows, dtype=np.uint32)
+    for offset in range(k):
+        values <<= 2
+        values |= codes[offset:offset + windows] & 3
+    unknown = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(codes == OTHER, out=unknown[1:])
+    return values, unknown[k:] == unknown[:windows]
+
+
+def _index_block(task):
+    """Worker: sort the k-mers of one contig block and write them as a run."""
+    path, contig, start, length, k, run_path = task
+    with open(path, "rb") as handle:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    codes = _contig_codes(np.frombuffer(buffer, dtype=np.uint8), contig, start, length)
+    values, known = kmer_codes(codes, k)
+
+    # Sort (k-mer, position in block) packed in one uint64: a plain sort is
+    # much faster than an indirect one (blocks are shorter than 2^32 bases)
+    keys = values.astype(np.uint64) << np.uint64(32)
+    keys |= np.arange(len(values), dtype=np.uint64)
+    keys = keys[known]
+    keys.sort()
+    keys.tofile(run_path)
+    return len(keys)
+
+
+def _merge_runs(runs, k, values, positions):
+    """
+    Merge sorted runs into the index arrays, one k-mer range at a time.
+
+    Ranges are narrowed when they would gather more than MERGE_ENTRIES
+    k-mers and widened again when they hold few.
+
+    Args:
+        runs (list): (sorted packed keys, genome position of the block) per
+            run, in genome order
+        k (int): k-mer length
+        values (numpy.ndarray): Output k-mer codes (memory-mapped)
+        positions (numpy.ndarray): Output genome positions (memory-mapped)
+    """
+    end = 1 << (2 * k)
+    step = max(1, end * MERGE_ENTRIES // max(1, len(values)))
+    low, written = 0, 0
+    cursors = [0] * len(runs)
+    while low < end:
+        high = min(end, low + step)
+        bounds = [len(keys) if high == end else int(np.searchsorted(keys, np.uint64(high) << np.uint64(32)))
+                  for keys, _ in runs]
+        count = sum(bound - cursor for bound, cursor in zip(bounds, cursors))
+        if count > MERGE_ENTRIES and high - low > 1:
+            step = max(1, step // 2)
+            continue
+
+        if count:
+            parts = [keys[cursor:bound] for (keys, _), cursor, bound in zip(runs, cursors, bounds)]
+            kmers = np.concatenate([(part >> np.uint64(32)).astype(np.uint32) for part in parts])
+            genome = np.concatenate([(part & np.uint64(0xFFFFFFFF)).astype(np.int64) + base
+                                     for part, (_, base) in zip(parts, runs)])
+            # Runs are in genome order, so the stable sort keeps positions
+            # in genome order per k-mer
+            order = np.argsort(kmers, kind="stable")
+            values[written:written + count] = kmers[order]
+            positions[written:written + count] = genome[order]
+            written += count
+        cursors = bounds
+        low = high
+        if count <= MERGE_ENTRIES // 4:
+            step *= 2
+
+
+def build_index(path, k=DEFAULT_K, workers=1):
+    """
+    Build the k-mer index of a FASTA file and write it to its cache path.
+
+    Args:
+        path (str): Genome FASTA
+        k (int): Seed length (at most MAX_K)
+        workers (int): Processes used to sort blocks in parallel
+
+    Returns:
+        str: Path of the written index
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    stat = os.stat(path)
+    with open(path, "rb") as handle:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    contigs = scan_fasta(buffer)
+
+    cache_path = f"{path}.k{k}.cache"
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    run_folder = tempfile.mkdtemp(prefix=".kmer-runs-", dir=os.path.dirname(os.path.abspath(cache_path)))
+    try:
+        # Blocks overlap by k - 1 bases so every k-mer is in exactly one block
+        tasks = []
+        for contig in contigs:
+            for start in range(0, max(0, contig.length - k + 1), BLOCK_BASES):
+                length = min(BLOCK_BASES + k - 1, contig.length - start)
+                run_path = os.path.join(run_folder, f"{len(tasks)}.run")
+                tasks.append((path, contig, start, length, k, run_path))
+        if workers > 1 and len(tasks) > 1:
+            with Pool(min(workers, len(tasks))) as pool:
+                counts = pool.map(_index_block, tasks, chunksize=1)
+        else:
+            counts = [_index_block(task) for task in tasks]
+        total = sum(counts)
+
+        names = bytearray()
+        records = bytearray()
+        for contig in contigs:
+            encoded = contig.name.encode("utf-8")
+            records.extend(CONTIG.pack(contig.offset, contig.length, contig.genome_start,
+                                       contig.line_bases, contig.line_bytes,
+                                       len(names), len(encoded)))
+            names.extend(encoded)
+        header = HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, k, len(contigs), total)
+        head = header + bytes(records) + bytes(names)
+        positions_offset = len(head) + 4 * total
+        positions_offset += -positions_offset % 8
+        with open(temp_path, "wb") as handle:
+            handle.write(head)
+            handle.truncate(positions_offset + 8 * total)
+
+        if total:
+            runs = [(np.memmap(task[5], dtype=np.uint64, mode="r"), task[1].genome_start + task[2])
+                    for task, count in zip(tasks, counts) if count]
+            values = np.memmap(temp_path, dtype=np.uint32, mode="r+", offset=len(head), shape=(total,))
+            positions = np.memmap(temp_path, dtype=np.int64, mode="r+", offset=positions_offset,
+                                  shape=(total,))
+            _merge_runs(runs, k, values, positions)
+            values.flush()
+            positions.flush()
+            del runs, values, positions
+        os.replace(temp_path, cache_path)
+    finally:
+        shutil.rmtree(run_folder, ignore_errors=True)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return cache_path
+
+
+class GenomeIndex:
+    """Memory-mapped genome FASTA with its persisted k-mer seed index."""
+
+    def __init__(self, path, index_buffer):
+        """
+        Args:
+            path (str): Genome FASTA
+            index_buffer: mmap of the index file
+        """
+        magic, self.source_size, self.source_mtime_ns, self.k, contig_count, kmer_count = \
+            HEADER.unpack_from(index_buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a k-mer index")
+
+        names_offset = HEADER.size + contig_count * CONTIG.size
+        names_length = 0
+        self.contigs = []
+        for index in range(contig_count):
+            (offset, length, genome_start, line_bases, line_bytes,
+             name_offset, name_length) = CONTIG.unpack_from(
+                index_buffer, HEADER.size + index * CONTIG.size)
+            start = names_offset + name_offset
+            name = bytes(index_buffer[start:start + name_length]).decode("utf-8")
+            self.contigs.append(Contig(name, offset, length, genome_start,
+                                       line_bases, line_bytes))
+            names_length += name_length
+        kmers_offset = names_offset + names_length
+
+        self.path = path
+        self._index_buffer = index_buffer
+        self.kmers = np.frombuffer(index_buffer, dtype=np.uint32, count=kmer_count,
+                                   offset=kmers_offset)
+        positions_offset = kmers_offset + self.kmers.nbytes
+        positions_offset += -positions_offset % 8
+        self.positions = np.frombuffer(index_buffer, dtype=np.int64, count=kmer_count,
+                                       offset=positions_offset)
+
+        with open(path, "rb") as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = np.frombuffer(self._buffer, dtype=np.uint8)
+        self._genome_starts = np.array([c.genome_start for c in self.contigs], dtype=np.int64)
+        self._table = np.array([(c.offset, c.length, c.line_bases, c.line_bytes)
+                                for c in self.contigs], dtype=np.int64).reshape(-1, 4)
+
+    @classmethod
+    def open(cls, path, k=DEFAULT_K, workers=1):
+        """
+        Open a genome, building its k-mer index if missing or stale.
+
+        Args:
+            path (str): Genome FASTA
+            k (int): Seed length (at most MAX_K)
+            workers (int): Processes used if the index has to be built
+
+        Returns:
+            GenomeIndex: Genome ready for binding site and product queries
+        """
+        stat = os.stat(path)
+        cache_path = f"{path}.k{k}.cache"
+        index = cls._open_index(path, cache_path)
+        if index and (index.source_size, index.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return index
+        build_index(path, k, workers)
+        return cls._open_index(path, cache_path)
+
+    @classmethod
+    def _open_index(cls, path, cache_path):
+        """Memory-map an existing index file, or return None if unusable."""
+        try:
+            with open(cache_path, "rb") as handle:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(path, buffer)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _windows(self, genome_positions, length):
+        """
+        Gather genome windows as base codes.
+
+        Returns:
+            tuple: (codes of shape (n, length), contig index per window,
+                mask of windows lying inside one contig)
+        """
+        contig = np.searchsorted(self._genome_starts, genome_positions, side="right") - 1
+        contig = np.maximum(contig, 0)
+        offset, contig_length, line_bases, line_bytes = self._table[contig].T
+        line_bases = np.maximum(line_bases, 1)
+        local = genome_positions - self._genome_starts[contig]
+        inside = (local >= 0) & (local + length <= contig_length)
+
+        bases = np.clip(local[:, None] + np.arange(length), 0, np.maximum(contig_length - 1, 0)[:, None])
+        file_offsets = (offset[:, None] + bases // line_bases[:, None] * line_bytes[:, None]
+                        + bases % line_bases[:, None])
+        return _ENCODE[self._data[file_offsets]], contig, inside
+
+    def sequence(self, contig, start, end):
+        """
+        Return part of a contig's sequence.
+
+        Args:
+            contig (str): Contig name
+            start (int): 0-based start
+            end (int): End (exclusive)
+
+        Returns:
+            str: Upper-case bases
+        """
+        for record in self.contigs:
+            if record.name == contig:
+                break
+        else:
+            raise ValueError(f"Unknown contig: {contig}")
+        start, end = max(0, start), min(end, record.length)
+        if end <= start:
+            return ""
+        codes, _, _ = self._windows(np.array([record.genome_start + start]), end - start)
+        return "".join("ACGTN"[code] for code in codes[0])
+
+    def binding_sites(self, primer, max_mismatches=2, name="primer"):
+        """
+        Find where a primer anneals on either strand.
+
+        Args:
+            primer (str): Primer sequence (5'->3')
+            max_mismatches (int): Mismatches allowed outside the 3' seed
+            name (str): Label stored in the returned sites
+
+        Returns:
+            list: BindingSite records sorted by contig and position
+
+        Raises:
+            ValueError: If the primer is shorter than k or its 3' seed has
+                bases other than A/C/G/T
+        """
+        primer = primer.strip().upper()
+        length = len(primer)
+        if length < self.k:
+            raise ValueError(f"Primer must be at least {self.k} bases long")
+        forward = _ENCODE[np.frombuffer(primer.encode("ascii"), dtype=np.uint8)]
+        reverse = _ENCODE[np.frombuffer(
+            primer.encode("ascii").translate(_COMPLEMENT)[::-1], dtype=np.uint8)]
+        if (forward[-self.k:] == OTHER).any():
+            raise ValueError("The primer's 3' end must only contain A, C, G and T")
+
+        sites = []
+        # "+": the genome k-mer ending the window is the primer's 3' end;
+        # "-": the window starts with the reverse complement of the 3' end
+        for strand, target, seed, shift in (("+", forward, forward[-self.k:], length - self.k),
+                                            ("-", reverse, reverse[:self.k], 0)):
+            value, _ = kmer_codes(seed, self.k)
+            low, high = np.searchsorted(self.kmers, value[0], side="left"), \
+                np.searchsorted(self.kmers, value[0], side="right")
+            if low == high:
+                continue
+            starts = np.asarray(self.positions[low:high]) - shift
+            codes, contig, inside = self._windows(starts, length)
+            mismatches = (codes != target).sum(axis=1)
+            keep = inside & (mismatches <= max_mismatches)
+            for position, contig_index, count in zip(starts[keep].tolist(), contig[keep].tolist(),
+                                                     mismatches[keep].tolist()):
+                record = self.contigs[contig_index]
+                local = position - record.genome_start
+                sites.append(BindingSite(name, record.name, strand, local, local + length, count))
+        sites.sort(key=lambda site: (site.contig, site.start, site.strand))
+        return sites
+
+    def pcr(self, forward, reverse, max_mismatches=2, max_product=4000):
+        """
+        Predict the products of a primer pair.
+
+        Args:
+            forward (str): Forward primer (5'->3')
+            reverse (str): Reverse primer (5'->3')
+            max_mismatches (int): Mismatches allowed per primer outside its 3' seed
+            max_product (int): Largest product size in bases
+
+        Returns:
+            list: Amplicon records, intended forward/reverse products with
+                the fewest mismatches first; the rest are off-target products
+        """
+        sites = (self.binding_sites(forward, max_mismatches, "forward")
+                 + self.binding_sites(reverse, max_mismatches, "reverse"))
+        left = {}
+        right = {}
+        for site in sites:
+            (left if site.strand == "+" else right).setdefault(site.contig, []).append(site)
+
+        products = []
+        for contig, left_sites in left.items():
+            right_sites = sorted(right.get(contig, []), key=lambda site: site.end)
+            ends = np.array([site.end for site in right_sites], dtype=np.int64)
+            for site in left_sites:
+                low = np.searchsorted(ends, site.end, side="left")
+                high = np.searchsorted(ends, site.start + max_product, side="right")
+                for partner in right_sites[low:high]:
+                    if partner.start < site.start:
+                        continue
+                    products.append(Amplicon(contig, site.start, partner.end,
+                                             partner.end - site.start, site.primer,
+                                             partner.primer,
+                                             site.mismatches + partner.mismatches))
+        products.sort(key=lambda p: (not is_intended(p), p.mismatches, p.contig, p.start))
+        return products
+
+
+def is_intended(amplicon):
+    """Return True for a product primed by the forward and reverse primer."""
+    return (amplicon.left_primer, amplicon.right_primer) == ("forward", "reverse")
@@ -0,0 +1,209 @@
+"""
+Vectorized batch calculations for PCRCalculator.
+
+Computes the same five component volumes as PCRCalculator.calculate_volumes,
+but for whole plates at once using NumPy arrays instead of one call per well.
+"""
+
+import numpy as np
+
+from pcr_calculator import PCRCalculator, VOLUME_KEYS
+
+VOLUME_DTYPE = np.dtype([(key, np.float64) for key in VOLUME_KEYS])
+
+_PARAMETER_NAMES = (
+    "num_reactions",
+    "preset",
+    "primer_concentration",
+    "reaction_volume",
+    "template_dna_ng",
+    "template_dna_concentration",
+)
+
+
+def _build_recipe_table():
+    """Return (preset names, recipe matrix) from the compiled recipes."""
+    recipes = PCRCalculator.RECIPES
+    names = [recipe.name for recipe in recipes]
+    return names, np.array([recipe.coefficients for recipe in recipes], dtype=np.float64)
+
+
+PRESET_NAMES, RECIPE_TABLE = _build_recipe_table()
+_compiled_recipes = PCRCalculator.RECIPES
+
+
+def _refresh_recipe_table():
+    """Rebuild the recipe table if presets were recompiled since import."""
+    global PRESET_NAMES, RECIPE_TABLE, _compiled_recipes
+    if PCRCalculator.RECIPES is not _compiled_recipes:
+        PRESET_NAMES, RECIPE_TABLE = _build_recipe_table()
+        _compiled_recipes = PCRCalculator.RECIPES
+
+
+def preset_indices(presets, size):
+    """
+    Convert preset names into row indices of RECIPE_TABLE.
+
+    Unknown names and None map to the default recipe, matching the scalar
+    calculate_volumes behaviour.
+
+    Args:
+        presets: None, a single preset name, or a sequence of names / indices
+        size (int): Number of wells
+
+    Returns:
+        numpy.ndarray: int64 array of recipe indices
+    """
+    if presets is None:
+        return np.zeros(size, dtype=np.int64)
+    if isinstance(presets, str):
+        index = PRESET_NAMES.index(presets) if presets in PRESET_NAMES[1:] else 0
+        return np.full(size, index, dtype=np.int64)
+
+    presets = np.asarray(presets)
+    if presets.dtype.kind in "iu":
+        return np.broadcast_to(presets.astype(np.int64), (size,))
+
+    # One vectorized comparison per known preset instead of a lookup per well;
+    # None and unknown names keep index 0 (the default recipe)
+    if presets.dtype.kind != "U":
+        presets = presets.astype(str)
+    indices = np.zeros(presets.shape, dtype=np.int64)
+    for index, name in enumerate(PRESET_NAMES[1:], start=1):
+        indices[presets == name] = index
+    return np.broadcast_to(indices, (size,))
+
+
+def _column(values, size):
+    """Return a float64 column; None means 'not given' and becomes NaN."""
+    if values is None:
+        return np.full(size, np.nan)
+    column = np.asarray(values, dtype=object if _has_none(values) else None)
+    if column.dtype == object:
+        column = np.array([np.nan if v is None else v for v in column.reshape(-1)],
+                          dtype=np.float64)
+    return np.broadcast_to(column.astype(np.float64), (size,))
+
+
+def _has_none(values):
+    """Return True if a list-like column contains None entries."""
+    return isinstance(values, (list, tuple)) and any(v is None for v in values)
+
+
+def _given(column):
+    """Mirror the scalar `if value:` test: not missing and not zero."""
+    return ~np.isnan(column) & (column != 0)
+
+
+def columns_from_records(records):
+    """
+    Convert a list of parameter records into columns.
+
+    Args:
+        records (list): Dicts with calculate_volumes keyword names
+
+    Returns:
+        dict: Parameter name -> list of values (None where absent)
+    """
+    return {
+        name: [record.get(name) for record in records]
+        for name in _PARAMETER_NAMES
+    }
+
+
+def per_reaction_batch(num_reactions, preset=None, primer_concentration=None,
+                       reaction_volume=None, template_dna_ng=None,
+                       template_dna_concentration=None):
+    """
+    Resolve per-reaction component volumes for many wells.
+
+    Takes the same arguments as calculate_volumes_batch (without the
+    list-of-records form) and applies the same preset, template and primer
+    rules, but stops before the safety factor and number of reactions.
+
+    Returns:
+        tuple: (reactions, per_reaction, total_rxn_vol, valid) where
+            per_reaction is a tuple of five float64 arrays in VOLUME_KEYS
+            order, total_rxn_vol is the reaction volume per well, and valid
+            marks wells calculate_volumes would accept
+    """
+    size = max(
+        np.size(value) if not isinstance(value, str) else 1
+        for value in (num_reactions, preset, primer_concentration, reaction_volume,
+                      template_dna_ng, template_dna_concentration)
+        if value is not None
+    )
+
+    _refresh_recipe_table()
+    reactions = _column(num_reactions, size)
+    primer_override = _column(primer_concentration, size)
+    volume_override = _column(reaction_volume, size)
+    template_ng = _column(template_dna_ng, size)
+    template_conc = _column(template_dna_concentration, size)
+
+    recipe = RECIPE_TABLE[preset_indices(preset, size)]
+    master_mix_vol = recipe[:, 0]
+    primer_f_vol = recipe[:, 1]
+    primer_r_vol = recipe[:, 2]
+    template_vol = recipe[:, 3]
+    total_rxn_vol = np.where(_given(volume_override), volume_override, recipe[:, 5])
+
+    valid = ~(reactions <= 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Template volume from concentration, only when both are given
+        use_template = _given(template_conc) & _given(template_ng)
+        valid &= ~(use_template & ((template_conc <= 0) | (template_ng < 0)))
+        template_vol = np.where(use_template, template_ng / template_conc, template_vol)
+
+        # Scale primers inversely with stock concentration
+        scale_primers = _given(primer_override) & (primer_override != 10.0)
+        factor = 10.0 / primer_override
+        primer_f_vol = np.where(scale_primers, primer_f_vol * factor, primer_f_vol)
+        primer_r_vol = np.where(scale_primers, primer_r_vol * factor, primer_r_vol)
+
+    water_vol = total_rxn_vol - (master_mix_vol + primer_f_vol + primer_r_vol + template_vol)
+    valid &= ~(water_vol < 0)
+
+    per_reaction = (master_mix_vol, primer_f_vol, primer_r_vol, template_vol, water_vol)
+    return reactions, per_reaction, total_rxn_vol, valid
+
+
+def calculate_volumes_batch(num_reactions, preset=None, primer_concentration=None,
+                            reaction_volume=None, template_dna_ng=None,
+                            template_dna_concentration=None):
+    """
+    Calculate PCR reaction volumes for many wells in one vectorized pass.
+
+    Every argument may be a scalar (applied to all wells) or a column with
+    one entry per well. Missing values are given as None or NaN and fall
+    back to the preset defaults exactly like calculate_volumes.
+
+    Args:
+        num_reactions: Number of reactions per well
+        preset: Preset name(s) from PCRCalculator.PRESETS
+        primer_concentration: Primer stock concentration(s) in µM
+        reaction_volume: Total reaction volume(s) in µL
+        template_dna_ng: Desired template DNA amount(s) in ng
+        template_dna_concentration: Template DNA concentration(s) in ng/µL
+
+    Returns:
+        tuple: (volumes, valid) where volumes is a structured array with the
+            calculate_volumes keys as fields and valid is a boolean mask.
+            Rows for which calculate_volumes would raise ValueError are
+            marked invalid and filled with NaN.
+    """
+    if isinstance(num_reactions, (list, tuple)) and num_reactions \
+            and isinstance(num_reactions[0], dict):
+        return calculate_volumes_batch(**columns_from_records(num_reactions))
+
+    reactions, per_reaction, _, valid = per_reaction_batch(
+        num_reactions, preset, primer_concentration, reaction_volume,
+        template_dna_ng, template_dna_concentration)
+
+    volumes = np.empty(reactions.size, dtype=VOLUME_DTYPE)
+    for key, component_vol in zip(VOLUME_KEYS, per_reaction):
+        total = component_vol * reactions * PCRCalculator.SAFETY_FACTOR
+        volumes[key] = np.where(valid, total, np.nan)
+
+    return volumes, valid
@@ -0,0 +1,223 @@
+"""
+Streaming batch mode for the PCR calculator CLI.
+
+Reads reaction requests from CSV or JSONL (a file or stdin), calculates each
+one with PCRCalculator.calculate_volumes and streams results out in the same
+format. Errors are reported per row instead of stopping the run. Large inputs
+can be spread over a process pool; results are still written in input order.
+"""
+
+import csv
+import json
+import sys
+from itertools import islice
+from multiprocessing import Pool
+
+from pcr_calculator import DEFAULT_PRESET, PCRCalculator, VOLUME_KEYS
+from preset_catalog import PresetCatalog
+
+INPUT_FIELDS = (
+    "num_reactions",
+    "preset",
+    "primer_concentration",
+    "reaction_volume",
+    "template_dna_ng",
+    "template_dna_concentration",
+)
+
+_NUMERIC_FIELDS = INPUT_FIELDS[:1] + INPUT_FIELDS[2:]
+
+# Rows sent to a worker process at a time
+CHUNK_SIZE = 512
+
+# Per-process state: preset catalogs and already resolved preset names
+_builtin_catalog = None
+_catalog = None
+_resolved_presets = {}
+
+
+def _init_worker(catalog_path):
+    """Open the preset catalogs once per process."""
+    global _builtin_catalog, _catalog
+    _builtin_catalog = PresetCatalog.from_presets(PCRCalculator.PRESETS)
+    _catalog = PresetCatalog.open(catalog_path) if catalog_path else None
+    _resolved_presets.clear()
+
+
+def _resolve(name):
+    """Resolve a preset name or prefix, remembering the answer (or error)."""
+    if name not in _resolved_presets:
+        try:
+            try:
+                _resolved_presets[name] = _builtin_catalog.resolve(name)
+            except ValueError:
+                if _catalog is None:
+                    raise
+                _resolved_presets[name] = _catalog.install(name)
+        except ValueError as e:
+            _resolved_presets[name] = e
+    key = _resolved_presets[name]
+    if isinstance(key, ValueError):
+        raise key
+    return key
+
+
+def _parse_request(row):
+    """Convert a raw input row into calculate_volumes keyword arguments."""
+    kwargs = {}
+    for field in _NUMERIC_FIELDS:
+        value = row.get(field)
+        if value is None or value == "":
+            continue
+        try:
+            kwargs[field] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a number, got {value!r}")
+
+    if "num_reactions" not in kwargs:
+        raise ValueError("num_reactions is required")
+
+    preset = row.get("preset")
+    if preset is not None and not isinstance(preset, str):
+        raise ValueError(f"preset must be a name, got {preset!r}")
+    if preset and preset.casefold() != DEFAULT_PRESET.casefold():
+        kwargs["preset"] = _resolve(preset)
+    return kwargs
+
+
+def calculate_row(row):
+    """
+    Calculate volumes for one input row.
+
+    Args:
+        row (dict): Input fields (strings from CSV or values from JSON)
+
+    Returns:
+        tuple: (volumes dict or None, error message or None)
+    """
+    try:
+        return PCRCalculator.calculate_volumes(**_parse_request(row)), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def read_rows(handle, fmt):
+    """
+    Stream input rows from an open text file.
+
+    Args:
+        handle: Readable text file object
+        fmt (str): 'csv' or 'jsonl'
+
+    Yields:
+        dict: One request per row; unparsable JSON lines yield a dict with
+            a '_parse_error' key so they are reported in order
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(handle)
+        return
+
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            yield record
+        except ValueError as e:
+            yield {"_parse_error": f"Invalid JSON line: {e}"}
+
+
+def _calculate(row):
+    """Worker entry point: handle rows that already failed to parse."""
+    if "_parse_error" in row:
+        return None, row["_parse_error"]
+    return calculate_row(row)
+
+
+class _ResultWriter:
+    """Writes input rows with their results in CSV or JSONL format."""
+
+    def __init__(self, handle, fmt):
+        self.handle = handle
+        self.fmt = fmt
+        self.writer = None
+
+    def write(self, row, volumes, error):
+        if self.fmt == "jsonl":
+            record = {k: v for k, v in row.items() if k != "_parse_error"}
+            if error:
+                record["error"] = error
+            else:
+                record["volumes"] = {k: round(v, 4) for k, v in volumes.items()}
+            self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+
+        if self.writer is None:
+            extra = [k for k in row if k not in INPUT_FIELDS]
+            fieldnames = list(INPUT_FIELDS) + extra + list(VOLUME_KEYS) + ["error"]
+            self.writer = csv.DictWriter(self.handle, fieldnames=fieldnames,
+                                         extrasaction="ignore")
+            self.writer.writeheader()
+        record = dict(row)
+        if volumes:
+            record.update((k, f"{v:.4f}") for k, v in volumes.items())
+        record["error"] = error or ""
+        self.writer.writerow(record)
+
+
+def run_batch(input_handle, output_handle, fmt="csv", workers=1, catalog_path=None):
+    """
+    Calculate every request in the input and stream results to the output.
+
+    Args:
+        input_handle: Readable text file with CSV or JSONL requests
+        output_handle: Writable text file for the results
+        fmt (str): 'csv' or 'jsonl' (used for both input and output)
+        workers (int): Number of worker processes (1 = no pool)
+        catalog_path (str): Optional preset catalog for preset names
+
+    Returns:
+        tuple: (rows processed, rows with errors)
+    """
+    writer = _ResultWriter(output_handle, fmt)
+    rows = read_rows(input_handle, fmt)
+    processed = failed = 0
+
+    def consume(pairs):
+        nonlocal processed, failed
+        for row, (volumes, error) in pairs:
+            writer.write(row, volumes, error)
+            processed += 1
+            failed += error is not None
+
+    if workers > 1:
+        # Work through the input in bounded windows so memory stays flat;
+        # Pool.map keeps each window's results in input order
+        window_size = workers * CHUNK_SIZE * 4
+        with Pool(workers, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+            while True:
+                window = list(islice(rows, window_size))
+                if not window:
+                    break
+                consume(zip(window, pool.map(_calculate, window, chunksize=CHUNK_SIZE)))
+    else:
+        _init_worker(catalog_path)
+        consume((row, _calculate(row)) for row in rows)
+
+    return processed, failed
+
+
+def detect_format(path):
+    """Guess 'csv' or 'jsonl' from a file name (stdin defaults to csv)."""
+    if path and path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+def open_input(path):
+    """Open a batch input path, with '-' meaning stdin."""
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
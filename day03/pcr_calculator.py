@@ -1,3 +1,58 @@
+import sys
+
+# Keys returned by calculate_volumes, in order
+VOLUME_KEYS = (
+    "Master Mix",
+    "Primer Forward",
+    "Primer Reverse",
+    "Template DNA",
+    "Water (ddH₂O)"
+)
+
+# Preset fields compiled into Recipe.coefficients, in order
+RECIPE_FIELDS = (
+    "master_mix",
+    "primer_forward",
+    "primer_reverse",
+    "template_dna",
+    "primer_concentration",
+    "reaction_volume"
+)
+
+
+class Recipe:
+    """Immutable, compiled form of a preset used by the calculation hot path."""
+    
+    __slots__ = ("name", "index", "coefficients", "per_reaction")
+    
+    def __init__(self, name, index, coefficients):
+        """
+        Create a compiled recipe.
+        
+        Args:
+            name (str): Preset name (interned)
+            index (int): Position in PCRCalculator.RECIPES
+            coefficients (tuple): Per-reaction values in RECIPE_FIELDS order
+        """
+        coefficients = tuple(float(v) for v in coefficients)
+        master_mix, primer_f, primer_r, template, _, reaction_volume = coefficients
+        water = reaction_volume - (master_mix + primer_f + primer_r + template)
+        if water < 0:
+            raise ValueError(f"Preset {name!r}: component volumes exceed total reaction volume")
+        
+        object.__setattr__(self, "name", sys.intern(name))
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "coefficients", coefficients)
+        # Per-reaction volumes in VOLUME_KEYS order when nothing is overridden
+        object.__setattr__(self, "per_reaction", (master_mix, primer_f, primer_r, template, water))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Recipe objects are immutable")
+    
+    def __repr__(self):
+        return f"Recipe({self.name!r}, {self.index}, {self.coefficients!r})"
+
+
 class PCRCalculator:
     # Preset reactions with different polymerases
     PRESETS = {
@@ -88,23 +143,24 @@ class PCRCalculator:
         
         num_reactions = float(num_reactions)
         
-        # Use preset if specified
-        if preset and preset in PCRCalculator.PRESETS:
-            preset_data = PCRCalculator.PRESETS[preset]
-            master_mix_vol = preset_data["master_mix"]
-            primer_f_vol = preset_data["primer_forward"]
-            primer_r_vol = preset_data["primer_reverse"]
-            template_vol = preset_data["template_dna"]
-            primer_conc = primer_concentration or preset_data["primer_concentration"]
-            total_rxn_vol = reaction_volume or preset_data["reaction_volume"]
-        else:
-            # Use defaults
-            master_mix_vol = 7.5
-            primer_f_vol = 0.5
-            primer_r_vol = 0.5
-            template_vol = 1.0
-            primer_conc = primer_concentration or 10.0
-            total_rxn_vol = reaction_volume or 15.0
+        # Look up the compiled preset; unknown or missing presets use the defaults
+        recipe = _RECIPE_BY_NAME.get(preset, _DEFAULT_RECIPE) if preset else _DEFAULT_RECIPE
+        safety = PCRCalculator.SAFETY_FACTOR
+        
+        # Fast path: no overrides, so the precomputed per-reaction volumes apply
+        if not (reaction_volume or primer_concentration or template_dna_ng):
+            master_mix_vol, primer_f_vol, primer_r_vol, template_vol, water_vol = recipe.per_reaction
+            return {
+                "Master Mix": master_mix_vol * num_reactions * safety,
+                "Primer Forward": primer_f_vol * num_reactions * safety,
+                "Primer Reverse": primer_r_vol * num_reactions * safety,
+                "Template DNA": template_vol * num_reactions * safety,
+                "Water (ddH₂O)": water_vol * num_reactions * safety
+            }
+        
+        (master_mix_vol, primer_f_vol, primer_r_vol, template_vol,
+         default_primer_conc, default_rxn_vol) = recipe.coefficients
+        total_rxn_vol = reaction_volume or default_rxn_vol
         
         # Calculate template DNA volume if concentration is provided
         if template_dna_concentration and template_dna_ng:
@@ -117,8 +173,9 @@ class PCRCalculator:
         # Adjust primer volumes based on primer concentration if different from 10 µM
         if primer_concentration and primer_concentration != 10.0:
             # Scale primers inversely: lower concentration needs more volume for same final concentration
-            primer_f_vol = primer_f_vol * (10.0 / primer_concentration)
-            primer_r_vol = primer_r_vol * (10.0 / primer_concentration)
+            scale = 10.0 / primer_concentration
+            primer_f_vol = primer_f_vol * scale
+            primer_r_vol = primer_r_vol * scale
         
         # Calculate water volume
         water_vol = total_rxn_vol - (master_mix_vol + primer_f_vol + primer_r_vol + template_vol)
@@ -127,15 +184,51 @@ class PCRCalculator:
             raise ValueError("Component volumes exceed total reaction volume. Adjust parameters.")
         
         # Calculate total volumes with safety factor
-        volumes = {
-            "Master Mix": master_mix_vol * num_reactions * PCRCalculator.SAFETY_FACTOR,
-            "Primer Forward": primer_f_vol * num_reactions * PCRCalculator.SAFETY_FACTOR,
-            "Primer Reverse": primer_r_vol * num_reactions * PCRCalculator.SAFETY_FACTOR,
-            "Template DNA": template_vol * num_reactions * PCRCalculator.SAFETY_FACTOR,
-            "Water (ddH₂O)": water_vol * num_reactions * PCRCalculator.SAFETY_FACTOR
+        return {
+            "Master Mix": master_mix_vol * num_reactions * safety,
+            "Primer Forward": primer_f_vol * num_reactions * safety,
+            "Primer Reverse": primer_r_vol * num_reactions * safety,
+            "Template DNA": template_vol * num_reactions * safety,
+            "Water (ddH₂O)": water_vol * num_reactions * safety
         }
+    
+    @staticmethod
+    def get_recipe(preset=None):
+        """
+        Return the compiled Recipe for a preset.
         
-        return volumes
+        Args:
+            preset (str): Preset name; None or unknown names give the default recipe
+            
+        Returns:
+            Recipe: Compiled recipe
+        """
+        return _RECIPE_BY_NAME.get(preset, _DEFAULT_RECIPE) if preset else _DEFAULT_RECIPE
+    
+    @staticmethod
+    def calculate_volumes_batch(num_reactions, preset=None, primer_concentration=None,
+                                reaction_volume=None, template_dna_ng=None,
+                                template_dna_concentration=None):
+        """
+        Calculate PCR reaction volumes for many wells at once.
+        
+        Accepts columns (NumPy arrays or lists, one entry per well) or a list of
+        parameter dicts, and returns the same values calculate_volumes would
+        for every well. See pcr_batch.calculate_volumes_batch for details.
+        
+        Returns:
+            tuple: (structured array of volumes, boolean validity mask)
+        """
+        # Imported here so the scalar path does not require NumPy
+        from pcr_batch import calculate_volumes_batch
+        return calculate_volumes_batch(
+            num_reactions,
+            preset=preset,
+            primer_concentration=primer_concentration,
+            reaction_volume=reaction_volume,
+            template_dna_ng=template_dna_ng,
+            template_dna_concentration=template_dna_concentration
+        )
     
     @staticmethod
     def calculate_volumes_legacy(num_reactions):
@@ -152,3 +245,34 @@ class PCRCalculator:
             ValueError: If num_reactions <= 0
         """
         return PCRCalculator.calculate_volumes(num_reactions)
+    
+    @staticmethod
+    def compile_presets():
+        """
+        Compile PRESETS into Recipe objects.
+        
+        Runs once at import. Call it again after changing PRESETS so that
+        calculate_volumes picks up the changes.
+        
+        Returns:
+            tuple: Compiled recipes; index 0 is the default (Green) recipe
+        """
+        global _DEFAULT_RECIPE
+        recipes = [Recipe(DEFAULT_PRESET, 0, DEFAULT_COEFFICIENTS)]
+        for name, data in PCRCalculator.PRESETS.items():
+            recipes.append(Recipe(name, len(recipes), (data[f] for f in RECIPE_FIELDS)))
+        
+        _DEFAULT_RECIPE = recipes[0]
+        _RECIPE_BY_NAME.clear()
+        _RECIPE_BY_NAME.update((recipe.name, recipe) for recipe in recipes[1:])
+        PCRCalculator.RECIPES = tuple(recipes)
+        return PCRCalculator.RECIPES
+
+
+# Name and per-reaction values of the default (Green Master Mix) recipe
+DEFAULT_PRESET = "Green"
+DEFAULT_COEFFICIENTS = (7.5, 0.5, 0.5, 1.0, 10.0, 15.0)
+
+_DEFAULT_RECIPE = None
+_RECIPE_BY_NAME = {}
+PCRCalculator.compile_presets()
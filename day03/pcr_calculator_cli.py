@@ -1,6 +1,8 @@
 import argparse
 import sys
-from pcr_calculator import PCRCalculator
+from pcr_calculator import DEFAULT_PRESET, PCRCalculator
+from preset_catalog import PresetCatalog
+from pcr_batch_runner import detect_format, open_input, run_batch
 
 def display_results(volumes, preset_name="Green"):
     """Display results in a formatted table."""
@@ -31,6 +33,56 @@ def get_numeric_input(prompt, allow_zero=False):
         except ValueError:
             print("Error: Please enter a valid number.")
 
+def resolve_preset(name, catalog=None):
+    """
+    Resolve a preset name or unique prefix to a preset key.
+    
+    Names are matched ignoring case. The default Green mix is returned as
+    DEFAULT_PRESET; built-in presets are checked next, then the catalog (if
+    given). Catalog presets are installed into PCRCalculator so they can be used.
+    
+    Raises:
+        ValueError: If the name is unknown or ambiguous
+    """
+    if name.casefold() == DEFAULT_PRESET.casefold():
+        return DEFAULT_PRESET
+    builtin = PresetCatalog.from_presets(PCRCalculator.PRESETS)
+    try:
+        return builtin.resolve(name)
+    except ValueError:
+        if catalog is None:
+            raise
+    return catalog.install(name)
+
+def list_presets(prefix="", catalog=None):
+    """Return built-in and catalog preset names starting with prefix."""
+    names = PresetCatalog.from_presets(PCRCalculator.PRESETS).complete(prefix, limit=None)
+    if catalog is not None:
+        names += catalog.complete(prefix, limit=None)
+    return names
+
+def run_batch_mode(args):
+    """Run --batch mode and return the process exit code (1 if any row failed)."""
+    fmt = args.format or detect_format(args.batch)
+    try:
+        input_handle = open_input(args.batch)
+        output_handle = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    except OSError as e:
+        print(f"\n❌ Could not open batch file: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        processed, failed = run_batch(input_handle, output_handle, fmt,
+                                      workers=max(1, args.workers), catalog_path=args.catalog)
+    finally:
+        if input_handle is not sys.stdin:
+            input_handle.close()
+        if output_handle is not sys.stdout:
+            output_handle.close()
+    
+    print(f"Processed {processed} rows ({failed} with errors)", file=sys.stderr)
+    return 1 if failed else 0
+
 def main():
     parser = argparse.ArgumentParser(
         description='PCR Reaction Calculator - Calculate reagent volumes for PCR reactions',
@@ -41,14 +93,27 @@ Examples:
   python pcr_calculator_cli.py --reactions 3 --preset "Q5® (NEB)"
   python pcr_calculator_cli.py --reactions 2 --preset "Phusion®" --primer-conc 5
   python pcr_calculator_cli.py --reactions 5 --template-ng 50 --template-conc 100
+  python pcr_calculator_cli.py --batch plate.csv --output results.csv --workers 4
+  cat requests.jsonl | python pcr_calculator_cli.py --batch - --format jsonl
         """
     )
     
     parser.add_argument('--reactions', type=float, 
                        help='Number of reactions')
-    parser.add_argument('--preset', choices=["Green"] + list(PCRCalculator.PRESETS.keys()),
-                       default="Green",
-                       help='Polymerase preset to use (default: Green)')
+    parser.add_argument('--preset', default="Green",
+                       help='Polymerase preset to use; a unique prefix is enough (default: Green)')
+    parser.add_argument('--catalog',
+                       help='JSON or TOML preset catalog to load in addition to the built-in presets')
+    parser.add_argument('--list-presets', nargs='?', const="", metavar='PREFIX',
+                       help='List preset names (optionally only those starting with PREFIX) and exit')
+    parser.add_argument('--batch', metavar='FILE',
+                       help='Calculate every request in a CSV or JSONL file ("-" for stdin)')
+    parser.add_argument('--format', choices=['csv', 'jsonl'],
+                       help='Batch input/output format (default: from file extension, else csv)')
+    parser.add_argument('--output', metavar='FILE',
+                       help='Write batch results to FILE instead of stdout')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for batch mode (default: 1)')
     parser.add_argument('--primer-conc', type=float,
                        help='Primer stock concentration in µM (overrides preset default)')
     parser.add_argument('--reaction-vol', type=float,
@@ -60,6 +125,25 @@ Examples:
     
     args = parser.parse_args()
     
+    try:
+        catalog = PresetCatalog.open(args.catalog) if args.catalog else None
+    except (OSError, ValueError) as e:
+        parser.error(f"could not load catalog: {e}")
+    
+    if args.list_presets is not None:
+        for name in list_presets(args.list_presets, catalog):
+            print(name)
+        return
+    
+    if args.batch:
+        sys.exit(run_batch_mode(args))
+    
+    if args.preset != DEFAULT_PRESET:
+        try:
+            args.preset = resolve_preset(args.preset, catalog)
+        except ValueError as e:
+            parser.error(str(e))
+    
     # Get number of reactions
     if args.reactions is not None:
         num_reactions = args.reactions
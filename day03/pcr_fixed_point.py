@@ -0,0 +1,199 @@
+"""
+Integer nanoliter fixed-point volume engine.
+
+An alternative to the float volumes of PCRCalculator: every volume is an
+integer number of nanoliters (nL) held in NumPy int64 arrays, so plate and
+batch totals add up exactly and summing across plates is integer work.
+
+Rounding rules:
+    1. Per-reaction component volumes are rounded to the nearest nL.
+       Water is then the reaction volume minus the other components, in
+       integer nL, so each reaction adds up exactly to its reaction volume.
+    2. Totals (per-reaction volume x reactions x safety factor) are rounded
+       to the pipette resolution with the engine's rounding mode: "ceil"
+       (default, never pipette less than needed), "nearest" (halves round
+       up) or "floor".
+
+The safety factor is applied as an exact fraction (1.1 -> 11/10), and the
+number of reactions is handled in thousandths, so no float error enters
+the totals.
+"""
+
+from fractions import Fraction
+
+import numpy as np
+
+from pcr_calculator import PCRCalculator, VOLUME_KEYS
+from pcr_batch import per_reaction_batch
+
+NL_PER_UL = 1000
+
+# Number of reactions is represented in thousandths of a reaction
+REACTION_SCALE = 1000
+
+VOLUME_DTYPE_NL = np.dtype([(key, np.int64) for key in VOLUME_KEYS])
+
+ROUNDING_MODES = ("ceil", "nearest", "floor")
+
+
+def _divide(numerator, denominator, mode):
+    """Integer division of int64 arrays with the given rounding mode."""
+    if mode == "ceil":
+        return -(-numerator // denominator)
+    if mode == "nearest":
+        return (numerator + denominator // 2) // denominator
+    return numerator // denominator
+
+
+def to_nanoliters(microliters):
+    """
+    Convert µL values to integer nL, rounding to the nearest nL.
+
+    Args:
+        microliters: Scalar or array of volumes in µL
+
+    Returns:
+        numpy.ndarray: int64 nL values
+    """
+    return np.rint(np.asarray(microliters, dtype=np.float64) * NL_PER_UL).astype(np.int64)
+
+
+def to_microliters(volumes_nl):
+    """
+    Convert integer nL volumes back to µL floats.
+
+    Args:
+        volumes_nl: int64 array, structured nL array, or dict of nL values
+
+    Returns:
+        Same shape as the input with µL float values
+    """
+    if isinstance(volumes_nl, dict):
+        return {key: value / NL_PER_UL for key, value in volumes_nl.items()}
+    volumes_nl = np.asarray(volumes_nl)
+    if volumes_nl.dtype.names:
+        return {key: volumes_nl[key] / NL_PER_UL for key in volumes_nl.dtype.names}
+    return volumes_nl / NL_PER_UL
+
+
+class FixedPointEngine:
+    """Calculates PCR volumes as exact integer nanoliters."""
+
+    def __init__(self, resolution_nl=100, rounding="ceil", safety_factor=None):
+        """
+        Initialize the engine.
+
+        Args:
+            resolution_nl (int): Pipette resolution in nL (100 = 0.1 µL)
+            rounding (str): "ceil", "nearest" or "floor" for totals
+            safety_factor (float): Defaults to PCRCalculator.SAFETY_FACTOR
+        """
+        if resolution_nl < 1 or int(resolution_nl) != resolution_nl:
+            raise ValueError("Pipette resolution must be a positive whole number of nL")
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Rounding must be one of: {', '.join(ROUNDING_MODES)}")
+
+        self.resolution_nl = int(resolution_nl)
+        self.rounding = rounding
+        factor = Fraction(str(safety_factor or PCRCalculator.SAFETY_FACTOR))
+        self.safety_numerator = factor.numerator
+        self.safety_denominator = factor.denominator
+
+    def per_reaction_nl(self, num_reactions, preset=None, primer_concentration=None,
+                        reaction_volume=None, template_dna_ng=None,
+                        template_dna_concentration=None):
+        """
+        Per-reaction component volumes in integer nL.
+
+        Arguments are scalars or columns, as for calculate_volumes_batch.
+
+        Returns:
+            tuple: (reactions in thousandths (int64), (n, 5) int64 nL array
+                in VOLUME_KEYS order, validity mask)
+        """
+        reactions, per_reaction, total_rxn_vol, valid = per_reaction_batch(
+            num_reactions, preset, primer_concentration, reaction_volume,
+            template_dna_ng, template_dna_concentration)
+
+        with np.errstate(invalid="ignore"):
+            components = np.stack([np.nan_to_num(v) for v in per_reaction[:4]], axis=1)
+            volumes = np.empty((reactions.size, 5), dtype=np.int64)
+            volumes[:, :4] = to_nanoliters(components)
+            volumes[:, 4] = to_nanoliters(np.nan_to_num(total_rxn_vol)) - volumes[:, :4].sum(axis=1)
+
+        # Validity is re-checked in integer nL so water is never negative
+        valid = valid & (volumes[:, 4] >= 0) & np.isfinite(reactions)
+        volumes[~valid] = 0
+        milli_reactions = np.rint(np.where(valid, reactions, 0) * REACTION_SCALE).astype(np.int64)
+        return milli_reactions, volumes, valid
+
+    def totals_nl(self, milli_reactions, per_reaction_nl):
+        """
+        Scale per-reaction nL volumes to totals with the safety factor.
+
+        Args:
+            milli_reactions: int64 reactions in thousandths, shape (n,)
+            per_reaction_nl: int64 nL volumes, shape (n, 5)
+
+        Returns:
+            numpy.ndarray: int64 nL totals rounded to the pipette resolution
+        """
+        numerator = per_reaction_nl * milli_reactions[:, None] * self.safety_numerator
+        denominator = REACTION_SCALE * self.safety_denominator * self.resolution_nl
+        return _divide(numerator, denominator, self.rounding) * self.resolution_nl
+
+    def calculate_volumes_batch(self, num_reactions, preset=None, primer_concentration=None,
+                                reaction_volume=None, template_dna_ng=None,
+                                template_dna_concentration=None):
+        """
+        Calculate total volumes for many wells as integer nL.
+
+        Returns:
+            tuple: (structured int64 array with the calculate_volumes keys as
+                fields, validity mask); invalid wells are all zeros
+        """
+        milli_reactions, per_reaction, valid = self.per_reaction_nl(
+            num_reactions, preset, primer_concentration, reaction_volume,
+            template_dna_ng, template_dna_concentration)
+        totals = self.totals_nl(milli_reactions, per_reaction)
+        return totals.view(VOLUME_DTYPE_NL).reshape(-1), valid
+
+    def calculate_volumes(self, num_reactions, preset=None, primer_concentration=None,
+                          reaction_volume=None, template_dna_ng=None,
+                          template_dna_concentration=None):
+        """
+        Calculate total volumes for one reaction set as integer nL.
+
+        Returns:
+            dict: Same keys as PCRCalculator.calculate_volumes, int nL values
+
+        Raises:
+            ValueError: If the parameters are invalid (same checks as
+                PCRCalculator.calculate_volumes)
+        """
+        # Run the float calculator first for its validation and messages
+        PCRCalculator.calculate_volumes(
+            num_reactions, preset, primer_concentration, reaction_volume,
+            template_dna_ng, template_dna_concentration)
+        volumes, valid = self.calculate_volumes_batch(
+            num_reactions, preset, primer_concentration, reaction_volume,
+            template_dna_ng, template_dna_concentration)
+        if not valid[0]:
+            raise ValueError("Component volumes exceed total reaction volume after rounding to nL.")
+        return {key: int(volumes[key][0]) for key in VOLUME_KEYS}
+
+    @staticmethod
+    def plate_totals(volumes_nl, valid=None):
+        """
+        Sum structured nL volumes over wells (exact integer sums).
+
+        Args:
+            volumes_nl: Structured int64 array from calculate_volumes_batch
+            valid: Optional mask of wells to include
+
+        Returns:
+            dict: Component key -> total nL (int)
+        """
+        if valid is not None:
+            volumes_nl = volumes_nl[valid]
+        return {key: int(volumes_nl[key].sum()) for key in VOLUME_KEYS}
@@ -0,0 +1,233 @@
+"""
+Parameter-sweep feasibility engine for PCR reaction design.
+
+Evaluates the full Cartesian grid of primer concentration x reaction volume
+x template DNA amount x template DNA concentration for one preset, using the
+same rules as PCRCalculator.calculate_volumes. A point is feasible when
+calculate_volumes would not raise ValueError for it.
+
+The water volume only depends on the axes through three separable terms
+(primer scaling, template volume, total volume), so each chunk is computed
+by broadcasting small 1-D/2-D arrays. Chunks are taken along the primer and
+reaction volume axes, which keeps temporary memory bounded for grids of
+10^7+ points.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from pcr_calculator import PCRCalculator
+
+# Points evaluated per chunk (about 8 MB per float64 temporary)
+CHUNK_POINTS = 1 << 20
+
+AXES = ("primer_concentration", "reaction_volume", "template_dna_ng",
+        "template_dna_concentration")
+
+SweepChunk = namedtuple(
+    "SweepChunk", ["primer_slice", "volume_slice", "feasible", "water", "primer"]
+)
+
+
+class SweepResult:
+    """Dense results of a parameter sweep over the four axes in AXES order."""
+
+    def __init__(self, axes, feasible, water, primer, required_volume):
+        """
+        Args:
+            axes (dict): Axis name -> 1-D array of values
+            feasible (numpy.ndarray): Boolean mask, one entry per grid point
+            water (numpy.ndarray): Water volume per grid point (NaN if infeasible)
+            primer (numpy.ndarray): Forward/reverse primer volumes, shape
+                (2, len(primer axis)), broadcast over the other axes
+            required_volume (numpy.ndarray): Smallest feasible reaction volume
+                per (primer, template ng, template conc) point
+        """
+        self.axes = axes
+        self.feasible = feasible
+        self.water = water
+        self.primer = primer
+        self.required_volume = required_volume
+
+    @property
+    def shape(self):
+        return self.feasible.shape
+
+    def feasible_fraction(self):
+        """Return the share of grid points that are feasible (0.0 to 1.0)."""
+        return float(self.feasible.mean()) if self.feasible.size else 0.0
+
+    def primer_volume(self, which=0):
+        """
+        Return the primer volume broadcast to the full grid shape.
+
+        Args:
+            which (int): 0 for forward, 1 for reverse primer
+
+        Returns:
+            numpy.ndarray: Read-only view with the grid's shape
+        """
+        return np.broadcast_to(self.primer[which][:, None, None, None], self.shape)
+
+    def boundary_mask(self):
+        """
+        Return feasible points that have an infeasible neighbour on any axis.
+
+        Returns:
+            numpy.ndarray: Boolean mask with the grid's shape
+        """
+        feasible = self.feasible
+        boundary = np.zeros_like(feasible)
+        for axis in range(feasible.ndim):
+            if feasible.shape[axis] < 2:
+                continue
+            before = [slice(None)] * feasible.ndim
+            after = [slice(None)] * feasible.ndim
+            before[axis] = slice(None, -1)
+            after[axis] = slice(1, None)
+            edge = feasible[tuple(before)] != feasible[tuple(after)]
+            boundary[tuple(before)] |= edge & feasible[tuple(before)]
+            boundary[tuple(after)] |= edge & feasible[tuple(after)]
+        return boundary
+
+    def boundary_points(self):
+        """
+        Return the parameter values at the feasible region boundary.
+
+        Returns:
+            dict: Axis name -> array of values, one entry per boundary point
+        """
+        indices = np.nonzero(self.boundary_mask())
+        return {name: self.axes[name][index] for name, index in zip(AXES, indices)}
+
+
+def _axis(values):
+    """Return an axis as a 1-D float64 array; None means 'not given'."""
+    if values is None:
+        return np.array([np.nan])
+    return np.atleast_1d(np.asarray(values, dtype=np.float64))
+
+
+def _given(values):
+    """Mirror the scalar `if value:` test: not missing and not zero."""
+    return ~np.isnan(values) & (values != 0)
+
+
+def _separable_terms(preset, axes):
+    """
+    Compute the per-axis terms of the water volume equation.
+
+    Returns:
+        tuple: (master mix volume, primer volumes (2, P), total volume (R,),
+            template volume (N, C), template validity (N, C))
+    """
+    (master_mix_vol, primer_f_vol, primer_r_vol, template_vol,
+     _, default_rxn_vol) = PCRCalculator.get_recipe(preset).coefficients
+
+    primer_conc = axes["primer_concentration"]
+    reaction_vol = axes["reaction_volume"]
+    template_ng = axes["template_dna_ng"][:, None]
+    template_conc = axes["template_dna_concentration"][None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = _given(primer_conc) & (primer_conc != 10.0)
+        factor = 10.0 / primer_conc
+        primer = np.stack([
+            np.where(scale, primer_f_vol * factor, primer_f_vol),
+            np.where(scale, primer_r_vol * factor, primer_r_vol),
+        ])
+
+        use_template = _given(template_conc) & _given(template_ng)
+        template_valid = ~(use_template & ((template_conc <= 0) | (template_ng < 0)))
+        template = np.where(use_template, template_ng / template_conc, template_vol)
+
+    total = np.where(_given(reaction_vol), reaction_vol, default_rxn_vol)
+    return master_mix_vol, primer, total, template, template_valid
+
+
+def iter_sweep_chunks(preset=None, primer_concentrations=None, reaction_volumes=None,
+                      template_dna_ngs=None, template_dna_concentrations=None,
+                      num_reactions=1, chunk_points=CHUNK_POINTS):
+    """
+    Evaluate a parameter grid block by block along the first two axes.
+
+    Use this instead of sweep() when the dense result would not fit in
+    memory; only one chunk is alive at a time.
+
+    Args:
+        preset (str): Preset name (None for the default recipe)
+        primer_concentrations: Values for the primer stock concentration axis
+        reaction_volumes: Values for the total reaction volume axis
+        template_dna_ngs: Values for the template amount axis
+        template_dna_concentrations: Values for the template concentration axis
+        num_reactions (float): Number of reactions the volumes are scaled to
+        chunk_points (int): Approximate number of grid points per chunk
+
+    Yields:
+        SweepChunk: primer and reaction volume axis slices, feasibility
+            mask, water and primer volumes (scaled like calculate_volumes)
+            for that block
+    """
+    if num_reactions <= 0:
+        raise ValueError("Number of reactions must be greater than 0")
+    axes = dict(zip(AXES, map(_axis, (primer_concentrations, reaction_volumes,
+                                      template_dna_ngs, template_dna_concentrations))))
+    master_mix_vol, primer, total, template, template_valid = _separable_terms(preset, axes)
+    scale = float(num_reactions)
+    safety = PCRCalculator.SAFETY_FACTOR
+
+    # Chunk over (primer, reaction volume) blocks; template axes stay whole
+    template_points = template.size
+    volume_step = max(1, min(total.size, chunk_points // max(1, template_points)))
+    primer_step = max(1, chunk_points // (volume_step * template_points))
+    for p_start in range(0, primer.shape[1], primer_step):
+        primer_slice = slice(p_start, min(p_start + primer_step, primer.shape[1]))
+        primer_f = primer[0, primer_slice][:, None, None, None]
+        primer_r = primer[1, primer_slice][:, None, None, None]
+        # Same operation order as calculate_volumes for identical results
+        components = master_mix_vol + primer_f + primer_r + template[None, None, :, :]
+        primer_volumes = primer[:, primer_slice] * scale * safety
+
+        for v_start in range(0, total.size, volume_step):
+            volume_slice = slice(v_start, min(v_start + volume_step, total.size))
+            water = total[None, volume_slice, None, None] - components
+            feasible = (water >= 0) & template_valid[None, None, :, :]
+            water = np.where(feasible, water * scale * safety, np.nan)
+            yield SweepChunk(primer_slice, volume_slice, feasible, water, primer_volumes)
+
+
+def sweep(preset=None, primer_concentrations=None, reaction_volumes=None,
+          template_dna_ngs=None, template_dna_concentrations=None,
+          num_reactions=1, chunk_points=CHUNK_POINTS, water_dtype=np.float64):
+    """
+    Evaluate the full parameter grid and return dense results.
+
+    Axes left as None use the preset default. Arguments are the same as
+    iter_sweep_chunks, plus:
+
+    Args:
+        water_dtype: dtype of the water tensor (float32 halves its memory)
+
+    Returns:
+        SweepResult: Feasibility mask, water/primer volumes and boundary helpers
+    """
+    axes = dict(zip(AXES, map(_axis, (primer_concentrations, reaction_volumes,
+                                      template_dna_ngs, template_dna_concentrations))))
+    shape = tuple(axes[name].size for name in AXES)
+    feasible = np.empty(shape, dtype=bool)
+    water = np.empty(shape, dtype=water_dtype)
+    primer = np.empty((2, shape[0]))
+
+    for chunk in iter_sweep_chunks(preset, *(axes[name] for name in AXES),
+                                   num_reactions=num_reactions, chunk_points=chunk_points):
+        block = (chunk.primer_slice, chunk.volume_slice)
+        feasible[block] = chunk.feasible
+        water[block] = chunk.water
+        primer[:, chunk.primer_slice] = chunk.primer
+
+    # Water is non-negative exactly when the reaction volume covers the components
+    master_mix_vol, primer_per_reaction, _, template, _ = _separable_terms(preset, axes)
+    required_volume = (master_mix_vol + primer_per_reaction[0][:, None, None]
+                       + primer_per_reaction[1][:, None, None] + template[None, :, :])
+    return SweepResult(axes, feasible, water, primer, required_volume)
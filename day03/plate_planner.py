@@ -0,0 +1,292 @@
+"""
+Plate layout planner for PCRCalculator.
+
+Groups the wells of 96/384/1536-well plates by reaction type (preset and
+primer stock), computes one pooled mix of the shared reagents per group
+(with SAFETY_FACTOR) and streams a liquid-handler worklist CSV row by row.
+Template and water depend on each sample's concentration and reaction
+volume, so they are dispensed per well.
+
+The layout is read twice: once to count wells per reaction type and once
+to write the dispensing rows. Only one counter per reaction type and the
+first MAX_INVALID_WELLS invalid wells are held in memory, so memory stays
+bounded no matter how many wells or plates are planned. Wells whose
+parameters are invalid are listed individually and left out of the mixes
+instead of failing the plan.
+"""
+
+import csv
+import string
+from collections import namedtuple
+
+from pcr_calculator import DEFAULT_PRESET, PCRCalculator
+
+# Plate size -> (rows, columns)
+PLATE_FORMATS = {
+    96: (8, 12),
+    384: (16, 24),
+    1536: (32, 48),
+}
+
+# Components pooled into the master mix (template and water are added per well)
+MIX_COMPONENTS = ("Master Mix", "Primer Forward", "Primer Reverse")
+
+# Invalid wells kept with their error message (the rest are only counted)
+MAX_INVALID_WELLS = 1000
+
+WORKLIST_HEADER = ["Step", "Source", "Destination", "Well", "Volume (µL)"]
+
+LAYOUT_FIELDS = (
+    "plate",
+    "well",
+    "preset",
+    "template_dna_ng",
+    "template_dna_concentration",
+    "primer_concentration",
+    "reaction_volume",
+)
+
+Well = namedtuple("Well", LAYOUT_FIELDS, defaults=(None,) * 5)
+
+# Wells share a mix when all of these match
+MixRecipe = namedtuple("MixRecipe", ["preset", "primer_concentration"])
+
+_NUMERIC_FIELDS = LAYOUT_FIELDS[3:]
+
+
+def well_names(plate_size):
+    """
+    Generate well names (A1, A2, ...) for a plate in row-major order.
+
+    Args:
+        plate_size (int): 96, 384 or 1536
+
+    Yields:
+        str: Well names
+    """
+    if plate_size not in PLATE_FORMATS:
+        raise ValueError(f"Unsupported plate size: {plate_size}")
+    rows, columns = PLATE_FORMATS[plate_size]
+    for row in range(rows):
+        for column in range(1, columns + 1):
+            yield f"{_row_label(row)}{column}"
+
+
+def _row_label(row):
+    """Return the row label for a 0-based row index (A..Z, AA..AF)."""
+    letters = string.ascii_uppercase
+    if row < len(letters):
+        return letters[row]
+    return letters[row // len(letters) - 1] + letters[row % len(letters)]
+
+
+def read_layout_csv(path):
+    """
+    Stream wells from a layout CSV file.
+
+    The CSV needs 'plate' and 'well' columns; the other Well fields are
+    optional and empty cells mean "use the preset default".
+
+    Args:
+        path (str): Path to the layout CSV
+
+    Yields:
+        Well: One record per CSV row
+
+    Raises:
+        ValueError: If a numeric cell is not a number
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            values = {}
+            for field in LAYOUT_FIELDS:
+                value = (row.get(field) or "").strip()
+                if field in _NUMERIC_FIELDS:
+                    try:
+                        values[field] = float(value) if value else None
+                    except ValueError as e:
+                        raise ValueError(f"{path} line {reader.line_num}: {field} must be a number, "
+                                         f"got {value!r}") from e
+                else:
+                    values[field] = value or None
+            yield Well(**values)
+
+
+def mix_recipe(well):
+    """
+    Return the master-mix recipe a well belongs to.
+
+    Args:
+        well (Well): Well record
+
+    Returns:
+        MixRecipe: Hashable recipe key (preset None for the default Green mix)
+
+    Raises:
+        ValueError: If the preset is unknown
+    """
+    preset = well.preset
+    if preset == DEFAULT_PRESET:
+        preset = None
+    elif preset and preset not in PCRCalculator.PRESETS:
+        raise ValueError(f"Unknown preset {preset!r}")
+    return MixRecipe(preset or None, well.primer_concentration or None)
+
+
+def _well_kwargs(well, recipe):
+    """Build calculate_volumes keyword arguments for a well."""
+    return {
+        "preset": recipe.preset,
+        "primer_concentration": recipe.primer_concentration,
+        "reaction_volume": well.reaction_volume or None,
+        "template_dna_ng": well.template_dna_ng,
+        "template_dna_concentration": well.template_dna_concentration,
+    }
+
+
+class PlatePlanner:
+    """Plans pooled master mixes and worklists for plate layouts."""
+
+    def __init__(self, plate_size=96):
+        """
+        Initialize an empty planner.
+
+        Args:
+            plate_size (int): Plate format of the layout (96, 384 or 1536);
+                wells must be named as in well_names(plate_size)
+        """
+        self.plate_size = plate_size
+        self.groups = {}
+        self.well_count = 0
+        self.invalid_wells = []
+        self.invalid_count = 0
+        self._well_names = frozenset(well_names(plate_size))
+
+    def _volumes(self, well):
+        """
+        Return a well's recipe and per-reaction volumes.
+
+        Returns:
+            tuple: (MixRecipe, volumes dict without the safety factor)
+
+        Raises:
+            ValueError: If the well name, preset or parameters are invalid
+        """
+        if well.well not in self._well_names:
+            raise ValueError(f"{well.well!r} is not a well of a {self.plate_size}-well plate")
+        recipe = mix_recipe(well)
+        volumes = PCRCalculator.calculate_volumes(1, **_well_kwargs(well, recipe))
+        safety = PCRCalculator.SAFETY_FACTOR
+        return recipe, {component: volume / safety for component, volume in volumes.items()}
+
+    def add_wells(self, wells):
+        """
+        Count wells per master-mix recipe.
+
+        Wells with invalid parameters are not counted. They are counted in
+        invalid_count, and the first MAX_INVALID_WELLS are recorded in
+        invalid_wells as (plate, well, error message) tuples.
+
+        Args:
+            wells: Iterable of Well records
+        """
+        groups = self.groups
+        for well in wells:
+            try:
+                recipe, _ = self._volumes(well)
+            except ValueError as e:
+                self.invalid_count += 1
+                if len(self.invalid_wells) < MAX_INVALID_WELLS:
+                    self.invalid_wells.append((well.plate, well.well, str(e)))
+                continue
+            if recipe in groups:
+                groups[recipe][0] += 1
+            else:
+                # Any valid well of the group gives the shared reagent volumes
+                groups[recipe] = [1, _well_kwargs(well, recipe)]
+            self.well_count += 1
+
+    def mixes(self):
+        """
+        Compute one pooled mix per recipe group.
+
+        Returns:
+            list: (mix name, recipe, well count, pooled volumes dict) tuples,
+                with volumes including SAFETY_FACTOR (invalid wells were
+                already left out by add_wells)
+        """
+        mixes = []
+        for number, (recipe, (count, kwargs)) in enumerate(self.groups.items(), start=1):
+            volumes = PCRCalculator.calculate_volumes(count, **kwargs)
+            pooled = {component: volumes[component] for component in MIX_COMPONENTS}
+            mixes.append((f"MIX-{number}", recipe, count, pooled))
+        return mixes
+
+    def iter_worklist_rows(self, wells):
+        """
+        Generate worklist rows: mix preparation first, then per-well dispensing
+        of water, mix and template.
+
+        Invalid wells (see add_wells) get no rows.
+
+        Args:
+            wells: Iterable of Well records (the same layout passed to add_wells)
+
+        Yields:
+            list: CSV rows matching WORKLIST_HEADER
+        """
+        mix_names = {}
+        for name, recipe, count, pooled in self.mixes():
+            mix_names[recipe] = name
+            for component in MIX_COMPONENTS:
+                yield ["prepare", component, name, "", f"{pooled[component]:.2f}"]
+
+        for well in wells:
+            try:
+                recipe, volumes = self._volumes(well)
+            except ValueError:
+                continue  # invalid well
+            mix_volume = sum(volumes[component] for component in MIX_COMPONENTS)
+            yield ["water", "Water (ddH₂O)", well.plate, well.well, f"{volumes['Water (ddH₂O)']:.2f}"]
+            yield ["dispense", mix_names[recipe], well.plate, well.well, f"{mix_volume:.2f}"]
+            yield ["template", "Template DNA", well.plate, well.well, f"{volumes['Template DNA']:.2f}"]
+
+    def write_worklist(self, wells, handle):
+        """
+        Stream the worklist CSV to an open file handle.
+
+        Args:
+            wells: Iterable of Well records
+            handle: Writable text file object
+
+        Returns:
+            int: Number of rows written (excluding the header)
+        """
+        writer = csv.writer(handle)
+        writer.writerow(WORKLIST_HEADER)
+        rows = 0
+        for row in self.iter_worklist_rows(wells):
+            writer.writerow(row)
+            rows += 1
+        return rows
+
+
+def plan_layout_file(layout_path, worklist_path, plate_size=96):
+    """
+    Plan a layout CSV and write its worklist CSV.
+
+    Args:
+        layout_path (str): Path to the layout CSV
+        worklist_path (str): Path of the worklist CSV to write
+        plate_size (int): Plate format of the layout (96, 384 or 1536)
+
+    Returns:
+        PlatePlanner: The planner, with its recipe groups and invalid_wells
+            filled in
+    """
+    planner = PlatePlanner(plate_size)
+    planner.add_wells(read_layout_csv(layout_path))
+    with open(worklist_path, "w", newline="", encoding="utf-8") as handle:
+        planner.write_worklist(read_layout_csv(layout_path), handle)
+    return planner
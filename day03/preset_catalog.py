@@ -0,0 +1,340 @@
+"""
+External preset catalog for PCRCalculator.
+
+Loads polymerase presets from a JSON or TOML catalog file and compiles them
+into a binary cache next to the source (``<catalog>.cache``). Later starts
+memory-map the cache instead of parsing the catalog again; the cache is
+rebuilt only when the catalog's size or modification time changes.
+
+The cache stores the presets sorted by case-folded name (for prefix lookup
+with bisect) plus a sorted trigram table (for fuzzy lookup), so resolving
+or autocompleting a name does not scan the whole catalog.
+
+Cache layout (little-endian):
+    header      magic, source size, source mtime, preset count, trigram count
+    records     one RECORD per preset, sorted by case-folded key
+    trigrams    sorted uint32 trigram hashes, then matching uint32 record indices
+    strings     UTF-8 keys, display names and descriptions
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_left
+from collections import Counter
+
+from pcr_calculator import PCRCalculator, RECIPE_FIELDS
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+MAGIC = b"PCRCAT01"
+HEADER = struct.Struct("<8sQqII")
+# Six recipe values, then (offset, length) for key, display name and description
+RECORD = struct.Struct("<6d6I")
+
+
+def _trigrams(text):
+    """Return the set of character trigrams of a padded, case-folded name."""
+    padded = f"  {text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _trigram_hash(trigram):
+    """Return a stable 32-bit hash for a trigram."""
+    return zlib.crc32(trigram.encode("utf-8"))
+
+
+def read_catalog_source(path):
+    """
+    Parse a JSON or TOML catalog file.
+
+    The file maps preset names to preset dicts with the same fields as
+    PCRCalculator.PRESETS, either at the top level or under a "presets" key.
+
+    Args:
+        path (str): Path to a .json or .toml catalog
+
+    Returns:
+        dict: Preset name -> preset dict
+
+    Raises:
+        ValueError: If the file format is unsupported or a preset is incomplete
+    """
+    if path.lower().endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML catalogs require Python 3.11 or newer")
+        with open(path, "rb") as handle:
+            data = tomllib.load(handle)
+    elif path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    else:
+        raise ValueError(f"Unsupported catalog format: {path}")
+
+    presets = data.get("presets", data)
+    for name, preset in presets.items():
+        missing = [field for field in RECIPE_FIELDS if field not in preset]
+        if missing:
+            raise ValueError(f"Preset {name!r} is missing: {', '.join(missing)}")
+    return presets
+
+
+def build_cache(presets, source_size=0, source_mtime_ns=0):
+    """
+    Compile presets into the binary cache format.
+
+    Args:
+        presets (dict): Preset name -> preset dict
+        source_size (int): Size of the catalog file the presets came from
+        source_mtime_ns (int): Modification time of that file
+
+    Returns:
+        bytes: Cache contents
+    """
+    keys = sorted(presets, key=str.casefold)
+    strings = bytearray()
+    records = bytearray()
+    trigram_pairs = []
+
+    def add_string(text):
+        encoded = text.encode("utf-8")
+        offset = len(strings)
+        strings.extend(encoded)
+        return offset, len(encoded)
+
+    for index, key in enumerate(keys):
+        preset = presets[key]
+        values = [float(preset[field]) for field in RECIPE_FIELDS]
+        refs = add_string(key) + add_string(preset.get("name", key)) \
+            + add_string(preset.get("description", ""))
+        records.extend(RECORD.pack(*values, *refs))
+        trigram_pairs.extend((_trigram_hash(t), index) for t in _trigrams(key))
+
+    trigram_pairs.sort()
+    hashes = struct.pack(f"<{len(trigram_pairs)}I", *(h for h, _ in trigram_pairs))
+    indices = struct.pack(f"<{len(trigram_pairs)}I", *(i for _, i in trigram_pairs))
+    header = HEADER.pack(MAGIC, source_size, source_mtime_ns, len(keys), len(trigram_pairs))
+    return header + bytes(records) + hashes + indices + bytes(strings)
+
+
+class _FoldedKeys:
+    """Sequence view of case-folded preset keys, used with bisect."""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def __len__(self):
+        return len(self.catalog)
+
+    def __getitem__(self, index):
+        return self.catalog.key(index).casefold()
+
+
+class PresetCatalog:
+    """Read-only preset catalog backed by the binary cache format."""
+
+    def __init__(self, buffer):
+        """
+        Wrap a cache buffer (bytes or an mmap).
+
+        Args:
+            buffer: Cache contents as produced by build_cache
+        """
+        magic, self.source_size, self.source_mtime_ns, self.count, trigram_count = \
+            HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a preset catalog cache")
+
+        self._buffer = buffer
+        self._records_offset = HEADER.size
+        trigrams_offset = self._records_offset + self.count * RECORD.size
+        view = memoryview(buffer)
+        self._trigram_hashes = view[trigrams_offset:trigrams_offset + 4 * trigram_count].cast("I")
+        indices_offset = trigrams_offset + 4 * trigram_count
+        self._trigram_indices = view[indices_offset:indices_offset + 4 * trigram_count].cast("I")
+        self._strings_offset = indices_offset + 4 * trigram_count
+
+    @classmethod
+    def from_presets(cls, presets):
+        """Build an in-memory catalog from a presets dict."""
+        return cls(build_cache(presets))
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open a catalog file, using or rebuilding its binary cache.
+
+        Args:
+            path (str): Path to a .json or .toml catalog
+
+        Returns:
+            PresetCatalog: Catalog backed by the memory-mapped cache
+        """
+        stat = os.stat(path)
+        cache_path = path + ".cache"
+        catalog = cls._open_cache(cache_path)
+        if catalog and (catalog.source_size, catalog.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return catalog
+
+        data = build_cache(read_catalog_source(path), stat.st_size, stat.st_mtime_ns)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, cache_path)
+        return cls._open_cache(cache_path)
+
+    @classmethod
+    def _open_cache(cls, cache_path):
+        """Memory-map an existing cache file, or return None if unusable."""
+        try:
+            with open(cache_path, "rb") as handle:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buffer)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return bytes(self._buffer[start:start + length]).decode("utf-8")
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._buffer, self._records_offset + index * RECORD.size)
+
+    def key(self, index):
+        """Return the preset key stored at a record index."""
+        record = self._record(index)
+        return self._string(record[6], record[7])
+
+    def preset(self, index):
+        """
+        Return a preset in PCRCalculator.PRESETS format.
+
+        Args:
+            index (int): Record index
+
+        Returns:
+            dict: Preset fields including 'name' and 'description'
+        """
+        record = self._record(index)
+        preset = dict(zip(RECIPE_FIELDS, record[:6]))
+        preset["name"] = self._string(record[8], record[9])
+        preset["description"] = self._string(record[10], record[11])
+        return preset
+
+    def find(self, name):
+        """Return the record index of an exact preset name, or None."""
+        folded = name.casefold()
+        index = bisect_left(_FoldedKeys(self), folded)
+        while index < self.count and self.key(index).casefold() == folded:
+            if self.key(index) == name:
+                return index
+            index += 1
+        return None
+
+    def complete(self, prefix, limit=20):
+        """
+        Return preset names starting with a prefix (case-insensitive).
+
+        Args:
+            prefix (str): Typed prefix
+            limit (int): Maximum number of names to return (None for all)
+
+        Returns:
+            list: Matching preset names in sorted order
+        """
+        folded = prefix.casefold()
+        index = bisect_left(_FoldedKeys(self), folded)
+        names = []
+        while index < self.count and (limit is None or len(names) < limit):
+            key = self.key(index)
+            if not key.casefold().startswith(folded):
+                break
+            names.append(key)
+            index += 1
+        return names
+
+    def fuzzy(self, query, limit=5):
+        """
+        Return the preset names most similar to a query, by shared trigrams.
+
+        Args:
+            query (str): Possibly misspelled preset name
+            limit (int): Maximum number of names to return
+
+        Returns:
+            list: Preset names, best match first
+        """
+        query_trigrams = _trigrams(query)
+        shared = Counter()
+        hashes = self._trigram_hashes
+        total = len(hashes)
+        for trigram in query_trigrams:
+            h = _trigram_hash(trigram)
+            position = bisect_left(hashes, h)
+            while position < total and hashes[position] == h:
+                shared[self._trigram_indices[position]] += 1
+                position += 1
+
+        # Only the records sharing the most trigrams can score best
+        scored = []
+        for index, count in shared.most_common(limit * 4):
+            key = self.key(index)
+            union = len(query_trigrams) + len(_trigrams(key)) - count
+            scored.append((-count / union, key))
+        scored.sort()
+        return [key for _, key in scored[:limit]]
+
+    def resolve(self, name):
+        """
+        Resolve a typed name to a preset key.
+
+        Exact names win, then a unique case-insensitive name, then a
+        unique case-insensitive prefix.
+
+        Args:
+            name (str): Preset name or prefix
+
+        Returns:
+            str: Matching preset key
+
+        Raises:
+            ValueError: If the name is unknown or ambiguous (with suggestions)
+        """
+        if self.find(name) is not None:
+            return name
+        matches = self.complete(name)
+        # Names equal ignoring case sort first among the prefix matches
+        same = [key for key in matches if key.casefold() == name.casefold()]
+        if len(same) == 1:
+            return same[0]
+        if len(matches) == 1:
+            return matches[0]
+        suggestions = matches or self.fuzzy(name)
+        message = f"Unknown preset {name!r}"
+        if suggestions:
+            message += f". Did you mean: {', '.join(suggestions)}?"
+        raise ValueError(message)
+
+    def install(self, name):
+        """
+        Make a catalog preset available to PCRCalculator.calculate_volumes.
+
+        Args:
+            name (str): Preset name or prefix
+
+        Returns:
+            str: The resolved preset key
+        """
+        key = self.resolve(name)
+        if key not in PCRCalculator.PRESETS:
+            PCRCalculator.PRESETS[key] = self.preset(self.find(key))
+            PCRCalculator.compile_presets()
+        return key
@@ -0,0 +1,300 @@
+"""
+Sliding-window primer design over long template sequences.
+
+Scans a FASTA template (up to whole bacterial genomes) for forward and
+reverse primer candidates that meet length, GC, Tm and 3' clamp
+constraints, and pairs them into amplicons of the requested size.
+
+The template is read in blocks of bytes, never as one Python string. Per
+block, prefix sums of GC counts, unknown bases and nearest-neighbor dH/dS
+give every window's statistics as a difference of two prefix values, so a
+scan costs O(n) per primer length instead of O(n x primer length). Blocks
+overlap by (max length - 1) bases so no window is lost at a boundary.
+
+Nearest-neighbor parameters describe the duplex, so a window and its
+reverse complement share dH/dS; one pass scores both strands. Tm uses the
+primer concentration of the chosen preset, like primer_thermo (windows are
+not checked for self-complementarity, which makes poor primers anyway).
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+import numpy as np
+
+from primer_thermo import (NN_DELTA_H, NN_DELTA_S, OTHER, _ENCODE, _INIT_H, _INIT_S,
+                           melting_temperature, reaction_primer_concentration,
+                           salt_corrected_entropy)
+
+# Bases read per block (the block also carries the overlap)
+BLOCK_SIZE = 1 << 20
+
+PrimerConstraints = namedtuple(
+    "PrimerConstraints",
+    ["min_length", "max_length", "min_gc", "max_gc", "min_tm", "max_tm",
+     "gc_clamp", "max_3prime_gc"],
+    defaults=(18, 25, 0.40, 0.60, 55.0, 65.0, True, 3),
+)
+
+# strand is "+" (forward) or "-" (reverse); start/end are 0-based template
+# coordinates of the binding window, sequence is written 5'->3'
+PrimerCandidate = namedtuple(
+    "PrimerCandidate", ["record", "strand", "start", "end", "sequence", "gc_fraction", "tm"]
+)
+
+PrimerPair = namedtuple(
+    "PrimerPair", ["record", "forward", "reverse", "product_size", "tm_difference", "preset"]
+)
+
+_COMPLEMENT = bytes.maketrans(b"ACGTacgt", b"TGCAtgca")
+
+
+def reverse_complement(sequence):
+    """Return the reverse complement of a DNA sequence (bytes)."""
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def read_fasta_blocks(handle, block_size=BLOCK_SIZE, overlap=0):
+    """
+    Stream a FASTA file as overlapping sequence blocks.
+
+    Args:
+        handle: FASTA file opened in binary mode
+        block_size (int): New bases per block
+        overlap (int): Bases repeated from the end of the previous block
+
+    Yields:
+        tuple: (record name, offset of the block in the record, block bytes,
+            True for the last block of a record)
+    """
+    name = None
+    offset = 0
+    buffer = bytearray()
+    for line in handle:
+        if line.startswith(b">"):
+            if name is not None:
+                yield name, offset, bytes(buffer), True
+            name = line[1:].split(None, 1)[0].decode("ascii", "replace") if line[1:].strip() else ""
+            offset = 0
+            buffer = bytearray()
+            continue
+        buffer += line.strip()
+        if len(buffer) >= block_size + overlap:
+            yield name, offset, bytes(buffer), False
+            keep = min(overlap, len(buffer))
+            offset += len(buffer) - keep
+            del buffer[:len(buffer) - keep]
+    if name is not None:
+        yield name, offset, bytes(buffer), True
+
+
+def _prefix(values):
+    """Prefix sums with a leading zero."""
+    out = np.zeros(len(values) + 1, dtype=np.result_type(values, np.int64))
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def _block_prefixes(codes):
+    """Prefix sums of GC count, unknown bases and nearest-neighbor dH/dS."""
+    pair_index = codes[:-1].astype(np.intp) * 5 + codes[1:]
+    return (_prefix((codes == 1) | (codes == 2)), _prefix(codes == OTHER),
+            _prefix(NN_DELTA_H[pair_index]), _prefix(NN_DELTA_S[pair_index]))
+
+
+def _scan_block(codes, prefixes, limit, length, constraints, primer_nm, conditions):
+    """
+    Score every window of one length starting before limit.
+
+    Returns:
+        tuple: (window starts, Tm, GC fraction, forward mask, reverse mask)
+    """
+    gc, unknown, nn_h, nn_s = prefixes
+    starts = np.arange(limit)
+    ends = starts + length
+    gc_count = gc[ends] - gc[starts]
+    gc_fraction = gc_count / length
+    usable = ((unknown[ends] == unknown[starts])
+              & (gc_fraction >= constraints.min_gc) & (gc_fraction <= constraints.max_gc))
+
+    first = codes[starts]
+    last = codes[ends - 1]
+    delta_h = nn_h[ends - 1] - nn_h[starts] + _INIT_H[first] + _INIT_H[last]
+    delta_s = nn_s[ends - 1] - nn_s[starts] + _INIT_S[first] + _INIT_S[last]
+    delta_s = salt_corrected_entropy(delta_s, length, **conditions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tm = melting_temperature(delta_h, delta_s, primer_nm)
+    usable &= (tm >= constraints.min_tm) & (tm <= constraints.max_tm)
+
+    # The forward primer's 3' end is the window's last base; the reverse
+    # primer's 3' end pairs with the window's first base
+    forward = usable.copy()
+    reverse = usable
+    if constraints.gc_clamp:
+        forward &= (last == 1) | (last == 2)
+        reverse &= (first == 1) | (first == 2)
+    if constraints.max_3prime_gc is not None:
+        tail = min(5, length)
+        forward &= gc[ends] - gc[ends - tail] <= constraints.max_3prime_gc
+        reverse &= gc[starts + tail] - gc[starts] <= constraints.max_3prime_gc
+    return starts, tm, gc_fraction, forward, reverse
+
+
+def scan_primers(handle, constraints=PrimerConstraints(), preset=None,
+                 primer_nm=None, block_size=BLOCK_SIZE, **conditions):
+    """
+    Find primer candidates on both strands of every FASTA record.
+
+    Args:
+        handle: FASTA file opened in binary mode
+        constraints (PrimerConstraints): Length, GC, Tm and clamp limits
+        preset (str): Preset the primer concentration for Tm is taken from
+        primer_nm (float): Use this primer concentration (nM) instead
+        block_size (int): Bases per block
+        **conditions: Buffer ions for the salt correction (na_mm, k_mm,
+            tris_mm, mg_mm, dntps_mm), as in primer_thermo.primer_properties
+
+    Yields:
+        tuple: (record name, list of PrimerCandidate found in the block,
+            template position up to which the record has been scanned)
+    """
+    if not 1 < constraints.min_length <= constraints.max_length:
+        raise ValueError("Primer lengths must satisfy 1 < min_length <= max_length")
+    if primer_nm is None:
+        primer_nm = reaction_primer_concentration(preset)
+    overlap = constraints.max_length - 1
+
+    for name, offset, block, final in read_fasta_blocks(handle, block_size, overlap):
+        codes = _ENCODE[np.frombuffer(block, dtype=np.uint8)]
+        prefixes = _block_prefixes(codes)
+        candidates = []
+        for length in range(constraints.min_length, constraints.max_length + 1):
+            # Windows starting in the overlap are scanned with the next block
+            limit = len(codes) - length + 1 if final else len(codes) - overlap
+            if limit <= 0:
+                continue
+            starts, tm, gc_fraction, forward, reverse = _scan_block(
+                codes, prefixes, limit, length, constraints, primer_nm, conditions)
+            for strand, mask in (("+", forward), ("-", reverse)):
+                for index in np.flatnonzero(mask).tolist():
+                    window = block[index:index + length]
+                    sequence = window if strand == "+" else reverse_complement(window)
+                    candidates.append(PrimerCandidate(
+                        name, strand, offset + index, offset + index + length,
+                        sequence.decode("ascii").upper(), float(gc_fraction[index]),
+                        float(tm[index])))
+        scanned = offset + len(codes) if final else offset + len(codes) - overlap
+        yield name, candidates, scanned
+
+
+def _pair(forwards, reverses, min_product, max_product, max_tm_diff, pairs_per_forward, preset):
+    """
+    Pair forward candidates with reverse candidates downstream of them.
+
+    Forward primers are visited in start order, so the reverse candidates in
+    their product range form a window that only slides forward. The window
+    is kept sorted by Tm; the best-matched partners are found by bisecting
+    at the forward primer's Tm and walking outwards.
+    """
+    forwards.sort(key=lambda c: c.start)
+    reverses.sort(key=lambda c: c.end)
+    window = []
+    low = high = 0
+    for forward in forwards:
+        while high < len(reverses) and reverses[high].end <= forward.start + max_product:
+            insort(window, (reverses[high].tm, high))
+            high += 1
+        while low < high and reverses[low].end < forward.start + min_product:
+            del window[bisect_left(window, (reverses[low].tm, low))]
+            low += 1
+
+        # Walk outwards from the forward Tm, nearest Tm first
+        left = bisect_left(window, (forward.tm, -1))
+        right = left
+        left -= 1
+        found = 0
+        while found < pairs_per_forward:
+            left_diff = forward.tm - window[left][0] if left >= 0 else math.inf
+            right_diff = window[right][0] - forward.tm if right < len(window) else math.inf
+            difference = min(left_diff, right_diff)
+            if difference > max_tm_diff:
+                break
+            if left_diff <= right_diff:
+                reverse = reverses[window[left][1]]
+                left -= 1
+            else:
+                reverse = reverses[window[right][1]]
+                right += 1
+            if reverse.start < forward.end:
+                continue
+            found += 1
+            yield PrimerPair(forward.record, forward, reverse, reverse.end - forward.start,
+                             difference, preset)
+
+
+def design_primer_pairs(handle, constraints=PrimerConstraints(), min_product=100,
+                        max_product=1000, max_tm_diff=2.0, pairs_per_forward=1,
+                        preset=None, primer_nm=None, block_size=BLOCK_SIZE, **conditions):
+    """
+    Stream primer pairs for every FASTA record.
+
+    Forward primers are paired as soon as the template has been scanned
+    max_product bases past them, so memory only holds candidates within one
+    product length of the scan position.
+
+    Args:
+        handle: FASTA file opened in binary mode
+        constraints (PrimerConstraints): Length, GC, Tm and clamp limits
+        min_product (int): Smallest amplicon size in bases
+        max_product (int): Largest amplicon size in bases
+        max_tm_diff (float): Largest Tm difference between the two primers
+        pairs_per_forward (int): Best-matched reverse primers per forward primer
+        preset (str): Preset the reactions will use (sets the primer
+            concentration for Tm)
+        primer_nm, block_size, **conditions: See scan_primers
+
+    Yields:
+        PrimerPair: Pairs in forward primer order per record
+    """
+    if not 0 < min_product <= max_product:
+        raise ValueError("Product sizes must satisfy 0 < min_product <= max_product")
+
+    current = None
+    forwards, reverses = [], []
+    pair_args = (min_product, max_product, max_tm_diff, pairs_per_forward, preset)
+    for name, candidates, scanned in scan_primers(handle, constraints, preset, primer_nm,
+                                                  block_size, **conditions):
+        if name != current:
+            yield from _pair(forwards, reverses, *pair_args)
+            current, forwards, reverses = name, [], []
+        forwards.extend(c for c in candidates if c.strand == "+")
+        reverses.extend(c for c in candidates if c.strand == "-")
+
+        # Forward primers whose product range is fully scanned can be paired
+        ready = [c for c in forwards if c.start + max_product <= scanned]
+        if ready:
+            yield from _pair(ready, reverses, *pair_args)
+            forwards = [c for c in forwards if c.start + max_product > scanned]
+            oldest = min((c.start for c in forwards), default=scanned)
+            reverses = [c for c in reverses if c.end >= oldest + min_product]
+    yield from _pair(forwards, reverses, *pair_args)
+
+
+def reaction_request(pair, num_reactions, **overrides):
+    """
+    Build PCRCalculator.calculate_volumes arguments for a primer pair.
+
+    Args:
+        pair (PrimerPair): Pair from design_primer_pairs
+        num_reactions (float): Number of reactions
+        **overrides: Other calculate_volumes keyword arguments
+
+    Returns:
+        dict: Keyword arguments for calculate_volumes
+    """
+    request = {"num_reactions": num_reactions}
+    if pair.preset:
+        request["preset"] = pair.preset
+    request.update(overrides)
+    return request
@@ -0,0 +1,221 @@
+"""
+Vectorized primer thermodynamics for PCRCalculator.
+
+Computes GC content and nearest-neighbor melting temperatures (SantaLucia
+1998 unified parameters) for thousands of primers at once. Sequences are
+encoded as uint8 arrays (A=0, C=1, G=2, T=3, anything else=4) in one padded
+matrix, and dinucleotide parameters are looked up with vectorized indexing
+instead of a Python loop per primer.
+
+The primer concentration in the reaction comes from the chosen preset:
+primer stock concentration x primer volume / reaction volume, with the
+same overrides calculate_volumes accepts.
+"""
+
+import numpy as np
+
+from pcr_calculator import PCRCalculator
+
+GAS_CONSTANT = 1.987  # cal/(K·mol)
+
+BASES = "ACGT"
+OTHER = 4
+
+# Byte -> base code lookup (lower case accepted)
+_ENCODE = np.full(256, OTHER, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _ENCODE[ord(_base)] = _code
+    _ENCODE[ord(_base.lower())] = _code
+
+# Complement of each base code (A<->T, C<->G)
+_COMPLEMENT = np.array([3, 2, 1, 0, OTHER], dtype=np.uint8)
+
+# SantaLucia (1998) nearest-neighbor parameters, 5'->3' on the top strand:
+# dinucleotide -> (dH kcal/mol, dS cal/(K·mol))
+NN_PARAMETERS = {
+    "AA": (-7.9, -22.2), "TT": (-7.9, -22.2),
+    "AT": (-7.2, -20.4),
+    "TA": (-7.2, -21.3),
+    "CA": (-8.5, -22.7), "TG": (-8.5, -22.7),
+    "GT": (-8.4, -22.4), "AC": (-8.4, -22.4),
+    "CT": (-7.8, -21.0), "AG": (-7.8, -21.0),
+    "GA": (-8.2, -22.2), "TC": (-8.2, -22.2),
+    "CG": (-10.6, -27.2),
+    "GC": (-9.8, -24.4),
+    "GG": (-8.0, -19.9), "CC": (-8.0, -19.9),
+}
+
+# Initiation per terminal base pair, and symmetry correction
+INIT_AT = (2.3, 4.1)
+INIT_GC = (0.1, -2.8)
+SYMMETRY = (0.0, -1.4)
+
+
+def _build_tables():
+    """Return 25-entry dH/dS tables indexed by code1 * 5 + code2."""
+    delta_h = np.zeros(25)
+    delta_s = np.zeros(25)
+    for pair, (h, s) in NN_PARAMETERS.items():
+        index = BASES.index(pair[0]) * 5 + BASES.index(pair[1])
+        delta_h[index] = h
+        delta_s[index] = s
+    return delta_h, delta_s
+
+
+NN_DELTA_H, NN_DELTA_S = _build_tables()
+
+# Per terminal base code: initiation dH/dS (zero for unknown bases)
+_INIT_H = np.array([INIT_AT[0], INIT_GC[0], INIT_GC[0], INIT_AT[0], 0.0])
+_INIT_S = np.array([INIT_AT[1], INIT_GC[1], INIT_GC[1], INIT_AT[1], 0.0])
+
+
+def encode_sequences(sequences):
+    """
+    Encode sequences into a padded uint8 matrix.
+
+    Args:
+        sequences (list): DNA sequences as str or bytes
+
+    Returns:
+        tuple: (codes, lengths) where codes has shape (n, max length) and
+            padding positions hold OTHER
+    """
+    raw = [s.encode("ascii") if isinstance(s, str) else bytes(s) for s in sequences]
+    lengths = np.fromiter((len(s) for s in raw), dtype=np.int64, count=len(raw))
+    width = int(lengths.max()) if len(raw) else 0
+
+    codes = np.full((len(raw), width), OTHER, dtype=np.uint8)
+    flat = _ENCODE[np.frombuffer(b"".join(raw), dtype=np.uint8)]
+    codes[np.arange(width) < lengths[:, None]] = flat
+    return codes, lengths
+
+
+def reaction_primer_concentration(preset=None, primer_concentration=None, reaction_volume=None):
+    """
+    Final concentration of each primer in the reaction, in nM.
+
+    Args:
+        preset (str): Preset name (None for the default recipe)
+        primer_concentration (float): Optional primer stock concentration in µM
+        reaction_volume (float): Optional total reaction volume in µL
+
+    Returns:
+        float: Primer concentration in nM
+    """
+    volumes = PCRCalculator.calculate_volumes(
+        1, preset=preset, primer_concentration=primer_concentration,
+        reaction_volume=reaction_volume)
+    recipe = PCRCalculator.get_recipe(preset)
+    stock_um = primer_concentration or recipe.coefficients[4]
+    total_volume = reaction_volume or recipe.coefficients[5]
+    primer_volume = volumes["Primer Forward"] / PCRCalculator.SAFETY_FACTOR
+    return stock_um * primer_volume / total_volume * 1000.0
+
+
+def _reverse_complement(codes, lengths):
+    """Reverse-complement every row within its own length."""
+    width = codes.shape[1]
+    positions = lengths[:, None] - 1 - np.arange(width)
+    valid = positions >= 0
+    reversed_codes = np.take_along_axis(codes, np.where(valid, positions, 0), axis=1)
+    return np.where(valid, _COMPLEMENT[reversed_codes], OTHER)
+
+
+def salt_corrected_entropy(delta_s, lengths, na_mm=50.0, k_mm=0.0, tris_mm=0.0,
+                           mg_mm=0.0, dntps_mm=0.0):
+    """
+    Apply the SantaLucia (1998) salt correction to duplex entropies.
+
+    Mg2+ not bound by dNTPs is converted to Na+ equivalents (120 x sqrt).
+
+    Args:
+        delta_s: Entropies at 1 M Na+ in cal/(K·mol)
+        lengths: Primer lengths
+        na_mm, k_mm, tris_mm, mg_mm, dntps_mm (float): Buffer ions in mM
+
+    Returns:
+        numpy.ndarray: Salt-corrected entropies
+    """
+    sodium_eq = na_mm + k_mm + tris_mm / 2.0
+    if mg_mm > dntps_mm:
+        sodium_eq += 120.0 * np.sqrt(mg_mm - dntps_mm)
+    return delta_s + 0.368 * (np.asarray(lengths) - 1) * np.log(sodium_eq / 1000.0)
+
+
+def melting_temperature(delta_h, delta_s, strand_nm):
+    """
+    Two-state melting temperature in °C.
+
+    Args:
+        delta_h: Enthalpies in kcal/mol
+        delta_s: Entropies in cal/(K·mol)
+        strand_nm: Effective strand concentration in nM
+
+    Returns:
+        numpy.ndarray: Melting temperatures
+    """
+    log_strands = GAS_CONSTANT * np.log(np.asarray(strand_nm) * 1e-9)
+    return 1000.0 * delta_h / (delta_s + log_strands) - 273.15
+
+
+def primer_properties(sequences, preset=None, primer_concentration=None,
+                      reaction_volume=None, primer_nm=None, template_nm=0.0,
+                      na_mm=50.0, k_mm=0.0, tris_mm=0.0, mg_mm=0.0, dntps_mm=0.0):
+    """
+    Compute GC content and melting temperatures for many primers.
+
+    Args:
+        sequences (list): Primer sequences (5'->3')
+        preset (str): Preset the primer concentration is taken from
+        primer_concentration (float): Optional primer stock override in µM
+        reaction_volume (float): Optional reaction volume override in µL
+        primer_nm (float): Use this primer concentration (nM) directly instead
+        template_nm (float): Template strand concentration in nM
+        na_mm, k_mm, tris_mm, mg_mm, dntps_mm (float): Buffer ions in mM
+
+    Returns:
+        dict: Arrays with one entry per primer: 'length', 'gc_fraction',
+            'delta_h' (kcal/mol), 'delta_s' (cal/(K·mol)), 'tm' (°C at
+            1 M Na+) and 'tm_salt' (°C, salt corrected). Primers containing
+            bases other than A/C/G/T get NaN temperatures.
+    """
+    codes, lengths = encode_sequences(sequences)
+    if primer_nm is None:
+        primer_nm = reaction_primer_concentration(preset, primer_concentration, reaction_volume)
+
+    in_sequence = np.arange(codes.shape[1]) < lengths[:, None]
+    known = (codes < OTHER) | ~in_sequence
+    all_known = known.all(axis=1) & (lengths >= 2)
+    gc_count = ((codes == 1) | (codes == 2)).sum(axis=1)
+
+    # Sum nearest-neighbor parameters over all dinucleotides in one lookup
+    pair_index = codes[:, :-1].astype(np.intp) * 5 + codes[:, 1:]
+    delta_h = NN_DELTA_H[pair_index].sum(axis=1)
+    delta_s = NN_DELTA_S[pair_index].sum(axis=1)
+
+    first = codes[:, 0] if codes.shape[1] else np.full(len(lengths), OTHER)
+    last = np.take_along_axis(codes, np.maximum(lengths - 1, 0)[:, None], axis=1)[:, 0] \
+        if codes.shape[1] else first
+    delta_h = delta_h + _INIT_H[first] + _INIT_H[last]
+    delta_s = delta_s + _INIT_S[first] + _INIT_S[last]
+
+    self_complementary = (codes == _reverse_complement(codes, lengths)).all(axis=1)
+    delta_s = delta_s + np.where(self_complementary, SYMMETRY[1], 0.0)
+
+    # Effective strand concentration
+    strand_nm = np.where(self_complementary, primer_nm, primer_nm - template_nm / 2.0)
+    salt_s = salt_corrected_entropy(delta_s, lengths, na_mm, k_mm, tris_mm, mg_mm, dntps_mm)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tm = melting_temperature(delta_h, delta_s, strand_nm)
+        tm_salt = melting_temperature(delta_h, salt_s, strand_nm)
+        gc_fraction = np.where(lengths > 0, gc_count / np.maximum(lengths, 1), 0.0)
+
+    return {
+        "length": lengths,
+        "gc_fraction": gc_fraction,
+        "delta_h": np.where(all_known, delta_h, np.nan),
+        "delta_s": np.where(all_known, delta_s, np.nan),
+        "tm": np.where(all_known, tm, np.nan),
+        "tm_salt": np.where(all_known, tm_salt, np.nan),
+    }
@@ -0,0 +1,247 @@
+"""
+Reagent inventory planner for a day's queue of PCR runs.
+
+Each run (a set of calculate_volumes arguments) needs master mix of its
+preset and forward/reverse primer at its stock concentration. Given the
+tubes in stock, the planner assigns every run's reagent volume to a single
+tube so that as few tubes as possible are opened and left partially used,
+and as little reagent as possible is lost to dead volume.
+
+Per reagent this is variable-size bin packing, solved greedily with bounds:
+    1. Lower bound: the fewest tubes whose usable volume (volume minus dead
+       volume) covers the total demand, taking the largest tubes first
+       (the lower dead volume first among equal sizes). No plan can lose
+       less dead volume than that many tubes with the least dead volume.
+    2. Pick that many of the largest tubes, then swap the last one for the
+       spare tube with the least dead volume (then the smallest) that
+       still covers the demand, to limit dead volume and leftovers.
+    3. Fill the chosen tubes one at a time, each time taking the largest
+       pending run that still fits, so leftovers collect in few tubes;
+       open extra tubes only if runs are left over, again preferring the
+       least dead volume among tubes that take the rest.
+Sorting dominates, so thousands of runs plan in milliseconds.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from pcr_calculator import PCRCalculator
+
+# A tube in stock. reagent is a key from reagent_key(); volumes are in µL.
+Tube = namedtuple("Tube", ["tube_id", "reagent", "volume", "dead_volume"], defaults=(0.0,))
+
+# Volume of one reagent that one run needs
+Demand = namedtuple("Demand", ["run", "reagent", "volume"])
+
+TRACKED_COMPONENTS = ("Master Mix", "Primer Forward", "Primer Reverse")
+
+
+def reagent_key(component, preset=None, primer_concentration=None):
+    """
+    Return the inventory key for a reagent.
+
+    Master mix is identified by its preset, primers by stock concentration.
+
+    Args:
+        component (str): "Master Mix", "Primer Forward" or "Primer Reverse"
+        preset (str): Preset name (None for the default Green mix)
+        primer_concentration (float): Primer stock concentration in µM
+
+    Returns:
+        tuple: Hashable reagent key
+    """
+    if component == "Master Mix":
+        return (component, preset if preset in PCRCalculator.PRESETS else "Green")
+    recipe = PCRCalculator.get_recipe(preset)
+    return (component, float(primer_concentration or recipe.coefficients[4]))
+
+
+def run_demands(runs):
+    """
+    Calculate the tracked reagent volumes each run needs.
+
+    Args:
+        runs (list): Dicts of calculate_volumes keyword arguments
+
+    Returns:
+        list: Demand tuples (ValueError is raised for invalid runs)
+    """
+    demands = []
+    for index, run in enumerate(runs):
+        volumes = PCRCalculator.calculate_volumes(**run)
+        for component in TRACKED_COMPONENTS:
+            key = reagent_key(component, run.get("preset"), run.get("primer_concentration"))
+            demands.append(Demand(index, key, volumes[component]))
+    return demands
+
+
+class InventoryPlan:
+    """Result of planning: which tube each run draws each reagent from."""
+
+    def __init__(self, min_leftover=1.0):
+        """
+        Args:
+            min_leftover (float): Leftover volume (µL) below which an opened
+                tube counts as used up rather than partially used
+        """
+        self.min_leftover = min_leftover
+        self.assignments = {}
+        self.remaining = {}
+        self.opened = []
+        self.unassigned = []
+        self.lower_bounds = {}
+        self.dead_volume_bounds = {}
+
+    def tube_for(self, run, component):
+        """Return the tube ID a run uses for a component, or None."""
+        return self.assignments.get((run, component))
+
+    @property
+    def partial_tubes(self):
+        """Opened tubes with at least min_leftover usable volume left."""
+        return [tube for tube in self.opened
+                if self.remaining[tube.tube_id] >= self.min_leftover]
+
+    @property
+    def dead_volume(self):
+        """Total dead volume of all opened tubes in µL."""
+        return sum(tube.dead_volume for tube in self.opened)
+
+    def summary(self):
+        """Return the key plan figures as a dict."""
+        return {
+            "tubes_opened": len(self.opened),
+            "tubes_lower_bound": sum(self.lower_bounds.values()),
+            "partial_tubes": len(self.partial_tubes),
+            "dead_volume": self.dead_volume,
+            "dead_volume_lower_bound": sum(self.dead_volume_bounds.values()),
+            "leftover_volume": sum(self.remaining[t.tube_id] for t in self.opened),
+            "unassigned": len(self.unassigned),
+        }
+
+
+def _usable(tube):
+    return tube.volume - tube.dead_volume
+
+
+def _size_order(tube):
+    """Sort key: largest usable volume first, the lower dead volume among equals."""
+    return (-_usable(tube), tube.dead_volume)
+
+
+def _choose_tubes(tubes, total):
+    """
+    Pick the starting tubes for one reagent (steps 1 and 2).
+
+    Returns:
+        tuple: (chosen tubes, spare tubes, lower bound on tubes opened,
+            lower bound on dead volume)
+    """
+    by_size = sorted(tubes, key=_size_order)
+    chosen = []
+    covered = 0.0
+    for tube in by_size:
+        if covered >= total:
+            break
+        chosen.append(tube)
+        covered += _usable(tube)
+    lower_bound = len(chosen)
+    dead_volume_bound = sum(sorted(tube.dead_volume for tube in tubes)[:lower_bound])
+    spare = by_size[lower_bound:]
+
+    if chosen:
+        # Swap the last tube for the spare one with the least dead volume
+        # (then the smallest) that still covers the demand
+        needed = total - (covered - _usable(chosen[-1]))
+        fitting = [index for index, tube in enumerate(spare) if _usable(tube) >= needed]
+        if fitting:
+            index = min(fitting, key=lambda i: (spare[i].dead_volume, _usable(spare[i])))
+            if (spare[index].dead_volume, _usable(spare[index])) < (chosen[-1].dead_volume, _usable(chosen[-1])):
+                chosen[-1], spare[index] = spare[index], chosen[-1]
+    return chosen, spare, lower_bound, dead_volume_bound
+
+
+def _fill(tube, volumes, demands, plan):
+    """Fill one tube, taking the largest pending demand that still fits."""
+    remaining = _usable(tube)
+    used = False
+    while volumes:
+        position = bisect_right(volumes, remaining) - 1
+        if position < 0:
+            break
+        volumes.pop(position)
+        demand = demands.pop(position)
+        plan.assignments[(demand.run, demand.reagent[0])] = tube.tube_id
+        remaining -= demand.volume
+        used = True
+    if used:
+        plan.opened.append(tube)
+        plan.remaining[tube.tube_id] = remaining
+
+
+def _pack(demands, chosen, spare, plan):
+    """
+    Place one reagent's demands into tubes (step 3).
+
+    Tubes are filled one at a time, largest pending demand first, so each
+    tube is used up as far as possible and leftovers collect in few tubes.
+    """
+    demands = sorted(demands, key=lambda d: d.volume)
+    volumes = [d.volume for d in demands]
+    for tube in sorted(chosen, key=_usable, reverse=True):
+        _fill(tube, volumes, demands, plan)
+
+    # Open extra tubes while demands remain: of those that take the rest,
+    # the one with the least dead volume (then the smallest); otherwise
+    # the largest available
+    spare = sorted(spare, key=lambda tube: (_usable(tube), -tube.dead_volume))
+    sizes = [_usable(tube) for tube in spare]
+    while volumes and spare:
+        position = bisect_left(sizes, sum(volumes))
+        if position < len(spare):
+            position = min(range(position, len(spare)), key=lambda i: (spare[i].dead_volume, sizes[i]))
+        else:
+            position = len(spare) - 1
+        sizes.pop(position)
+        tube = spare.pop(position)
+        if _usable(tube) < volumes[0]:
+            break
+        _fill(tube, volumes, demands, plan)
+
+    plan.unassigned.extend(demands)
+
+
+def plan_inventory(runs, tubes, min_leftover=1.0):
+    """
+    Assign every run's master mix and primers to stock tubes.
+
+    Args:
+        runs (list): Dicts of calculate_volumes keyword arguments
+        tubes (list): Tube records in stock
+        min_leftover (float): See InventoryPlan
+
+    Returns:
+        InventoryPlan: Assignments, opened and partial tubes, lower bounds
+            on tubes opened and dead volume
+
+    Raises:
+        ValueError: If a run's parameters are invalid
+    """
+    plan = InventoryPlan(min_leftover)
+    demands_by_reagent = {}
+    for demand in run_demands(runs):
+        demands_by_reagent.setdefault(demand.reagent, []).append(demand)
+
+    tubes_by_reagent = {}
+    for tube in tubes:
+        if _usable(tube) > 0:
+            tubes_by_reagent.setdefault(tube.reagent, []).append(tube)
+
+    for reagent, demands in demands_by_reagent.items():
+        stock = tubes_by_reagent.get(reagent, [])
+        chosen, spare, lower_bound, dead_volume_bound = _choose_tubes(stock, sum(d.volume for d in demands))
+        plan.lower_bounds[reagent] = lower_bound
+        plan.dead_volume_bounds[reagent] = dead_volume_bound
+        _pack(demands, chosen, spare, plan)
+
+    return plan
@@ -2,6 +2,17 @@
 """Test script to validate PCR Calculator improvements"""
 
 from pcr_calculator import PCRCalculator
+from benchmark_pcr_calculator import compare
+from plate_planner import MAX_INVALID_WELLS, PlatePlanner, Well, well_names
+from preset_catalog import PresetCatalog
+from pcr_batch_runner import run_batch
+from pcr_calculator_cli import resolve_preset
+from pcr_sweep import sweep
+from pcr_fixed_point import FixedPointEngine
+from reagent_inventory import Tube, plan_inventory
+from primer_thermo import primer_properties, reaction_primer_concentration
+from primer_design import design_primer_pairs, reaction_request
+from insilico_pcr import GenomeIndex, is_intended
 
 def test_zero_reactions():
     """Test that zero reactions are rejected"""
@@ -79,6 +90,414 @@ def test_primer_concentration_adjustment():
         print(f"✗ FAIL: Primer concentration adjustment failed - {e}")
         return False
 
+def test_batch_matches_scalar():
+    """Test that the batch path gives bit-identical results to the scalar path"""
+    try:
+        records = [
+            {"num_reactions": 3},
+            {"num_reactions": 2, "preset": "Q5® (NEB)"},
+            {"num_reactions": 2, "template_dna_ng": 50, "template_dna_concentration": 100},
+            {"num_reactions": 2, "primer_concentration": 5.0, "preset": "Taq"},
+            {"num_reactions": 4, "reaction_volume": 25.0, "preset": "Phusion®"},
+        ]
+        volumes, valid = PCRCalculator.calculate_volumes_batch(records)
+        assert valid.all(), "all wells should be valid"
+        for i, record in enumerate(records):
+            expected = PCRCalculator.calculate_volumes(**record)
+            for component, volume in expected.items():
+                assert volumes[component][i] == volume, f"{component} differs in well {i}"
+        print(f"✓ PASS: Batch results identical to scalar results for {len(records)} wells")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Batch calculation differs from scalar - {e}")
+        return False
+
+def test_batch_validity_mask():
+    """Test that invalid wells are masked instead of raising"""
+    try:
+        volumes, valid = PCRCalculator.calculate_volumes_batch(
+            num_reactions=[2, 0, 2],
+            reaction_volume=[15.0, 15.0, 5.0]
+        )
+        assert valid.tolist() == [True, False, False], f"unexpected mask {valid.tolist()}"
+        print(f"✓ PASS: Invalid wells masked - {valid.tolist()}")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Batch validity mask failed - {e}")
+        return False
+
+def test_plate_planner_groups_wells():
+    """Test that wells sharing a recipe are pooled into one mix"""
+    try:
+        wells = [
+            Well("P1", name, "Taq" if i % 2 else None)
+            for i, name in enumerate(well_names(96))
+        ]
+        planner = PlatePlanner()
+        planner.add_wells(wells)
+        mixes = planner.mixes()
+        assert len(mixes) == 2, f"expected 2 mixes, got {len(mixes)}"
+        expected = PCRCalculator.calculate_volumes(48, preset="Taq")
+        taq_mix = [m for m in mixes if m[1].preset == "Taq"][0]
+        assert taq_mix[3]["Master Mix"] == expected["Master Mix"], "pooled volume differs"
+        print(f"✓ PASS: 96 wells grouped into {len(mixes)} mixes")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Plate planner grouping failed - {e}")
+        return False
+
+def test_plate_planner_per_well_template():
+    """Test that samples share one mix, get their own template and water, and bad wells are listed"""
+    try:
+        wells = [
+            Well("P1", "A1", "Taq", 10.0, 3.0),
+            Well("P1", "A2", "Taq", 10.0, 2.5, None, 20.0),
+            Well("P1", "A3", "Taq", 10.0, 3.001),
+            Well("P1", "A4", "Taq", 500.0, 1.0),
+            Well("P1", "A5", "Tag", 10.0, 3.0),
+            Well("P1", "Q1", "Taq", 10.0, 3.0),
+        ]
+        planner = PlatePlanner(96)
+        planner.add_wells(wells)
+        mixes = planner.mixes()
+        assert len(mixes) == 1, f"expected 1 mix, got {len(mixes)}"
+        expected = PCRCalculator.calculate_volumes(3, preset="Taq")
+        assert mixes[0][3]["Master Mix"] == expected["Master Mix"], "pooled master mix differs"
+        assert "Water (ddH₂O)" not in mixes[0][3], "water was pooled"
+        invalid = [(well, error) for _, well, error in planner.invalid_wells]
+        assert [well for well, _ in invalid] == ["A4", "A5", "Q1"], f"unexpected invalid wells {invalid}"
+        assert "Unknown preset" in invalid[1][1], f"unknown preset not reported: {invalid[1][1]}"
+        assert planner.invalid_count == 3, f"invalid count {planner.invalid_count}"
+        
+        rows = list(planner.iter_worklist_rows(wells))
+        per_well = {(row[0], row[3]): float(row[4]) for row in rows if row[0] != "prepare"}
+        scalar = PCRCalculator.calculate_volumes(1, preset="Taq", reaction_volume=20.0, template_dna_ng=10.0,
+                                                 template_dna_concentration=2.5)
+        assert per_well[("template", "A2")] == round(scalar["Template DNA"] / 1.1, 2), "template differs"
+        assert per_well[("water", "A2")] == round(scalar["Water (ddH₂O)"] / 1.1, 2), "water differs"
+        assert ("dispense", "A4") not in per_well, "invalid well was dispensed"
+        print(f"✓ PASS: 3 samples share {len(mixes)} mix, {planner.invalid_count} invalid wells listed")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Plate planner per-well template failed - {e}")
+        return False
+
+def test_plate_planner_invalid_wells_bounded():
+    """Test that only the first MAX_INVALID_WELLS invalid wells are kept"""
+    try:
+        count = MAX_INVALID_WELLS + 50
+        planner = PlatePlanner(1536)
+        planner.add_wells(Well("P1", name, "Taq", 500.0, 1.0) for name in list(well_names(1536))[:count])
+        assert planner.invalid_count == count, f"invalid count {planner.invalid_count}"
+        assert len(planner.invalid_wells) == MAX_INVALID_WELLS, \
+            f"kept {len(planner.invalid_wells)} invalid wells"
+        print(f"✓ PASS: {count} invalid wells counted, {len(planner.invalid_wells)} kept")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Plate planner invalid well bound failed - {e}")
+        return False
+
+def test_benchmark_failures():
+    """Test that only the GUI benchmark may be missing from a baseline comparison"""
+    try:
+        baseline = {"cli_cold_start": {"seconds": 0.1}, "gui_first_window": {"seconds": 0.5},
+                    "plate_planner_384": {"seconds": 1.0}}
+        results = {
+            "cli_cold_start": {"seconds": None, "items": 1, "error": "ImportError: no module"},
+            "gui_first_window": {"seconds": None, "items": 1, "skipped": "no display"},
+            "plate_planner_384": {"seconds": 1.1, "items": 384},
+        }
+        failed = compare(results, baseline, 0.25)
+        assert failed == ["cli_cold_start"], f"unexpected failures {failed}"
+        print("✓ PASS: Crashed benchmark fails the comparison; GUI may be skipped")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Benchmark failures failed - {e}")
+        return False
+
+def test_compiled_recipes():
+    """Test that presets are compiled into immutable recipes"""
+    try:
+        names = [recipe.name for recipe in PCRCalculator.RECIPES]
+        assert names == ["Green"] + list(PCRCalculator.PRESETS), f"unexpected recipes {names}"
+        recipe = PCRCalculator.RECIPES[1]
+        try:
+            recipe.coefficients = ()
+            print("✗ FAIL: Recipe could be modified")
+            return False
+        except AttributeError:
+            pass
+        print(f"✓ PASS: {len(names)} recipes compiled and immutable")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Compiled recipes check failed - {e}")
+        return False
+
+def test_preset_catalog():
+    """Test loading, caching and resolving presets from a catalog file"""
+    import json
+    import os
+    import tempfile
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "catalog.json")
+            preset = dict(PCRCalculator.PRESETS["Taq"], description="Test mix")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump({"presets": {"KAPA HiFi": preset, "KAPA2G Fast": preset}}, handle)
+            
+            catalog = PresetCatalog.open(path)
+            assert os.path.exists(path + ".cache"), "binary cache was not written"
+            catalog = PresetCatalog.open(path)
+            assert catalog.complete("kapa") == ["KAPA HiFi", "KAPA2G Fast"], "prefix lookup failed"
+            assert catalog.resolve("kapa h") == "KAPA HiFi", "unique prefix not resolved"
+            assert catalog.fuzzy("KAPA Hifi")[0] == "KAPA HiFi", "fuzzy lookup failed"
+            
+            key = catalog.install("KAPA HiFi")
+            volumes = PCRCalculator.calculate_volumes(2, preset=key)
+            expected = PCRCalculator.calculate_volumes(2, preset="Taq")
+            del PCRCalculator.PRESETS[key]
+            PCRCalculator.compile_presets()
+            assert volumes == expected, "catalog preset gave different volumes"
+        print("✓ PASS: Catalog presets cached, resolved and usable")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Preset catalog failed - {e}")
+        return False
+
+def test_preset_names_ignore_case():
+    """Test that preset names resolve whatever their case"""
+    try:
+        assert resolve_preset("green") == "Green", "default preset not resolved"
+        assert resolve_preset("TAQ") == "Taq", "built-in preset not resolved"
+        assert resolve_preset("q5") == "Q5® (NEB)", "prefix not resolved"
+        
+        taq = PCRCalculator.PRESETS["Taq"]
+        catalog = PresetCatalog.from_presets({"Taq": taq, "Taq HS": taq})
+        assert catalog.resolve("taq") == "Taq", "name equal ignoring case lost to a longer prefix match"
+        try:
+            catalog.resolve("ta")
+            raise AssertionError("ambiguous prefix was resolved")
+        except ValueError:
+            pass
+        print("✓ PASS: Preset names resolved ignoring case")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Case-insensitive presets failed - {e}")
+        return False
+
+def test_batch_mode_streams_rows():
+    """Test CLI batch mode: one result per row, errors reported per row"""
+    import io
+    try:
+        requests = io.StringIO(
+            '{"num_reactions": 2, "preset": "Taq"}\n'
+            '{"num_reactions": 0}\n'
+            '{"num_reactions": 3}\n'
+        )
+        results = io.StringIO()
+        processed, failed = run_batch(requests, results, fmt="jsonl")
+        lines = results.getvalue().splitlines()
+        assert (processed, failed) == (3, 1), f"unexpected counts {processed}, {failed}"
+        assert len(lines) == 3, f"expected 3 output lines, got {len(lines)}"
+        assert '"error"' in lines[1] and '"volumes"' in lines[2], "rows out of order"
+        print(f"✓ PASS: Batch mode processed {processed} rows with {failed} row error")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Batch mode failed - {e}")
+        return False
+
+def test_batch_mode_bad_preset():
+    """Test that a non-string preset fails its own row only"""
+    import io
+    try:
+        for workers in (1, 2):
+            requests = io.StringIO(
+                '{"num_reactions": 3, "preset": 5}\n'
+                '{"num_reactions": 3, "preset": ["a"]}\n'
+                '{"num_reactions": 2, "preset": "Taq"}\n'
+            )
+            results = io.StringIO()
+            processed, failed = run_batch(requests, results, fmt="jsonl", workers=workers)
+            lines = results.getvalue().splitlines()
+            assert (processed, failed) == (3, 2), f"unexpected counts {processed}, {failed}"
+            assert '"error"' in lines[0] and '"error"' in lines[1] and '"volumes"' in lines[2], \
+                "bad presets not reported per row"
+        print("✓ PASS: Non-string presets reported as row errors")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Bad preset rows failed the batch - {e}")
+        return False
+
+def test_parameter_sweep():
+    """Test that the sweep feasibility mask matches the scalar calculator"""
+    try:
+        primer_concs = [2.5, 5.0, 10.0]
+        reaction_vols = [10.0, 15.0, 20.0]
+        result = sweep("Q5® (NEB)", primer_concs, reaction_vols, [50.0], [10.0, 100.0])
+        assert result.shape == (3, 3, 1, 2), f"unexpected shape {result.shape}"
+        for i, primer_conc in enumerate(primer_concs):
+            for j, reaction_vol in enumerate(reaction_vols):
+                for k, template_conc in enumerate([10.0, 100.0]):
+                    try:
+                        PCRCalculator.calculate_volumes(
+                            1, preset="Q5® (NEB)", primer_concentration=primer_conc,
+                            reaction_volume=reaction_vol, template_dna_ng=50.0,
+                            template_dna_concentration=template_conc)
+                        feasible = True
+                    except ValueError:
+                        feasible = False
+                    assert result.feasible[i, j, 0, k] == feasible, \
+                        f"mismatch at {primer_conc} µM, {reaction_vol} µL, {template_conc} ng/µL"
+        print(f"✓ PASS: Sweep of {result.feasible.size} points, "
+              f"{result.feasible_fraction():.0%} feasible")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Parameter sweep failed - {e}")
+        return False
+
+def test_fixed_point_engine():
+    """Test integer nanoliter volumes: exact values and exact plate totals"""
+    try:
+        engine = FixedPointEngine(resolution_nl=100, rounding="ceil")
+        volumes = engine.calculate_volumes(3)
+        assert volumes == {
+            "Master Mix": 24800,
+            "Primer Forward": 1700,
+            "Primer Reverse": 1700,
+            "Template DNA": 3300,
+            "Water (ddH₂O)": 18200,
+        }, f"unexpected nL volumes {volumes}"
+        
+        plate, valid = engine.calculate_volumes_batch([3] * 96)
+        totals = engine.plate_totals(plate, valid)
+        assert totals["Master Mix"] == 96 * 24800, "plate total is not exact"
+        print(f"✓ PASS: Fixed-point volumes exact ({totals['Master Mix']} nL master mix per plate)")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Fixed-point engine failed - {e}")
+        return False
+
+def test_inventory_planner():
+    """Test that runs are packed into as few tubes as the volume allows"""
+    try:
+        runs = [{"num_reactions": 10, "preset": "Taq"} for _ in range(6)]
+        # Each run needs 82.5 µL master mix: 495 µL in total
+        tubes = [
+            Tube("MM-1", ("Master Mix", "Taq"), 300.0, 10.0),
+            Tube("MM-2", ("Master Mix", "Taq"), 300.0, 10.0),
+            Tube("MM-3", ("Master Mix", "Taq"), 600.0, 20.0),
+            Tube("PF-1", ("Primer Forward", 10.0), 100.0),
+            Tube("PR-1", ("Primer Reverse", 10.0), 100.0),
+        ]
+        plan = plan_inventory(runs, tubes)
+        summary = plan.summary()
+        assert summary["unassigned"] == 0, f"{summary['unassigned']} demands unassigned"
+        assert {plan.tube_for(i, "Master Mix") for i in range(6)} == {"MM-3"}, \
+            "master mix should come from the single large tube"
+        assert summary["tubes_opened"] == summary["tubes_lower_bound"] == 3, f"unexpected plan {summary}"
+        print(f"✓ PASS: Inventory plan opened {summary['tubes_opened']} tubes "
+              f"({summary['dead_volume']:.0f} µL dead volume)")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Inventory planner failed - {e}")
+        return False
+
+def test_inventory_dead_volume():
+    """Test that the planner prefers tubes with less dead volume"""
+    try:
+        runs = [{"num_reactions": 10, "preset": "Taq"} for _ in range(2)]
+        # 165 µL master mix: MM-Y and MM-Z both cover it, MM-Z loses less
+        tubes = [
+            Tube("MM-X", ("Master Mix", "Taq"), 600.0, 20.0),
+            Tube("MM-Y", ("Master Mix", "Taq"), 200.0, 30.0),
+            Tube("MM-Z", ("Master Mix", "Taq"), 250.0, 10.0),
+            Tube("PF-1", ("Primer Forward", 10.0), 100.0),
+            Tube("PR-1", ("Primer Reverse", 10.0), 100.0),
+        ]
+        plan = plan_inventory(runs, tubes)
+        summary = plan.summary()
+        assert {plan.tube_for(i, "Master Mix") for i in range(2)} == {"MM-Z"}, \
+            "master mix should come from the tube with the least dead volume"
+        assert summary["dead_volume"] == summary["dead_volume_lower_bound"] == 10.0, f"unexpected plan {summary}"
+        print(f"✓ PASS: Inventory plan lost {summary['dead_volume']:.0f} µL to dead volume (the minimum)")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Dead volume planning failed - {e}")
+        return False
+
+def test_primer_thermodynamics():
+    """Test nearest-neighbor Tm and GC content for a batch of primers"""
+    try:
+        assert abs(reaction_primer_concentration("Q5® (NEB)") - 200.0) < 1e-9, "Q5 primers should be 200 nM"
+        props = primer_properties(["GCGTACGATCGATCGTAGCA", "ATATATATATATATAT", "ACGTNACGT"],
+                                  primer_nm=250.0)
+        assert abs(props["gc_fraction"][0] - 0.55) < 1e-9, "GC content should be 55%"
+        assert props["tm"][0] > props["tm"][1], "GC-rich primer should melt higher"
+        assert props["tm_salt"][0] < props["tm"][0], "50 mM Na+ should lower Tm"
+        assert props["tm"][2] != props["tm"][2], "primer with N should have NaN Tm"
+        print(f"✓ PASS: Primer Tm {props['tm_salt'][0]:.1f} °C at 50 mM Na+")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Primer thermodynamics failed - {e}")
+        return False
+
+def test_primer_design_scan():
+    """Test that designed primer pairs meet the constraints and size range"""
+    try:
+        import io
+        import random
+        random.seed(7)
+        template = "".join(random.choice("ACGT") for _ in range(3000))
+        fasta = ">template\n" + "\n".join(template[i:i + 60] for i in range(0, 3000, 60))
+        pairs = list(design_primer_pairs(io.BytesIO(fasta.encode()), min_product=200,
+                                         max_product=500, preset="Taq", block_size=500))
+        assert pairs, "no primer pairs found"
+        for pair in pairs:
+            assert 200 <= pair.product_size <= 500, f"product size {pair.product_size}"
+            assert pair.forward.sequence == template[pair.forward.start:pair.forward.end]
+            assert pair.forward.sequence[-1] in "GC" and pair.reverse.sequence[-1] in "GC"
+        tm = primer_properties([pairs[0].forward.sequence], preset="Taq")["tm_salt"][0]
+        assert abs(tm - pairs[0].forward.tm) < 1e-6, "rolling Tm differs from direct Tm"
+        volumes = PCRCalculator.calculate_volumes(**reaction_request(pairs[0], 10))
+        print(f"✓ PASS: {len(pairs)} primer pairs, first needs "
+              f"{volumes['Master Mix']:.1f} µL master mix for 10 reactions")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Primer design scan failed - {e}")
+        return False
+
+def test_insilico_pcr():
+    """Test that in-silico PCR finds the planted product and a mismatched site"""
+    import os
+    import random
+    import tempfile
+    try:
+        random.seed(11)
+        genome = [random.choice("ACGT") for _ in range(20000)]
+        forward = "".join(genome[3000:3020])
+        reverse_site = "".join(genome[3480:3502])
+        reverse = reverse_site[::-1].translate(str.maketrans("ACGT", "TGCA"))
+        # Second forward site on the same contig with one 5' mismatch
+        genome[9000:9020] = ("A" if forward[0] != "A" else "C") + forward[1:]
+        sequence = "".join(genome)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "genome.fa")
+            with open(path, "w") as handle:
+                handle.write(">chrA\n" + "\n".join(sequence[i:i + 70] for i in range(0, 20000, 70)) + "\n")
+            index = GenomeIndex.open(path)
+            assert os.path.exists(path + ".k12.cache"), "k-mer index was not written"
+            index = GenomeIndex.open(path)
+
+            sites = index.binding_sites(forward, max_mismatches=1)
+            assert [(s.start, s.mismatches) for s in sites] == [(3000, 0), (9000, 1)], sites
+            products = index.pcr(forward, reverse, max_mismatches=1)
+            assert is_intended(products[0]) and products[0].size == 502, products
+        print(f"✓ PASS: In-silico PCR found a {products[0].size} bp product")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: In-silico PCR failed - {e}")
+        return False
+
 def main():
     print("=" * 60)
     print("PCR Calculator Validation Tests")
@@ -92,6 +511,24 @@ def main():
         ("Q5 preset", test_q5_preset),
         ("Template DNA calculation", test_template_dna_calculation),
         ("Primer concentration adjustment", test_primer_concentration_adjustment),
+        ("Compiled recipes", test_compiled_recipes),
+        ("Preset catalog", test_preset_catalog),
+        ("Case-insensitive presets", test_preset_names_ignore_case),
+        ("CLI batch mode", test_batch_mode_streams_rows),
+        ("CLI batch mode bad preset", test_batch_mode_bad_preset),
+        ("Parameter sweep", test_parameter_sweep),
+        ("Fixed-point engine", test_fixed_point_engine),
+        ("Inventory planner", test_inventory_planner),
+        ("Inventory dead volume", test_inventory_dead_volume),
+        ("Primer thermodynamics", test_primer_thermodynamics),
+        ("Primer design scan", test_primer_design_scan),
+        ("In-silico PCR", test_insilico_pcr),
+        ("Batch matches scalar", test_batch_matches_scalar),
+        ("Batch validity mask", test_batch_validity_mask),
+        ("Plate planner grouping", test_plate_planner_groups_wells),
+        ("Plate planner per-well template", test_plate_planner_per_well_template),
+        ("Plate planner invalid well bound", test_plate_planner_invalid_wells_bounded),
+        ("Benchmark failures", test_benchmark_failures),
     ]
     
     results = []
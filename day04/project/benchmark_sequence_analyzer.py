@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the sequence comparison backends.
+
+Times calculate_identity_percentage with each backend on pairs of related
+random proteins, up to titin size (~34,350 residues), and batch composition
+statistics for thousands of proteins. The global alignment backend is
+quadratic in time, so it only runs up to --max-align-length. Results can be
+written as JSON.
+
+Usage:
+    python benchmark_sequence_analyzer.py
+    python benchmark_sequence_analyzer.py --quick --json results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from business_logic.sequence_analyzer import SequenceAnalyzer
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+TITIN_LENGTH = 34350
+
+
+def make_pair(length, identity=0.75, seed=0):
+    """Build a random protein and a mutated copy with substitutions and indels."""
+    rng = random.Random(seed)
+    seq1 = "".join(rng.choice(AMINO_ACIDS) for _ in range(length))
+    seq2 = []
+    for residue in seq1:
+        roll = rng.random()
+        if roll < identity:
+            seq2.append(residue)
+        elif roll < identity + 0.03:
+            continue  # deletion
+        elif roll < identity + 0.06:
+            seq2.append(residue + rng.choice(AMINO_ACIDS))  # insertion
+        else:
+            seq2.append(rng.choice(AMINO_ACIDS))
+    return seq1, "".join(seq2)
+
+
+def _best(func, repeat):
+    """Return the fastest of several timed calls in seconds, and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run_benchmarks(quick=False, repeat=3, max_align_length=5000):
+    """
+    Time every identity backend on each sequence length, and composition.
+    
+    Returns:
+        dict: "<method>_<length>" -> {"seconds", "identity"} and
+            "batch_statistics_<count>" -> {"seconds", "items"} (seconds is
+            None and "skipped" holds the reason when a case did not run)
+    """
+    lengths = (500, 2000, 8000) if quick else (1000, 5000, TITIN_LENGTH)
+    results = {}
+    for length in lengths:
+        seq1, seq2 = make_pair(length, seed=length)
+        for method in ("difflib", "lcs", "global"):
+            name = f"{method}_{length}"
+            if method == "global" and length > max_align_length:
+                results[name] = {"seconds": None, "skipped": f"longer than {max_align_length}"}
+                continue
+            runs = 1 if method == "global" else repeat
+            seconds, identity = _best(
+                lambda: SequenceAnalyzer.calculate_identity_percentage(seq1, seq2, method), runs
+            )
+            results[name] = {"seconds": seconds, "identity": identity}
+    
+    count = 1000 if quick else 10000
+    sequences = [make_pair(350, seed=seed)[1] for seed in range(count)]
+    seconds, _ = _best(lambda: SequenceAnalyzer.get_batch_statistics(sequences), repeat)
+    results[f"batch_statistics_{count}"] = {"seconds": seconds, "items": count}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sequence comparison backends")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON to FILE")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per benchmark, fastest kept (default: 3)")
+    parser.add_argument("--quick", action="store_true", help="Use shorter sequences")
+    parser.add_argument("--max-align-length", type=int, default=5000,
+                        help="Longest sequence to align globally (default: 5000)")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Sequence Analyzer Benchmark")
+    print("=" * 60)
+    results = run_benchmarks(args.quick, args.repeat, args.max_align_length)
+    for name, result in results.items():
+        if result["seconds"] is None:
+            print(f"  {name:22s} skipped ({result['skipped']})")
+        elif "items" in result:
+            rate = result["items"] / result["seconds"]
+            print(f"  {name:22s} {result['seconds']:9.4f} s  ({rate:,.0f} sequences/s)")
+        else:
+            print(f"  {name:22s} {result['seconds']:9.4f} s  identity {result['identity']:6.2f}%")
+    
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
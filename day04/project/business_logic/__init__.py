@@ -6,10 +6,27 @@ Core business logic for protein comparison, completely independent of UI.
 
 from .protein_comparator import ProteinComparator
 from .ncbi_protein_fetcher import ProteinFetcher
+from .eutils_transport import EutilsTransport
+from .local_protein_source import LocalProteinSource
+from .protein_cache import ProteinCache
+from .protein_record import ProteinRecord, ProteinSet
+from .protein_source import FallbackProteinSource, ProteinSource
+from .rate_limiter import SharedTokenBucket, TokenBucket
+from .result_memo import ResultMemo
 from .sequence_analyzer import SequenceAnalyzer
 
 __all__ = [
     'ProteinComparator',
     'ProteinFetcher',
+    'EutilsTransport',
+    'LocalProteinSource',
+    'ProteinSource',
+    'FallbackProteinSource',
+    'ProteinCache',
+    'ProteinRecord',
+    'ProteinSet',
+    'SharedTokenBucket',
+    'TokenBucket',
+    'ResultMemo',
     'SequenceAnalyzer'
 ]
@@ -0,0 +1,203 @@
+"""
+Alignment Module
+
+Pairwise protein alignment with substitution matrices (BLOSUM62, PAM250)
+and affine gap penalties, in global (Needleman-Wunsch) and local
+(Smith-Waterman) mode, following Gotoh's three-state recurrences.
+
+The dynamic programming runs one anti-diagonal at a time: every cell on an
+anti-diagonal depends only on the two previous ones, so each diagonal is a
+handful of NumPy operations. Instead of a traceback matrix, each cell
+carries the statistics of the best path reaching it (identities,
+positives, gap columns, gap openings, alignment length), so memory stays
+O(n + m) even for titin-sized proteins and the reported figures describe
+an actual optimal alignment.
+"""
+
+import numpy as np
+from Bio.Align import substitution_matrices
+
+MATRICES = ("BLOSUM62", "PAM250")
+DEFAULT_MATRIX = "BLOSUM62"
+DEFAULT_GAP_OPEN = 11    # penalty for the first position of a gap
+DEFAULT_GAP_EXTEND = 1   # penalty for each further position
+
+# Score for impossible states (far from int32 limits after adding penalties)
+_NEG = -(1 << 29)
+
+# Rows of the path statistics payload
+_IDENTITIES, _POSITIVES, _GAPS, _GAP_OPENINGS, _LENGTH = range(5)
+
+_matrix_cache = {}
+
+
+def load_matrix(name=DEFAULT_MATRIX):
+    """
+    Load a substitution matrix as integer arrays.
+    
+    Args:
+        name (str): "BLOSUM62" or "PAM250"
+    
+    Returns:
+        tuple: (256-entry uint8 lookup from byte to matrix index,
+            flattened int32 scores, alphabet size)
+    
+    Raises:
+        ValueError: If the matrix is not supported
+    """
+    name = name.upper()
+    if name not in MATRICES:
+        raise ValueError(f"Unknown substitution matrix: {name} (choose from {', '.join(MATRICES)})")
+    if name not in _matrix_cache:
+        matrix = substitution_matrices.load(name)
+        alphabet = matrix.alphabet
+        lookup = np.full(256, alphabet.index("X"), dtype=np.uint8)
+        for index, letter in enumerate(alphabet):
+            lookup[ord(letter)] = index
+            lookup[ord(letter.lower())] = index
+        scores = np.asarray(matrix, dtype=np.int32).ravel()
+        _matrix_cache[name] = (lookup, scores, len(alphabet))
+    return _matrix_cache[name]
+
+
+def _select(scores, stats, candidate, candidate_stats):
+    """Keep the candidate where it scores strictly higher (earlier states win ties)."""
+    better = candidate > scores
+    return np.where(better, candidate, scores), np.where(better, candidate_stats, stats)
+
+
+def align(seq1, seq2, mode="global", matrix=DEFAULT_MATRIX, gap_open=DEFAULT_GAP_OPEN,
+          gap_extend=DEFAULT_GAP_EXTEND):
+    """
+    Align two protein sequences and summarize the optimal alignment.
+    
+    A gap of length L costs gap_open + (L - 1) * gap_extend. Global mode
+    aligns the full sequences (end gaps are penalized); local mode finds
+    the best-scoring pair of segments. Unknown residues score as X.
+    
+    Args:
+        seq1 (str): First protein sequence
+        seq2 (str): Second protein sequence
+        mode (str): "global" or "local"
+        matrix (str): Substitution matrix name ("BLOSUM62" or "PAM250")
+        gap_open (int): Gap opening penalty (positive)
+        gap_extend (int): Gap extension penalty (positive)
+    
+    Returns:
+        dict: 'score', 'identities', 'positives' (pairs with a positive
+            score), 'gaps' (gap columns), 'gap_openings', 'length'
+            (alignment columns), and 'identity_percentage',
+            'similarity_percentage' and 'gap_percentage' relative to length
+    
+    Raises:
+        ValueError: If mode or matrix is unknown
+    """
+    if mode not in ("global", "local"):
+        raise ValueError(f"Unknown alignment mode: {mode} (choose 'global' or 'local')")
+    local = mode == "local"
+    lookup, scores, size = load_matrix(matrix)
+    a = lookup[np.frombuffer(seq1.encode("ascii", "replace"), dtype=np.uint8)].astype(np.int32)
+    b = lookup[np.frombuffer(seq2.encode("ascii", "replace")[::-1], dtype=np.uint8)].astype(np.int32)
+    n, m = len(a), len(b)
+    
+    # Three rotating buffers per state, indexed by i along an anti-diagonal
+    def buffers():
+        return [np.full(n + 1, _NEG, dtype=np.int32) for _ in range(3)]
+    
+    def payloads():
+        return [np.zeros((5, n + 1), dtype=np.int32) for _ in range(3)]
+    
+    match, del_, ins = buffers(), buffers(), buffers()
+    match_stats, del_stats, ins_stats = payloads(), payloads(), payloads()
+    match[0][0] = 0
+    best_score, best_stats = 0, np.zeros(5, dtype=np.int32)
+    
+    gap_step = np.array([0, 0, 1, 0, 1], dtype=np.int32)[:, None]
+    gap_start = np.array([0, 0, 1, 1, 1], dtype=np.int32)[:, None]
+    
+    for d in range(1, n + m + 1):
+        cur, prev, prev2 = d % 3, (d - 1) % 3, (d - 2) % 3
+        M, X, Y = match[cur], del_[cur], ins[cur]
+        MS, XS, YS = match_stats[cur], del_stats[cur], ins_stats[cur]
+        
+        # Boundary cells: (d, 0) ends a run of deletions, (0, d) of insertions.
+        # Only cells on the current diagonal are ever read, so the rest of
+        # the buffers can keep stale values.
+        for i, state, stats in ((d, X, XS), (0, Y, YS)):
+            if (i and d > n) or (not i and d > m):
+                continue
+            M[i] = X[i] = Y[i] = _NEG
+            if local:
+                M[i] = 0
+                MS[:, i] = 0
+            else:
+                state[i] = -(gap_open + (d - 1) * gap_extend)
+                stats[:, i] = (0, 0, d, 1, d)
+        
+        lo, hi = max(1, d - m), min(n, d - 1)
+        if lo > hi:
+            continue
+        cells = slice(lo, hi + 1)
+        above = slice(lo - 1, hi)    # (i - 1, j) on d - 1 and (i - 1, j - 1) on d - 2
+        left = cells                 # (i, j - 1) on d - 1
+        
+        # Match/mismatch state, from the diagonal predecessor
+        score, stats = match[prev2][above], match_stats[prev2][:, above]
+        score, stats = _select(score, stats, del_[prev2][above], del_stats[prev2][:, above])
+        score, stats = _select(score, stats, ins[prev2][above], ins_stats[prev2][:, above])
+        if local:
+            fresh = score <= 0
+            score = np.where(fresh, 0, score)
+            stats = np.where(fresh, 0, stats)
+        x, y = a[lo - 1:hi], b[m - d + lo:m - d + hi + 1]
+        substitution = scores[x * size + y]
+        M[cells] = score + substitution
+        MS[:, cells] = stats
+        MS[_IDENTITIES, cells] += x == y
+        MS[_POSITIVES, cells] += substitution > 0
+        MS[_LENGTH, cells] += 1
+        
+        # Deletion state (gap in seq2), from the cell above
+        score, stats = match[prev][above] - gap_open, match_stats[prev][:, above] + gap_start
+        score, stats = _select(score, stats, del_[prev][above] - gap_extend,
+                               del_stats[prev][:, above] + gap_step)
+        score, stats = _select(score, stats, ins[prev][above] - gap_open,
+                               ins_stats[prev][:, above] + gap_start)
+        X[cells], XS[:, cells] = score, stats
+        
+        # Insertion state (gap in seq1), from the cell to the left
+        score, stats = match[prev][left] - gap_open, match_stats[prev][:, left] + gap_start
+        score, stats = _select(score, stats, ins[prev][left] - gap_extend,
+                               ins_stats[prev][:, left] + gap_step)
+        score, stats = _select(score, stats, del_[prev][left] - gap_open,
+                               del_stats[prev][:, left] + gap_start)
+        Y[cells], YS[:, cells] = score, stats
+        
+        if local:
+            top = lo + int(np.argmax(M[cells]))
+            if M[top] > best_score:
+                best_score, best_stats = int(M[top]), MS[:, top].copy()
+    
+    if not local:
+        end = (n + m) % 3
+        best_score, best_stats = int(match[end][n]), match_stats[end][:, n]
+        for state, stats in ((del_, del_stats), (ins, ins_stats)):
+            if state[end][n] > best_score:
+                best_score, best_stats = int(state[end][n]), stats[end][:, n]
+    
+    length = int(best_stats[_LENGTH])
+    
+    def percentage(count):
+        return round(100.0 * int(count) / length, 2) if length else 0.0
+    
+    return {
+        'score': best_score,
+        'identities': int(best_stats[_IDENTITIES]),
+        'positives': int(best_stats[_POSITIVES]),
+        'gaps': int(best_stats[_GAPS]),
+        'gap_openings': int(best_stats[_GAP_OPENINGS]),
+        'length': length,
+        'identity_percentage': percentage(best_stats[_IDENTITIES]),
+        'similarity_percentage': percentage(best_stats[_POSITIVES]),
+        'gap_percentage': percentage(best_stats[_GAPS])
+    }
@@ -0,0 +1,125 @@
+"""
+Composition Module
+
+Vectorized amino acid composition. Sequences are converted to uint8 codes
+over an alphabet (one column per letter, plus a last column collecting
+every other residue) and counted with one numpy.bincount, so thousands of
+sequences become an (n_seqs x len(alphabet) + 1) count matrix in a single
+call. Callers pass the alphabet (ProteinComparator uses
+config.AMINO_ACIDS); DEFAULT_ALPHABET holds the 20 standard residues in
+the same order.
+
+statistics_view() turns one row back into the dict shape returned by
+SequenceAnalyzer.get_sequence_statistics.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# The 20 standard residues, in config.AMINO_ACIDS order
+DEFAULT_ALPHABET = "ARNDCQEGHILKMFPSTWYV"
+
+
+@lru_cache(maxsize=8)
+def _codes(alphabet):
+    """Return the byte -> column table for an alphabet (other bytes map to len(alphabet))."""
+    if len(alphabet) > 255 or len(set(alphabet)) != len(alphabet):
+        raise ValueError(f"Alphabet must have at most 255 distinct letters: {alphabet!r}")
+    codes = np.full(256, len(alphabet), dtype=np.uint8)
+    codes[np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)] = np.arange(len(alphabet), dtype=np.uint8)
+    return codes
+
+
+def encode(sequence, alphabet=DEFAULT_ALPHABET):
+    """
+    Convert a sequence to column codes.
+    
+    Args:
+        sequence (str or bytes): Protein sequence
+        alphabet (str): Residue letters in column order
+    
+    Returns:
+        numpy.ndarray: uint8 codes, the letter's position in alphabet, or
+            len(alphabet) for other residues
+    """
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+    return _codes(alphabet)[np.frombuffer(sequence, dtype=np.uint8)]
+
+
+def composition_from_buffer(buffer, offsets, alphabet=DEFAULT_ALPHABET):
+    """
+    Count residues of many sequences stored back to back.
+    
+    Args:
+        buffer: Bytes-like object (or uint8 array) with all residues
+        offsets (numpy.ndarray): n + 1 start offsets; sequence k is
+            buffer[offsets[k]:offsets[k + 1]]
+        alphabet (str): Residue letters in column order
+    
+    Returns:
+        numpy.ndarray: (n x len(alphabet) + 1) int64 count matrix
+    """
+    columns = len(alphabet) + 1
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n = len(offsets) - 1
+    codes = _codes(alphabet)[np.frombuffer(buffer, dtype=np.uint8)[offsets[0]:offsets[-1]]]
+    rows = np.repeat(np.arange(n, dtype=np.int64) * columns, np.diff(offsets))
+    return np.bincount(rows + codes, minlength=n * columns).reshape(n, columns)
+
+
+def composition_matrix(sequences, alphabet=DEFAULT_ALPHABET):
+    """
+    Count residues of many sequences in one call.
+    
+    Args:
+        sequences (list): Protein sequences (str or bytes)
+        alphabet (str): Residue letters in column order
+    
+    Returns:
+        numpy.ndarray: (n x len(alphabet) + 1) int64 count matrix; columns
+            follow alphabet, then other residues
+    """
+    encoded = [s.encode("ascii", "replace") if isinstance(s, str) else bytes(s) for s in sequences]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in encoded], out=offsets[1:])
+    return composition_from_buffer(b"".join(encoded), offsets, alphabet)
+
+
+def statistics_view(sequence, counts=None, alphabet=DEFAULT_ALPHABET):
+    """
+    Build the get_sequence_statistics dict from a count row.
+    
+    Residues outside the alphabet (e.g. X, U or lower case letters) are
+    listed individually, as before; they are only recounted when present.
+    Residues are listed in order of first appearance in the sequence.
+    
+    Args:
+        sequence (str): Protein sequence
+        counts (numpy.ndarray): Its row of a composition matrix over
+            alphabet (computed when omitted)
+        alphabet (str): Residue letters in column order
+    
+    Returns:
+        dict: {'length': int, 'composition': {residue: {'count': int,
+            'percentage': float}}}
+    """
+    if not sequence:
+        return {'length': 0, 'composition': {}}
+    if counts is None:
+        counts = composition_matrix([sequence], alphabet)[0]
+    other = len(alphabet)
+    length = len(sequence)
+    found = {alphabet[column]: int(counts[column]) for column in np.flatnonzero(counts[:other])}
+    if counts[other]:
+        for residue in set(sequence) - set(alphabet):
+            found[residue] = sequence.count(residue)
+    order = sorted(found, key=sequence.index)
+    return {
+        'length': length,
+        'composition': {
+            residue: {'count': found[residue], 'percentage': round((found[residue] / length) * 100, 2)}
+            for residue in order
+        }
+    }
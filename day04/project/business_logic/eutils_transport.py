@@ -0,0 +1,128 @@
+"""
+E-utilities Transport Module
+
+Sends NCBI E-utilities requests over one pooled keep-alive requests.Session,
+so consecutive calls reuse their TCP/TLS connections instead of opening a
+new one each time (as Bio.Entrez does). The base URL is configurable, which
+lets a local stand-in server take NCBI's place.
+
+Rate limiting is left to the caller (see rate_limiter.py), and so are
+retries of 429/5xx responses: a resent request must take a token from the
+limiter like any other. The transport only retries connections that could
+not be opened, which never reached NCBI.
+"""
+
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+DEFAULT_TIMEOUT = 30  # seconds
+TOOL_NAME = "protein_comparator"
+
+# Status codes worth retrying (NCBI answers 429 to bursts and 5xx when busy)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# First backoff in seconds when a retried response has no Retry-After
+RETRY_BACKOFF = 0.5
+
+# Requests with longer ID lists are sent as POST, as NCBI recommends
+MAX_GET_IDS_LENGTH = 2000
+
+
+class EutilsTransport:
+    """Pooled HTTP client for E-utilities calls."""
+    
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT, email=None,
+                 api_key=None, pool_size=4, retries=3):
+        """
+        Args:
+            base_url (str): E-utilities base URL (ending in /eutils/)
+            timeout (float): Connect and read timeout in seconds
+            email (str): Contact email sent with every request
+            api_key (str): Optional NCBI API key sent with every request
+            pool_size (int): Connections kept open (match the number of
+                threads making requests)
+            retries (int): Retries for connections that could not be opened
+        """
+        self.base_url = base_url.rstrip("/") + "/"
+        self.timeout = timeout
+        self.defaults = {"tool": TOOL_NAME}
+        if email:
+            self.defaults["email"] = email
+        if api_key:
+            self.defaults["api_key"] = api_key
+        
+        # Only connect errors: anything resent after reaching the server
+        # must go back through the caller's rate limiter
+        retry = Retry(total=None, connect=retries, read=False, status=0, other=0,
+                      backoff_factor=RETRY_BACKOFF, allowed_methods=None,
+                      respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def open(self, function, **params):
+        """
+        Make one E-utilities call and return the streaming response.
+        
+        Use it as a context manager so the connection goes back to the
+        pool; read the body with response.raw (decoded) or
+        response.iter_content().
+        
+        Args:
+            function (str): E-utility name ("esearch", "esummary", "efetch", ...)
+            **params: Query parameters
+        
+        Returns:
+            requests.Response: Response with an unread body
+        
+        Raises:
+            requests.RequestException: On connection errors, timeouts and
+                error status codes
+        """
+        url = f"{self.base_url}{function}.fcgi"
+        params = dict(self.defaults, **params)
+        if len(str(params.get("id", ""))) > MAX_GET_IDS_LENGTH:
+            response = self.session.post(url, data=params, timeout=self.timeout, stream=True)
+        else:
+            response = self.session.get(url, params=params, timeout=self.timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+def retry_delay(response, attempt):
+    """
+    Return how long to wait before retrying a 429/5xx response.
+    
+    Args:
+        response (requests.Response): The error response
+        attempt (int): Retries already made (0 for the first)
+    
+    Returns:
+        float: Seconds from the Retry-After header (seconds or HTTP date),
+            else an exponential backoff
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return RETRY_BACKOFF * 2 ** attempt
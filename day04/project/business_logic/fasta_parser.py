@@ -0,0 +1,113 @@
+"""
+FASTA Parser Module
+
+Streaming multi-record FASTA parser. Input arrives in chunks (an HTTP
+response's iter_content() or blocks read from a file) and records are
+yielded as soon as they are complete, so memory use is bounded by the
+largest single record rather than the whole download or proteome file.
+
+Each record's residues are collected with one bytearray append per chunk
+and cleaned of line breaks once, when the record ends.
+"""
+
+# Bytes removed from sequence data
+_WHITESPACE = b" \t\r\n"
+
+# Bytes read per chunk from files
+CHUNK_SIZE = 1 << 20
+
+
+def strip_version(accession):
+    """Return an accession without its version suffix (NP_000509.1 -> NP_000509)."""
+    base, dot, version = accession.rpartition(".")
+    return base if dot and version.isdigit() else accession
+
+
+def normalize_accession(token):
+    """
+    Return the accession in a FASTA identifier, without its version.
+    
+    Handles plain RefSeq/GenBank identifiers (NP_000509.1 -> NP_000509)
+    and pipe-separated ones (sp|P69905|HBA_HUMAN -> P69905,
+    ref|NP_000509.1| -> NP_000509).
+    """
+    if "|" in token:
+        fields = token.split("|")
+        token = fields[1] if len(fields) > 1 and fields[1] else fields[0]
+    return strip_version(token)
+
+
+def _record(header, sequence):
+    """Build an (accession, header, sequence) tuple from raw record bytes."""
+    header = header.decode("utf-8", "replace").strip()
+    words = header.split(None, 1)
+    accession = normalize_accession(words[0]) if words else ""
+    return accession, header, sequence.translate(None, _WHITESPACE).decode("ascii")
+
+
+def parse_fasta(chunks):
+    """
+    Parse FASTA data arriving in chunks.
+    
+    Records may span any number of chunks; chunk boundaries can fall
+    anywhere, including inside a header line.
+    
+    Args:
+        chunks: Iterable of bytes (or str) blocks
+    
+    Yields:
+        tuple: (accession without version, header line without '>',
+            sequence) for each record, in file order
+    """
+    header = None       # header of the record being read
+    partial = None      # header line still being read
+    sequence = bytearray()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        view = memoryview(chunk)
+        start, end = 0, len(chunk)
+        while start < end:
+            if partial is not None:
+                newline = chunk.find(b"\n", start)
+                stop = end if newline < 0 else newline
+                partial += view[start:stop]
+                if newline < 0:
+                    break
+                header, partial = partial, None
+                start = newline + 1
+                continue
+            
+            # '>' never occurs inside sequence data, so it always starts a header
+            marker = chunk.find(b">", start)
+            stop = end if marker < 0 else marker
+            if header is not None:
+                sequence += view[start:stop]
+            if marker < 0:
+                break
+            if header is not None:
+                yield _record(header, sequence)
+                header = None
+                sequence = bytearray()
+            partial = bytearray()
+            start = marker + 1
+    
+    if partial is not None:
+        header = partial
+    if header is not None:
+        yield _record(header, sequence)
+
+
+def read_fasta(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream the records of a FASTA file.
+    
+    Args:
+        path (str): FASTA file
+        chunk_size (int): Bytes read at a time
+    
+    Yields:
+        tuple: (accession, header, sequence), as for parse_fasta
+    """
+    with open(path, "rb") as handle:
+        yield from parse_fasta(iter(lambda: handle.read(chunk_size), b""))
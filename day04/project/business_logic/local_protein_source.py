@@ -0,0 +1,302 @@
+"""
+Local Protein Source Module
+
+Serves proteins from a local FASTA dump (RefSeq, UniProt, a proteome...),
+so comparisons work offline and large jobs are not limited by NCBI.
+
+The FASTA file is memory-mapped and described by an index: a sorted table
+of accessions with the byte offset and length of each record. Looking up
+an accession is a binary search in the index plus one slice of the map;
+nothing is read from disk until the slice is used, and the operating
+system's page cache is shared by every process reading the same file.
+
+The index is built with one pass over the file and persisted next to it
+(<file>.idx by default). It is memory-mapped as well, so opening even a
+multi-GB dump is instant after the first time. It is rebuilt when the
+FASTA file's size or modification time changes.
+
+Searches by protein name and organism scan the headers of the mapped
+file with a regular expression, so they are linear in the file size.
+"""
+
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+
+from .fasta_parser import normalize_accession
+from .protein_record import ProteinRecord
+from .protein_source import ProteinSource
+
+# Index file: header (magic, FASTA size, FASTA mtime, record count, key
+# width), then record offsets and lengths (int64) and the sorted keys
+_MAGIC = b"FAIDX001"
+_HEADER = struct.Struct("<8sQqQI4x")
+
+# Header lines: ">" at the start of a line, then the identifier
+_HEADER_LINE = re.compile(rb"^>(\S*)", re.MULTILINE)
+
+# Records collected before converting them to arrays while indexing
+_INDEX_BLOCK = 1 << 20
+
+# Bytes removed from sequence data
+_WHITESPACE = b" \t\r\n"
+
+
+def _map(path):
+    """Memory-map a file read-only (an empty file gives empty bytes)."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _key(accession):
+    """Return the index key (bytes) of an accession or FASTA identifier."""
+    return normalize_accession(accession.strip()).encode("ascii", "replace")
+
+
+def build_index(fasta_path, index_path):
+    """
+    Index a FASTA file and write the index.
+    
+    Args:
+        fasta_path (str): FASTA file
+        index_path (str): Index file to write (replaced atomically)
+    
+    Returns:
+        int: Number of indexed records
+    """
+    stat = os.stat(fasta_path)
+    data = _map(fasta_path)
+    keys, starts = [], []
+    key_blocks, start_blocks = [], []
+    for match in _HEADER_LINE.finditer(data):
+        keys.append(_key(match.group(1).decode("ascii", "replace")))
+        starts.append(match.start())
+        if len(keys) == _INDEX_BLOCK:
+            key_blocks.append(np.array(keys, dtype=bytes))
+            start_blocks.append(np.array(starts, dtype=np.int64))
+            keys, starts = [], []
+    key_blocks.append(np.array(keys, dtype=bytes))
+    start_blocks.append(np.array(starts, dtype=np.int64))
+    if isinstance(data, mmap.mmap):
+        data.close()
+    
+    keys = np.concatenate(key_blocks)
+    offsets = np.concatenate(start_blocks)
+    lengths = np.diff(offsets, append=stat.st_size)
+    
+    # Sort by key; the stable sort keeps the first of duplicate accessions first
+    order = np.argsort(keys, kind="stable")
+    keys, offsets, lengths = keys[order], offsets[order], lengths[order]
+    width = max(keys.dtype.itemsize, 1)
+    
+    temporary = f"{index_path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, len(keys), width))
+        handle.write(offsets.tobytes())
+        handle.write(lengths.tobytes())
+        handle.write(keys.astype(f"S{width}").tobytes())
+    os.replace(temporary, index_path)
+    return len(keys)
+
+
+class LocalProteinSource(ProteinSource):
+    """Proteins from a memory-mapped, indexed local FASTA file."""
+    
+    def __init__(self, path, index_path=None):
+        """
+        Open a FASTA file, building its index if it is missing or stale.
+        
+        Args:
+            path (str): FASTA file (RefSeq, UniProt or any FASTA dump)
+            index_path (str): Index file (default: path + ".idx"; use
+                another location when the FASTA directory is read-only)
+        
+        Raises:
+            FileNotFoundError: If the FASTA file does not exist
+        """
+        self.path = path
+        self.index_path = index_path or f"{path}.idx"
+        if not self._load_index():
+            build_index(path, self.index_path)
+            if not self._load_index():
+                raise ValueError(f"Could not index {path}")
+        self._data = _map(path)
+    
+    def _load_index(self):
+        """Map the index file; return False if it is missing or stale."""
+        if not os.path.exists(self.index_path):
+            return False
+        stat = os.stat(self.path)
+        index = _map(self.index_path)
+        if len(index) < _HEADER.size:
+            index.close()
+            return False
+        magic, size, mtime, count, width = _HEADER.unpack_from(index)
+        if magic != _MAGIC or size != stat.st_size or mtime != stat.st_mtime_ns:
+            index.close()
+            return False
+        if len(index) != _HEADER.size + count * (16 + width):
+            index.close()
+            return False  # truncated
+        self._index = index
+        self._offsets = np.frombuffer(index, dtype=np.int64, count=count, offset=_HEADER.size)
+        self._lengths = np.frombuffer(index, dtype=np.int64, count=count, offset=_HEADER.size + 8 * count)
+        self._keys = np.frombuffer(index, dtype=f"S{width}", count=count, offset=_HEADER.size + 16 * count)
+        return True
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    def __contains__(self, accession):
+        return self._find(_key(accession)) is not None
+    
+    def _find(self, key):
+        """Return the index position of a key, or None."""
+        position = np.searchsorted(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return position
+        return None
+    
+    def _record_at(self, offset, length):
+        """Build a ProteinRecord from the record starting at offset."""
+        header, _, body = self._data[offset:offset + length].partition(b"\n")
+        words = header[1:].decode("utf-8", "replace").strip().split(None, 1)
+        return ProteinRecord(
+            normalize_accession(words[0]) if words else "",
+            body.translate(None, _WHITESPACE).decode("ascii"),
+            words[1] if len(words) > 1 else ""
+        )
+    
+    def record(self, accession):
+        """
+        Look up one protein.
+        
+        Args:
+            accession (str): Accession, with or without version, or a
+                FASTA identifier such as sp|P69905|HBA_HUMAN
+        
+        Returns:
+            ProteinRecord: The protein, or None if the file lacks it
+        """
+        position = self._find(_key(accession))
+        if position is None:
+            return None
+        return self._record_at(int(self._offsets[position]), int(self._lengths[position]))
+    
+    def fetch_sequence(self, accession_id):
+        """
+        Retrieve the amino acid sequence for a protein.
+        
+        Args:
+            accession_id (str): Protein accession
+        
+        Returns:
+            str: Protein sequence, or None if the file lacks it
+        """
+        protein = self.record(accession_id)
+        return protein.sequence if protein else None
+    
+    def iter_sequences(self, accession_ids):
+        """
+        Stream sequences for many accessions.
+        
+        All accessions are looked up in the index with one vectorized
+        binary search.
+        
+        Args:
+            accession_ids (list): Protein accessions
+        
+        Yields:
+            tuple: (accession without version, sequence) for the
+                accessions in the file, in the order given
+        """
+        if not len(self._keys):
+            return
+        keys = np.array([_key(accession) for accession in accession_ids], dtype=bytes)
+        if not len(keys):
+            return
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        for key, position in zip(keys, positions):
+            if self._keys[position] == key:
+                protein = self._record_at(int(self._offsets[position]), int(self._lengths[position]))
+                yield protein.accession, protein.sequence
+    
+    def _scan(self, protein_names, organisms, max_results):
+        """
+        Scan the headers for proteins by name and organism.
+        
+        A header matches a protein name anywhere in it, ignoring case, and
+        an organism as RefSeq's "[Organism]" or UniProt's "OS=Organism".
+        
+        Returns:
+            dict: (protein name, organism) -> list of up to max_results
+                ProteinRecords, in file order
+        """
+        hits = {(name, organism): [] for name in protein_names for organism in organisms}
+        if not hits:
+            return hits
+        names = b"|".join(re.escape(name.encode("utf-8")) for name in protein_names)
+        pattern = re.compile(rb"^>[^\n]*(?:" + names + rb")[^\n]*", re.MULTILINE | re.IGNORECASE)
+        markers = {organism: (f"[{organism.casefold()}]", f"os={organism.casefold()}") for organism in organisms}
+        pending = len(hits)
+        for match in pattern.finditer(self._data):
+            header = match.group().decode("utf-8", "replace").casefold()
+            for (name, organism), found in hits.items():
+                if len(found) >= max_results or name.casefold() not in header:
+                    continue
+                if not any(marker in header for marker in markers[organism]):
+                    continue
+                end = self._data.find(b"\n>", match.end())
+                end = len(self._data) if end < 0 else end + 1
+                protein = self._record_at(match.start(), end - match.start())
+                if protein.sequence:
+                    found.append(protein)
+                    if len(found) == max_results:
+                        pending -= 1
+            if not pending:
+                break
+        return hits
+    
+    def search_with_sequences(self, protein_name, organism, max_results=5):
+        """
+        Search the file for a protein in one organism.
+        
+        Args:
+            protein_name (str): Name of the protein (matched in the header)
+            organism (str): Scientific organism name
+            max_results (int): Maximum number of results to return
+        
+        Returns:
+            list: ProteinRecords, in file order
+        """
+        return self._scan([protein_name], [organism], max_results)[(protein_name, organism)]
+    
+    def get_proteins(self, protein_names, organisms):
+        """
+        Find several proteins in several organisms with one scan of the file.
+        
+        Args:
+            protein_names (list): Protein names
+            organisms (list): Organism names
+        
+        Returns:
+            dict: Protein name -> {organism: ProteinRecord or None}, both
+                in the order given
+        """
+        hits = self._scan(protein_names, organisms, 1)
+        return {
+            name: {organism: (hits[(name, organism)] or [None])[0] for organism in organisms}
+            for name in protein_names
+        }
+    
+    def close(self):
+        """Unmap the FASTA file and its index."""
+        self._keys = self._offsets = self._lengths = None  # release views of the index map
+        for mapped in (self._data, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
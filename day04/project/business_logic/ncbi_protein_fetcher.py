@@ -1,87 +1,247 @@
 """
 NCBI Protein Fetcher Module
 
-Handles all interactions with the NCBI Protein database via BioPython.
-Searches for proteins and retrieves amino acid sequences.
+Handles all interactions with the NCBI Protein database. Searches for
+proteins and retrieves amino acid sequences. Requests go over a pooled
+keep-alive EutilsTransport; XML responses are parsed with BioPython.
+
+Searches are batched: one esearch returns the IDs, then a single esummary
+(titles and accessions) or efetch (FASTA with sequences) covers all of
+them. Large result sets are paged through the Entrez history server
+(WebEnv/query_key) instead of sending long ID lists.
+
+With a ProteinCache, searches, protein records and "not found" results
+are answered from disk before any request is made.
+
+Organisms (and proteins) are fetched concurrently by a thread pool; every
+request still passes through one token-bucket limiter. By default the
+bucket is shared with every other process on the machine, so the total
+rate stays within NCBI's limits.
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 from Bio import Entrez
 
+from .eutils_transport import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, RETRY_STATUS, EutilsTransport, retry_delay
+from .fasta_parser import normalize_accession, parse_fasta
+from .protein_cache import protein_key, search_key
+from .protein_record import ProteinRecord
+from .protein_source import ProteinSource
+from .rate_limiter import shared_limiter
+
+# IDs requested per esummary/efetch call
+PAGE_SIZE = 200
+
+# Bytes read at a time from FASTA responses
+CHUNK_SIZE = 64 * 1024
 
-class ProteinFetcher:
+
+class ProteinFetcher(ProteinSource):
     """Fetches protein sequences from NCBI Protein database."""
     
-    def __init__(self, email="student@python-course.com", delay=0.4):
+    def __init__(self, email="student@python-course.com", delay=0.4, page_size=PAGE_SIZE,
+                 cache=None, api_key=None, max_workers=4, limiter=None,
+                 base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT, transport=None, retries=3):
         """
         Initialize the protein fetcher.
         
         Args:
             email (str): Email for NCBI (required by NCBI guidelines)
             delay (float): Delay between requests in seconds (respect NCBI rate limits)
+            page_size (int): IDs per batched esummary/efetch request
+            cache (ProteinCache): Optional persistent cache for lookups
+            api_key (str): Optional NCBI API key (allows 10 requests/s)
+            max_workers (int): Threads used for concurrent searches
+            limiter: Rate limiter with an acquire() method (default: the
+                host-wide token bucket for the delay/api_key tier)
+            base_url (str): E-utilities base URL (e.g. a local stand-in server)
+            timeout (float): Request timeout in seconds
+            transport (EutilsTransport): Optional transport to use instead
+                of creating one from base_url and timeout
+            retries (int): Retries for 429/5xx responses and connection errors
         """
-        Entrez.email = email
         self.delay = delay
-        self.last_request_time = 0
+        self.page_size = page_size
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.limiter = limiter or shared_limiter(delay, api_key)
+        self.transport = transport or EutilsTransport(
+            base_url, timeout, email=email, api_key=api_key, pool_size=max_workers, retries=retries
+        )
     
     def _respect_rate_limit(self):
-        """Ensure minimum delay between NCBI requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.delay:
-            time.sleep(self.delay - elapsed)
-        self.last_request_time = time.time()
+        """Wait for the shared limiter before an NCBI request."""
+        self.limiter.acquire()
+    
+    def _entrez(self, function, **params):
+        """
+        Make one rate-limited E-utilities call.
+        
+        429/5xx responses are retried up to self.retries times, after the
+        server's Retry-After (or a backoff); every attempt takes a token
+        from the limiter.
+        
+        Args:
+            function (str): E-utility name ("esearch", "efetch", ...)
+            **params: Parameters for the call
+        
+        Returns:
+            requests.Response: Streaming response (use it in a with block)
+        """
+        for attempt in range(self.retries + 1):
+            self._respect_rate_limit()
+            try:
+                return self.transport.open(function, **params)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in RETRY_STATUS or attempt == self.retries:
+                    raise
+                time.sleep(retry_delay(e.response, attempt))
+    
+    def _read(self, function, **params):
+        """Make one E-utilities call and parse its XML response."""
+        with self._entrez(function, **params) as response:
+            return Entrez.read(response.raw)
+    
+    def _search_ids(self, protein_name, organism, max_results, use_history):
+        """
+        Run the esearch for a protein in an organism.
+        
+        Returns:
+            tuple: (list of IDs, history parameters dict or None)
+        """
+        search_term = f"{protein_name}[Title] AND {organism}[Organism]"
+        record = self._read(
+            "esearch",
+            db="protein",
+            term=search_term,
+            retmax=max_results,
+            usehistory="y" if use_history else "n"
+        )
+        history = None
+        if use_history and record.get("WebEnv"):
+            history = {"webenv": record["WebEnv"], "query_key": record["QueryKey"]}
+        return list(record["IdList"]), history
     
-    def search_protein(self, protein_name, organism, max_results=5):
+    def _pages(self, ids, history):
+        """
+        Yield request parameters selecting the IDs one page at a time.
+        
+        With history parameters the pages are addressed by retstart/retmax
+        on the stored search; otherwise the IDs are sent in the request.
+        """
+        for start in range(0, len(ids), self.page_size):
+            if history:
+                yield dict(history, retstart=start, retmax=min(self.page_size, len(ids) - start))
+            else:
+                yield {"id": ",".join(ids[start:start + self.page_size])}
+    
+    def search_protein(self, protein_name, organism, max_results=5, use_history=None):
         """
         Search for a protein in a specific organism.
         
+        Accessions and titles for all hits come from one batched esummary
+        (per page of page_size IDs).
+        
         Args:
             protein_name (str): Name of the protein (e.g., "hemoglobin")
             organism (str): Scientific organism name (e.g., "Homo sapiens")
             max_results (int): Maximum number of results to return
+            use_history (bool): Page through the Entrez history server
+                (default: only when max_results exceeds page_size)
         
         Returns:
             list: List of (accession_id, title, organism_name) tuples
         """
+        if use_history is None:
+            use_history = max_results > self.page_size
+        key = search_key(protein_name, organism, max_results)
+        if self.cache:
+            found, cached = self.cache.lookup(key)
+            if found:
+                return [tuple(result) for result in cached]
         try:
-            self._respect_rate_limit()
+            ids, history = self._search_ids(protein_name, organism, max_results, use_history)
             
-            search_term = f"{protein_name}[Title] AND {organism}[Organism]"
-            handle = Entrez.esearch(
-                db="protein",
-                term=search_term,
-                retmax=max_results,
-                rettype="xml"
-            )
-            record = Entrez.read(handle)
-            handle.close()
+            results = []
+            for page in self._pages(ids, history):
+                summaries = self._read("esummary", db="protein", **page)
+                for summary in summaries:
+                    accession = summary.get("Caption") or summary.get("Id")
+                    title = summary.get("Title", "Unknown")
+                    results.append((accession, title, organism))
             
-            if not record["IdList"]:
-                return []
+            if self.cache:
+                self.cache.store(key, results)
+            return results
+        
+        except Exception as e:
+            raise Exception(f"NCBI search error: {str(e)}")
+    
+    def search_with_sequences(self, protein_name, organism, max_results=5, use_history=None):
+        """
+        Search for a protein and download the hits' sequences in the same batch.
+        
+        One esearch plus one FASTA efetch per page of IDs, so a typical
+        search costs 2 requests.
+        
+        Args:
+            protein_name (str): Name of the protein
+            organism (str): Scientific organism name
+            max_results (int): Maximum number of results to return
+            use_history (bool): See search_protein
+        
+        Returns:
+            list: ProteinRecords (accession, sequence, title, length; also
+                readable like dicts), in search order
+        """
+        if use_history is None:
+            use_history = max_results > self.page_size
+        key = search_key(protein_name, organism, max_results, kind="hits")
+        if self.cache:
+            cached = self._cached_hits(key)
+            if cached is not None:
+                return cached
+        try:
+            ids, history = self._search_ids(protein_name, organism, max_results, use_history)
             
             results = []
-            for protein_id in record["IdList"]:
-                # Fetch details for each protein
-                self._respect_rate_limit()
-                handle = Entrez.efetch(
-                    db="protein",
-                    id=protein_id,
-                    rettype="xml"
-                )
-                records = Entrez.read(handle)
-                handle.close()
-                
-                if records:
-                    protein_record = records[0]
-                    accession = protein_record.get("GBSeq_primary-accession", protein_id)
-                    title = protein_record.get("GBSeq_definition", "Unknown")
-                    results.append((accession, title, organism))
+            for page in self._pages(ids, history):
+                for accession, title, sequence in self._fetch_fasta(**page):
+                    results.append(ProteinRecord(accession, sequence, title))
             
+            if self.cache:
+                for protein in results:
+                    self.cache.store(protein_key(protein.accession), protein.to_dict())
+                self.cache.store(key, [protein.accession for protein in results])
             return results
         
         except Exception as e:
             raise Exception(f"NCBI search error: {str(e)}")
     
+    def _cached_hits(self, key):
+        """Return cached search hits with their protein records, or None."""
+        found, accessions = self.cache.lookup(key)
+        if not found:
+            return None
+        results = []
+        for accession in accessions:
+            found, protein = self.cache.lookup(protein_key(accession))
+            if not found or protein is None:
+                return None
+            results.append(ProteinRecord.from_dict(protein))
+        return results
+    
+    def _fetch_fasta(self, **params):
+        """Run one FASTA efetch and yield its (accession, title, sequence) records as they arrive."""
+        with self._entrez("efetch", db="protein", rettype="fasta", retmode="text", **params) as response:
+            for accession, header, sequence in parse_fasta(response.iter_content(CHUNK_SIZE)):
+                yield accession, header.partition(" ")[2], sequence
+    
     def fetch_sequence(self, accession_id):
         """
         Retrieve the amino acid sequence for a protein.
@@ -92,24 +252,71 @@ class ProteinFetcher:
         Returns:
             str: Protein sequence, or None if retrieval fails
         """
+        key = protein_key(accession_id)
+        if self.cache:
+            found, protein = self.cache.lookup(key)
+            if found:
+                return protein['sequence'] if protein else None
         try:
-            self._respect_rate_limit()
-            
-            handle = Entrez.efetch(
-                db="protein",
-                id=accession_id,
-                rettype="fasta"
-            )
-            record = handle.read()
-            handle.close()
-            
-            # Extract sequence from FASTA format
-            lines = record.strip().split('\n')
-            if len(lines) > 1:
-                sequence = ''.join(lines[1:])
-                return sequence
+            records = list(self._fetch_fasta(id=accession_id))
+            protein = ProteinRecord(records[0][0], records[0][2], records[0][1]) if records else None
+            if self.cache:
+                self.cache.store(key, protein.to_dict() if protein else None)
+            return protein.sequence if protein else None
+        
+        except Exception as e:
+            raise Exception(f"Sequence fetch error: {str(e)}")
+    
+    def fetch_sequences(self, accession_ids):
+        """
+        Retrieve sequences for many accessions in batched requests.
+        
+        Args:
+            accession_ids (list): NCBI protein accession IDs
+        
+        Returns:
+            dict: Accession (without version) -> sequence, for the
+                accessions NCBI returned
+        """
+        return dict(self.iter_sequences(accession_ids))
+    
+    def iter_sequences(self, accession_ids):
+        """
+        Stream sequences for many accessions.
+        
+        Cached sequences come first, then each page of page_size
+        accessions is downloaded and parsed as it arrives, so thousands of
+        accessions can be processed without holding them all in memory.
+        
+        Args:
+            accession_ids (list): NCBI protein accession IDs
+        
+        Yields:
+            tuple: (accession without version, sequence) for the
+                accessions NCBI returned
+        """
+        try:
+            missing = []
+            for accession in accession_ids:
+                found, protein = self.cache.lookup(protein_key(accession)) if self.cache else (False, None)
+                if not found:
+                    missing.append(accession)
+                elif protein:
+                    yield normalize_accession(accession), protein['sequence']
             
-            return None
+            for page in self._pages(missing, None):
+                returned = set()
+                for accession, title, sequence in self._fetch_fasta(**page):
+                    returned.add(accession)
+                    if self.cache:
+                        self.cache.store(protein_key(accession), ProteinRecord(accession, sequence, title).to_dict())
+                    yield accession, sequence
+                
+                if self.cache:
+                    # NCBI returns accessions without version; compare them that way
+                    for accession in page["id"].split(","):
+                        if normalize_accession(accession) not in returned:
+                            self.cache.store(protein_key(accession), None)
         
         except Exception as e:
             raise Exception(f"Sequence fetch error: {str(e)}")
@@ -123,41 +330,47 @@ class ProteinFetcher:
             organisms (list): List of organism names
         
         Returns:
-            dict: Mapping of organism names to protein data or None
+            dict: Mapping of organism names to ProteinRecord or None
                 {
-                    "Homo sapiens": {
-                        'accession': str,
-                        'sequence': str,
-                        'title': str,
-                        'length': int
-                    } or None,
-                    "Danio rerio": {...} or None
+                    "Homo sapiens": ProteinRecord (record['accession'],
+                        record['sequence'], record['title'] and
+                        record['length'] work as with a dict) or None,
+                    "Danio rerio": ProteinRecord or None
                 }
         """
-        results = {}
+        return self.get_proteins([protein_name], organisms)[protein_name]
+    
+    def _first_hit(self, protein_name, organism):
+        """Return the first hit with a sequence for one organism, or None."""
+        try:
+            hits = self.search_with_sequences(protein_name, organism, max_results=1)
+            return hits[0] if hits and hits[0]['sequence'] else None
         
-        for organism in organisms:
-            try:
-                search_results = self.search_protein(protein_name, organism, max_results=1)
-                
-                if search_results:
-                    accession, title, org = search_results[0]
-                    sequence = self.fetch_sequence(accession)
-                    
-                    if sequence:
-                        results[organism] = {
-                            'accession': accession,
-                            'sequence': sequence,
-                            'title': title,
-                            'length': len(sequence)
-                        }
-                    else:
-                        results[organism] = None
-                else:
-                    results[organism] = None
-            
-            except Exception as e:
-                print(f"Error searching {organism}: {str(e)}")
-                results[organism] = None
+        except Exception as e:
+            print(f"Error searching {organism}: {str(e)}")
+            return None
+    
+    def get_proteins(self, protein_names, organisms):
+        """
+        Search for several proteins in several organisms concurrently.
+        
+        Each (protein, organism) search runs in the thread pool; errors
+        only affect their own entry, which is set to None.
+        
+        Args:
+            protein_names (list): Protein names
+            organisms (list): Organism names
+        
+        Returns:
+            dict: Protein name -> {organism: protein data or None}, both
+                in the order given
+        """
+        tasks = [(name, organism) for name in protein_names for organism in organisms]
+        workers = max(1, min(self.max_workers, len(tasks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hits = list(pool.map(lambda task: self._first_hit(*task), tasks))
         
+        results = {name: {} for name in protein_names}
+        for (name, organism), hit in zip(tasks, hits):
+            results[name][organism] = hit
         return results
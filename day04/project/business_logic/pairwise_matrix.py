@@ -0,0 +1,329 @@
+"""
+Pairwise Matrix Module
+
+All-vs-all identity and similarity for N sequences, as condensed matrices
+(the upper triangle in row order, like scipy's pdist): pair (i, j) with
+i < j is stored at index i*n - i*(i+1)/2 + j - i - 1.
+
+Identical sequences are compared only once: the work runs over the
+distinct sequences and the results are expanded to every label at the end,
+one label row at a time. Pairs are cut into contiguous chunks of condensed
+indices and spread over a process pool, with a few chunks per worker in
+flight; each worker receives the sequences once, when it starts. A
+ProteinSet is sent as its residue buffer and sliced in the workers.
+
+With a checkpoint file every finished chunk is appended to a binary log,
+so an interrupted run resumes where it stopped. The log is tied to the
+sequences, method and chunk size, and is started over if they change.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .protein_record import ProteinSet
+from .result_memo import sequence_digest
+from .sequence_analyzer import SequenceAnalyzer
+
+# Largest number of pairs per task (also the checkpoint granularity)
+CHUNK_PAIRS = 5000
+
+# Smaller jobs are still cut into this many tasks to keep all workers busy
+MIN_CHUNKS = 64
+
+# Chunks submitted ahead per worker process
+CHUNKS_IN_FLIGHT = 4
+
+# Checkpoint file: magic, job digest, then (start, count) records each
+# followed by count float32 identities and count float32 similarities
+_MAGIC = b"PAIRCKP1"
+_RECORD = struct.Struct("<QI")
+
+# Sequences and comparison settings of a worker process
+_worker = {}
+
+
+def pair_count(n):
+    """Return the number of pairs among n items."""
+    return n * (n - 1) // 2
+
+
+def condensed_index(i, j, n):
+    """Return the condensed-matrix index of pair (i, j), i < j, among n items."""
+    return i * n - i * (i + 1) // 2 + j - i - 1
+
+
+def pair_at(k, n):
+    """Return the pair (i, j) stored at condensed index k among n items."""
+    i = n - 2 - int(math.sqrt(-8 * k + 4 * n * (n - 1) - 7) / 2.0 - 0.5)
+    j = k + i + 1 - pair_count(n) + pair_count(n - i)
+    return i, j
+
+
+def square(condensed, n, diagonal):
+    """
+    Expand a condensed matrix to a symmetric n x n array.
+    
+    Args:
+        condensed (numpy.ndarray): Values for the n*(n-1)/2 pairs
+        n (int): Number of items
+        diagonal (float): Value for each item against itself
+    
+    Returns:
+        numpy.ndarray: Square matrix
+    """
+    matrix = np.full((n, n), diagonal, dtype=condensed.dtype)
+    rows, cols = np.triu_indices(n, 1)
+    matrix[rows, cols] = condensed
+    matrix[cols, rows] = condensed
+    return matrix
+
+
+class _BufferSequences:
+    """Sequences sliced on demand from one residue buffer (pickled as two arrays, not strs)."""
+    
+    def __init__(self, buffer, offsets, rows):
+        """
+        Args:
+            buffer (numpy.ndarray): uint8 residues (ProteinSet.buffer)
+            offsets (numpy.ndarray): Start offsets (ProteinSet.offsets)
+            rows (list): Buffer row of each sequence
+        """
+        self.buffer = buffer
+        self.starts = offsets[rows]
+        self.ends = offsets[np.asarray(rows, dtype=np.int64) + 1]
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def __getitem__(self, index):
+        return self.buffer[self.starts[index]:self.ends[index]].tobytes().decode("ascii")
+
+
+def _init_worker(sequences, method, params):
+    _worker.update(sequences=sequences, method=method, params=params)
+
+
+def _compare_chunk(start, count):
+    """Compare the pairs at condensed indices start .. start + count - 1."""
+    sequences = _worker["sequences"]
+    n = len(sequences)
+    identity = np.empty(count, dtype=np.float32)
+    similarity = np.empty(count, dtype=np.float32)
+    i, j = pair_at(start, n)
+    first = sequences[i]
+    for k in range(count):
+        measured = SequenceAnalyzer.measure(first, sequences[j], _worker["method"],
+                                            **_worker["params"])
+        identity[k] = measured['identity_percentage']
+        similarity[k] = measured['similarity_ratio']
+        j += 1
+        if j == n:
+            i += 1
+            j = i + 1
+            if i < n - 1:
+                first = sequences[i]
+    return start, identity, similarity
+
+
+def _job_digest(digests, method, params, chunk_size):
+    """Identify a job so a checkpoint is only resumed for the same work."""
+    job = hashlib.blake2b(digest_size=16)
+    job.update(f"{method}|{sorted(params.items())}|{chunk_size}|".encode())
+    for digest in digests:
+        job.update(digest.encode())
+    return job.digest()
+
+
+def _load_checkpoint(path, job, identity, similarity):
+    """
+    Read the finished chunks of a checkpoint into the result arrays.
+    
+    Returns:
+        tuple: (set of start indices of finished chunks, file offset after
+            the last complete record; 0 if the file is missing or belongs
+            to another job)
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done, 0
+    with open(path, "rb") as handle:
+        if handle.read(len(_MAGIC) + len(job)) != _MAGIC + job:
+            return done, 0
+        end = handle.tell()
+        while True:
+            header = handle.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break
+            start, count = _RECORD.unpack(header)
+            values = handle.read(8 * count)
+            if len(values) < 8 * count or start + count > len(identity):
+                break  # incomplete record from an interrupted write
+            data = np.frombuffer(values, dtype=np.float32)
+            identity[start:start + count] = data[:count]
+            similarity[start:start + count] = data[count:]
+            done.add(start)
+            end = handle.tell()
+    return done, end
+
+
+def _expand(values, positions, n, diagonal):
+    """
+    Expand a condensed matrix over distinct sequences to one over all labels.
+    
+    Works one label row at a time, so temporaries stay O(labels) however
+    many pairs the result holds.
+    
+    Args:
+        values (numpy.ndarray): Condensed values among the n distinct sequences
+        positions (numpy.ndarray): Distinct-sequence index of each label
+        n (int): Number of distinct sequences
+        diagonal (float): Value for a label against an identical sequence
+    
+    Returns:
+        numpy.ndarray: Condensed float32 values among the labels
+    """
+    count = len(positions)
+    expanded = np.empty(pair_count(count), dtype=np.float32)
+    start = 0
+    for row in range(count - 1):
+        first, others = positions[row], positions[row + 1:]
+        low, high = np.minimum(first, others), np.maximum(first, others)
+        index = low * n - low * (low + 1) // 2 + high - low - 1
+        same = first == others
+        index[same] = 0
+        out = expanded[start:start + len(others)]
+        if len(values):
+            np.take(values, index, out=out)
+        out[same] = diagonal
+        start += len(others)
+    return expanded
+
+
+def all_vs_all(sequences, labels=None, method="lcs", workers=None, chunk_size=None,
+               checkpoint=None, progress=None, **params):
+    """
+    Compare every pair of sequences.
+    
+    Identical sequences score 100% identity and similarity 1.0 without
+    being compared.
+    
+    Args:
+        sequences (list or ProteinSet): Protein sequences; a ProteinSet is
+            compared from its residue buffer without building strs
+        labels (list): Names for the sequences (default: a ProteinSet's
+            accessions, else their positions)
+        method (str): Comparison method for SequenceAnalyzer.measure
+            ("lcs" is fastest; "global"/"local" are quadratic per pair)
+        workers (int): Processes to use (default: CPU count; 1 runs
+            everything in this process)
+        chunk_size (int): Pairs per task (default: up to CHUNK_PAIRS, and
+            small enough for MIN_CHUNKS tasks)
+        checkpoint (str): Optional file for resuming an interrupted run
+        progress: Optional function called with (pairs done, total pairs)
+        **params: matrix, gap_open, gap_extend for alignment methods
+    
+    Returns:
+        dict: 'labels', condensed float32 arrays 'identity' (percent) and
+            'similarity' (ratio) over all labels, 'method', 'unique'
+            (distinct sequences) and 'compared' (pairs among distinct sequences)
+    """
+    packed = isinstance(sequences, ProteinSet)
+    if labels is None:
+        labels = sequences.accessions if packed else range(len(sequences))
+    labels = list(labels)
+    if len(labels) != len(sequences):
+        raise ValueError("labels and sequences must have the same length")
+    
+    # Distinct sequences in order of first appearance
+    digests, unique, index_of = [], [], {}
+    positions = []
+    for row in range(len(sequences)):
+        sequence = sequences.residues(row) if packed else sequences[row]
+        digest = sequence_digest(sequence)
+        if digest not in index_of:
+            index_of[digest] = len(unique)
+            unique.append(row if packed else sequence)
+            digests.append(digest)
+        positions.append(index_of[digest])
+    if packed:
+        unique = _BufferSequences(sequences.buffer, sequences.offsets, unique)
+    
+    n = len(unique)
+    total = pair_count(n)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(CHUNK_PAIRS, math.ceil(total / MIN_CHUNKS)))
+    identity = np.full(total, np.nan, dtype=np.float32)
+    similarity = np.full(total, np.nan, dtype=np.float32)
+    
+    done = set()
+    log = None
+    if checkpoint:
+        job = _job_digest(digests, method, params, chunk_size)
+        done, end = _load_checkpoint(checkpoint, job, identity, similarity)
+        log = open(checkpoint, "r+b" if end else "wb")
+        if end:
+            log.truncate(end)  # drop a record cut short by an interruption
+            log.seek(end)
+        else:
+            log.write(_MAGIC + job)
+            log.flush()
+    
+    chunks = [(start, min(chunk_size, total - start))
+              for start in range(0, total, chunk_size) if start not in done]
+    finished = total - sum(count for _, count in chunks)
+    
+    def record(start, chunk_identity, chunk_similarity):
+        nonlocal finished
+        count = len(chunk_identity)
+        identity[start:start + count] = chunk_identity
+        similarity[start:start + count] = chunk_similarity
+        if log:
+            log.write(_RECORD.pack(start, count) + chunk_identity.tobytes() + chunk_similarity.tobytes())
+            log.flush()
+        finished += count
+        if progress:
+            progress(finished, total)
+    
+    try:
+        if workers == 1 or len(chunks) <= 1:
+            _init_worker(unique, method, params)
+            for chunk in chunks:
+                record(*_compare_chunk(*chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(unique, method, params)) as pool:
+                pending = iter(chunks)
+                futures = set()
+                while True:
+                    for chunk in pending:
+                        futures.add(pool.submit(_compare_chunk, *chunk))
+                        if len(futures) >= CHUNKS_IN_FLIGHT * workers:
+                            break
+                    if not futures:
+                        break
+                    finished_futures, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished_futures:
+                        record(*future.result())
+    finally:
+        if log:
+            log.close()
+    
+    # Expand from distinct sequences to every label (nothing to do without duplicates)
+    if n < len(labels):
+        positions = np.asarray(positions, dtype=np.int64)
+        identity = _expand(identity, positions, n, 100.0)
+        similarity = _expand(similarity, positions, n, 1.0)
+    return {
+        'labels': labels,
+        'identity': identity,
+        'similarity': similarity,
+        'method': method,
+        'unique': n,
+        'compared': total
+    }
@@ -0,0 +1,227 @@
+"""
+Protein Cache Module
+
+Persistent SQLite cache for NCBI lookups, shared by every ProteinFetcher
+on the machine. Stores search results (search term + organism ->
+accessions), protein records (accession -> title and sequence) and
+negative "not found" results, each with a time to live.
+
+The database runs in WAL mode so several processes can read and write it
+at once. Total size is kept in a one-row table maintained by triggers, and
+the least recently used entries are evicted when it exceeds the byte
+budget (value sizes are UTF-8 bytes). Lookups are a primary-key SELECT;
+the access time used for LRU is only rewritten when it is older than
+TOUCH_INTERVAL, so repeated hits do not turn into writes.
+
+Each thread gets its own connection; close() closes all of them.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .fasta_parser import normalize_accession
+
+DEFAULT_TTL = 7 * 24 * 3600         # 1 week for found proteins and searches
+DEFAULT_NEGATIVE_TTL = 24 * 3600    # 1 day for "not found" results
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds before a cache hit updates the entry's LRU access time
+TOUCH_INTERVAL = 60.0
+
+# Entries removed per eviction step
+EVICT_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+
+def search_key(protein_name, organism, max_results, kind="search"):
+    """Return the cache key for a search (names are compared case-insensitively)."""
+    return f"{kind}:{organism.strip().casefold()}:{protein_name.strip().casefold()}:{max_results}"
+
+
+def protein_key(accession):
+    """Return the cache key for a protein record (NP_000509.1 and NP_000509 share it)."""
+    return f"protein:{normalize_accession(accession)}"
+
+
+class ProteinCache:
+    """On-disk cache with TTLs and LRU eviction by byte budget."""
+    
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL):
+        """
+        Open (or create) a cache database.
+        
+        Args:
+            path (str): SQLite database file
+            max_bytes (int): Budget for the stored values in bytes
+            ttl (float): Seconds a found result stays valid
+            negative_ttl (float): Seconds a "not found" result stays valid
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()  # guards hits, misses and _connections
+        self._connections = []  # (pid, connection) opened by every thread
+        self._generation = 0  # bumped by close() so threads reconnect
+        
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._connection()
+    
+    def _connection(self):
+        """Return this thread's connection (SQLite connections are not shared)."""
+        connection = getattr(self._local, "connection", None)
+        if (connection is None or self._local.pid != os.getpid()
+                or self._local.generation != self._generation):
+            # Only this thread uses it, but close() may close it from another one
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            with self._lock:
+                self._connections.append((os.getpid(), connection))
+                self._local.generation = self._generation
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+    
+    def lookup(self, key):
+        """
+        Look up a cached value.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            tuple: (True, value) on a hit (value is None for a cached
+                "not found"), (False, None) on a miss or expired entry
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, expires, accessed FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or row[1] < now:
+            if row is not None:
+                connection.execute("DELETE FROM entries WHERE key = ? AND expires < ?", (key, now))
+            with self._lock:
+                self.misses += 1
+            return False, None
+        
+        if now - row[2] > TOUCH_INTERVAL:
+            connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return True, json.loads(row[0])
+    
+    def store(self, key, value, ttl=None):
+        """
+        Store a value (JSON-serializable; None records "not found").
+        
+        Args:
+            key (str): Cache key
+            value: Value to store
+            ttl (float): Seconds until it expires (default: ttl, or
+                negative_ttl for None and empty lists)
+        """
+        if ttl is None:
+            ttl = self.ttl if value else self.negative_ttl
+        encoded = json.dumps(value, separators=(",", ":"))
+        size = len(key.encode("utf-8")) + len(encoded.encode("utf-8"))
+        now = time.time()
+        
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires = excluded.expires, accessed = excluded.accessed",
+                (key, encoded, size, now + ttl, now)
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    
+    def _evict(self, connection):
+        """Delete expired, then least recently used entries until within budget."""
+        used = connection.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0]
+        if used <= self.max_bytes:
+            return
+        connection.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+        while connection.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0] > self.max_bytes:
+            deleted = connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed LIMIT ?)", (EVICT_BATCH,)
+            ).rowcount
+            if not deleted:
+                break
+    
+    def clear(self):
+        """Remove every entry."""
+        self._connection().execute("DELETE FROM entries")
+    
+    def stats(self):
+        """
+        Return cache figures.
+        
+        Returns:
+            dict: 'entries', 'bytes', 'max_bytes', and this instance's
+                'hits' and 'misses'
+        """
+        connection = self._connection()
+        entries = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        used = connection.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0]
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            'entries': entries,
+            'bytes': used,
+            'max_bytes': self.max_bytes,
+            'hits': hits,
+            'misses': misses
+        }
+    
+    def close(self):
+        """
+        Close the connections every thread of this process opened.
+        
+        The cache stays usable: a thread that uses it again reconnects.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for pid, connection in connections:
+            if pid == os.getpid():  # a forked child must not close its parent's connections
+                connection.close()
@@ -1,33 +1,90 @@
 """
 Protein Comparator Module
 
-Main orchestrator that coordinates between NCBI fetcher and sequence analyzer.
+Main orchestrator that coordinates between the protein source (NCBI, a
+local FASTA file, or both) and sequence analyzer.
 """
 
+import config
+from .local_protein_source import LocalProteinSource
 from .ncbi_protein_fetcher import ProteinFetcher
+from .pairwise_matrix import all_vs_all
+from .protein_cache import ProteinCache
+from .protein_record import ProteinSet
+from .protein_source import SOURCES, FallbackProteinSource
+from .result_memo import ResultMemo
 from .sequence_analyzer import SequenceAnalyzer
 
 
 class ProteinComparator:
     """Main orchestrator for protein comparison workflow."""
     
-    def __init__(self):
-        """Initialize the comparator with fetcher and analyzer."""
-        self.fetcher = ProteinFetcher()
+    def __init__(self, use_cache=True, source=None):
+        """
+        Initialize the comparator with fetcher and analyzer.
+        
+        Args:
+            use_cache (bool): Answer repeated lookups from the on-disk
+                cache at config.NCBI_CACHE_PATH
+            source (str): "ncbi", "local" or "local+ncbi" (default:
+                config.PROTEIN_SOURCE); local sources read
+                config.LOCAL_FASTA_PATH
+        
+        Raises:
+            ValueError: If the source is unknown or a local source has no
+                FASTA file configured
+        """
+        source = source or config.PROTEIN_SOURCE
+        if source not in SOURCES:
+            raise ValueError(f"Unknown protein source '{source}' (expected one of {', '.join(SOURCES)})")
+        if source != "ncbi" and not config.LOCAL_FASTA_PATH:
+            raise ValueError(f"Protein source '{source}' needs config.LOCAL_FASTA_PATH")
+        self.source = source
+        
+        cache = None
+        if use_cache:
+            cache = ProteinCache(
+                config.NCBI_CACHE_PATH,
+                max_bytes=config.NCBI_CACHE_MAX_BYTES,
+                ttl=config.NCBI_CACHE_TTL,
+                negative_ttl=config.NCBI_CACHE_NEGATIVE_TTL
+            )
+        
+        local = None
+        if source != "ncbi":
+            local = LocalProteinSource(config.LOCAL_FASTA_PATH, config.LOCAL_FASTA_INDEX_PATH)
+        if source == "local":
+            self.fetcher = local
+        else:
+            self.fetcher = ProteinFetcher(
+                email=config.NCBI_EMAIL,
+                delay=config.NCBI_RATE_LIMIT_DELAY,
+                cache=cache,
+                api_key=config.NCBI_API_KEY,
+                base_url=config.NCBI_BASE_URL,
+                timeout=config.NCBI_TIMEOUT
+            )
+            if local is not None:
+                self.fetcher = FallbackProteinSource(local, self.fetcher)
         self.analyzer = SequenceAnalyzer()
+        self.alphabet = "".join(config.AMINO_ACIDS)
+        self.memo = ResultMemo(
+            config.COMPARISON_MEMO_SIZE,
+            cache=cache if config.COMPARISON_MEMO_PERSIST else None
+        )
     
-    def search_and_compare(self, protein_name, organisms):
+    def search_and_compare(self, protein_name, organisms=None):
         """
         Search for a protein in multiple organisms and prepare for comparison.
         
         Args:
             protein_name (str): Name of the protein to search
-            organisms (list): List of organism names
+            organisms (list): List of organism names (default: config.ORGANISMS)
         
         Returns:
             dict: Search results mapping organism names to protein data
         """
-        return self.fetcher.get_protein_in_organisms(protein_name, organisms)
+        return self.fetcher.get_protein_in_organisms(protein_name, organisms or config.ORGANISMS)
     
     def compare_sequences(self, seq1_data, seq2_data):
         """
@@ -40,7 +97,87 @@ class ProteinComparator:
         Returns:
             dict: Comparison results with identity and similarity
         """
-        return self.analyzer.compare_sequences(seq1_data, seq2_data)
+        return self.analyzer.compare_sequences(
+            seq1_data,
+            seq2_data,
+            method=config.COMPARISON_METHOD,
+            matrix=config.SUBSTITUTION_MATRIX,
+            gap_open=config.GAP_OPEN_PENALTY,
+            gap_extend=config.GAP_EXTEND_PENALTY,
+            memo=self.memo,
+            alphabet=self.alphabet
+        )
+    
+    def compare_all(self, proteins, method=None, workers=None, checkpoint=None, progress=None):
+        """
+        Compare every pair of proteins (all-vs-all).
+        
+        Args:
+            proteins (dict or ProteinSet): Label (organism, accession, ...)
+                -> protein data or None (proteins without a sequence are
+                left out), or a ProteinSet labelled by accession
+            method (str): Comparison method (default: config.MATRIX_METHOD)
+            workers (int): Processes to use (default: config.MATRIX_WORKERS)
+            checkpoint (str): Optional file for resuming an interrupted run
+            progress: Optional function called with (pairs done, total pairs)
+        
+        Returns:
+            dict: Condensed 'identity' and 'similarity' matrices over
+                'labels' (see pairwise_matrix.all_vs_all)
+        """
+        if isinstance(proteins, ProteinSet):
+            labels = proteins.accessions
+            sequences = proteins  # compared from its residue buffer
+        else:
+            found = {label: data for label, data in proteins.items() if data and data.get('sequence')}
+            labels = list(found)
+            sequences = [data['sequence'] for data in found.values()]
+        return all_vs_all(
+            sequences,
+            labels=labels,
+            method=method or config.MATRIX_METHOD,
+            workers=workers or config.MATRIX_WORKERS,
+            checkpoint=checkpoint,
+            progress=progress,
+            matrix=config.SUBSTITUTION_MATRIX,
+            gap_open=config.GAP_OPEN_PENALTY,
+            gap_extend=config.GAP_EXTEND_PENALTY
+        )
+    
+    def compare_organisms(self, protein_name, organisms=None, **options):
+        """
+        Search for a protein in N organisms and compare all the hits pairwise.
+        
+        Args:
+            protein_name (str): Name of the protein to search
+            organisms (list): Organism names (default: config.ORGANISMS)
+            **options: method, workers, checkpoint, progress for compare_all
+        
+        Returns:
+            dict: 'search_results' (organism -> protein data or None) and
+                'matrix' (compare_all result over the organisms found)
+        """
+        search_results = self.search_and_compare(protein_name, organisms)
+        return {
+            'search_results': search_results,
+            'matrix': self.compare_all(search_results, **options)
+        }
+    
+    def compare_accessions(self, accession_ids, **options):
+        """
+        Download proteins by accession and compare them all pairwise.
+        
+        Args:
+            accession_ids (list): Protein accessions (thousands are fine)
+            **options: method, workers, checkpoint, progress for compare_all
+        
+        Returns:
+            dict: compare_all result labelled by accession
+        """
+        proteins = ProteinSet()
+        for accession, sequence in self.fetcher.iter_sequences(accession_ids):
+            proteins.add(accession, sequence)
+        return self.compare_all(proteins, **options)
     
     def format_results(self, protein_name, search_results):
         """
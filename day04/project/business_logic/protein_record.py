@@ -0,0 +1,241 @@
+"""
+Protein Record Module
+
+Compact containers for proteins.
+
+ProteinRecord is a __slots__ class for a single protein. It still answers
+dict-style lookups (record['sequence'], record.get('title')), so code
+written for the package's protein data dicts keeps working.
+
+ProteinSet holds many proteins column-wise: all residues in one contiguous
+uint8 buffer with an offsets array, plus lists of accessions and titles.
+residues(i) returns a zero-copy memoryview slice of the buffer, and the
+buffer/offsets pair feeds the batch engines (composition) directly. For
+storage or transfer the residues can be packed to 5 bits each.
+"""
+
+import numpy as np
+
+from .fasta_parser import read_fasta
+
+# 5-bit packing alphabet (32 symbols at most); other bytes pack as X
+PACK_ALPHABET = "ACDEFGHIKLMNPQRSTVWYBZXUOJ*-"
+_PACK_CODES = np.full(256, PACK_ALPHABET.index("X"), dtype=np.uint8)
+_PACK_CODES[np.frombuffer(PACK_ALPHABET.encode("ascii"), dtype=np.uint8)] = np.arange(len(PACK_ALPHABET))
+_UNPACK_BYTES = np.frombuffer(PACK_ALPHABET.encode("ascii"), dtype=np.uint8)
+
+
+def _as_bytes(sequence):
+    """Return a sequence given as str, bytes or memoryview as bytes-like."""
+    return sequence.encode("ascii", "replace") if isinstance(sequence, str) else sequence
+
+
+def pack_residues(residues):
+    """
+    Pack residues into 5 bits each.
+    
+    Args:
+        residues: Bytes-like residues (upper case; others become X)
+    
+    Returns:
+        numpy.ndarray: Packed uint8 array of ceil(5 * n / 8) bytes
+    """
+    codes = _PACK_CODES[np.frombuffer(residues, dtype=np.uint8)]
+    bits = np.unpackbits(codes[:, None], axis=1)[:, 3:]
+    return np.packbits(bits.ravel())
+
+
+def unpack_residues(packed, count):
+    """
+    Unpack residues packed by pack_residues.
+    
+    Args:
+        packed (numpy.ndarray): Packed bytes
+        count (int): Number of residues
+    
+    Returns:
+        numpy.ndarray: uint8 residues (ASCII letters)
+    """
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8))[:5 * count].reshape(count, 5)
+    codes = np.packbits(bits, axis=1) >> 3
+    return _UNPACK_BYTES[codes.ravel()]
+
+
+class ProteinRecord:
+    """One protein: accession, title and sequence, without a per-instance dict."""
+    
+    __slots__ = ("accession", "title", "sequence")
+    
+    # Keys accepted by the dict-style accessors
+    KEYS = ("accession", "sequence", "title", "length")
+    
+    def __init__(self, accession, sequence, title=""):
+        """
+        Args:
+            accession (str): Accession (without version)
+            sequence (str): Amino acid sequence
+            title (str): Description
+        """
+        self.accession = accession
+        self.sequence = sequence
+        self.title = title
+    
+    @property
+    def length(self):
+        return len(self.sequence)
+    
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key, default=None):
+        """Return a field like dict.get (for code written for protein data dicts)."""
+        return getattr(self, key) if key in self.KEYS else default
+    
+    def __eq__(self, other):
+        if not isinstance(other, ProteinRecord):
+            return NotImplemented
+        return (self.accession, self.sequence, self.title) == (other.accession, other.sequence, other.title)
+    
+    def __hash__(self):
+        return hash((self.accession, self.sequence))
+    
+    def __repr__(self):
+        return f"ProteinRecord({self.accession!r}, length={self.length})"
+    
+    def to_dict(self):
+        """Return the protein data dict ('accession', 'sequence', 'title', 'length')."""
+        return {key: getattr(self, key) for key in self.KEYS}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a protein data dict."""
+        return cls(data['accession'], data['sequence'], data.get('title', ""))
+
+
+class ProteinSet:
+    """Columnar collection of proteins with residues in one contiguous buffer."""
+    
+    def __init__(self, capacity=1 << 16):
+        """
+        Args:
+            capacity (int): Initial buffer size in residues (grows as needed)
+        """
+        self.accessions = []
+        self.titles = []
+        self._residues = np.empty(max(1, capacity), dtype=np.uint8)
+        self._offsets = np.zeros(16, dtype=np.int64)
+        self._count = 0
+    
+    @classmethod
+    def from_records(cls, records):
+        """Build a set from ProteinRecords or protein data dicts."""
+        proteins = cls()
+        for record in records:
+            proteins.add(record['accession'], record['sequence'], record.get('title', ""))
+        return proteins
+    
+    @classmethod
+    def from_fasta(cls, path):
+        """Build a set from a FASTA file, streaming it record by record."""
+        proteins = cls()
+        for accession, header, sequence in read_fasta(path):
+            proteins.add(accession, sequence, header.partition(" ")[2])
+        return proteins
+    
+    def add(self, accession, sequence, title=""):
+        """
+        Append a protein.
+        
+        Growing the buffer allocates a new one, so memoryviews handed out
+        earlier stay valid (they keep the old buffer alive).
+        
+        Args:
+            accession (str): Accession
+            sequence (str, bytes or memoryview): Residues
+            title (str): Description
+        """
+        residues = np.frombuffer(_as_bytes(sequence), dtype=np.uint8)
+        start = self._offsets[self._count]
+        end = start + len(residues)
+        if end > len(self._residues):
+            grown = np.empty(max(end, 2 * len(self._residues)), dtype=np.uint8)
+            grown[:start] = self._residues[:start]
+            self._residues = grown
+        if self._count + 2 > len(self._offsets):
+            self._offsets = np.concatenate([self._offsets, np.zeros(len(self._offsets), dtype=np.int64)])
+        self._residues[start:end] = residues
+        self._count += 1
+        self._offsets[self._count] = end
+        self.accessions.append(accession)
+        self.titles.append(title)
+    
+    def __len__(self):
+        return self._count
+    
+    @property
+    def buffer(self):
+        """uint8 array of all residues, back to back."""
+        return self._residues[:self._offsets[self._count]]
+    
+    @property
+    def offsets(self):
+        """int64 array of len(self) + 1 start offsets into buffer."""
+        return self._offsets[:self._count + 1]
+    
+    @property
+    def lengths(self):
+        """int64 array of sequence lengths."""
+        return np.diff(self.offsets)
+    
+    def residues(self, index):
+        """Return protein index's residues as a zero-copy memoryview of the buffer."""
+        if not -self._count <= index < self._count:
+            raise IndexError("ProteinSet index out of range")
+        index %= self._count
+        return memoryview(self._residues[self._offsets[index]:self._offsets[index + 1]])
+    
+    def sequence(self, index):
+        """Return protein index's sequence as a str."""
+        return self.residues(index).tobytes().decode("ascii")
+    
+    def __getitem__(self, index):
+        return ProteinRecord(self.accessions[index], self.sequence(index), self.titles[index])
+    
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+    
+    def nbytes(self):
+        """Return the bytes used by residues and offsets (excluding spare capacity)."""
+        return int(self.offsets[-1]) + 8 * (self._count + 1)
+    
+    def packed(self):
+        """
+        Return the residues packed to 5 bits each.
+        
+        Returns:
+            tuple: (packed uint8 array, offsets array); restore with
+                ProteinSet.from_packed
+        """
+        return pack_residues(self.buffer), self.offsets.copy()
+    
+    @classmethod
+    def from_packed(cls, accessions, titles, packed, offsets):
+        """
+        Rebuild a set from packed residues.
+        
+        Args:
+            accessions (list): Accessions
+            titles (list): Titles
+            packed (numpy.ndarray): Residues from packed()
+            offsets (numpy.ndarray): Offsets from packed()
+        """
+        proteins = cls(capacity=0)
+        proteins.accessions = list(accessions)
+        proteins.titles = list(titles)
+        proteins._residues = unpack_residues(packed, int(offsets[-1]))
+        proteins._offsets = np.array(offsets, dtype=np.int64)
+        proteins._count = len(offsets) - 1
+        return proteins
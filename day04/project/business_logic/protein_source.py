@@ -0,0 +1,124 @@
+"""
+Protein Source Module
+
+The interface shared by everything that can supply proteins to
+ProteinComparator: ProteinFetcher (NCBI), LocalProteinSource (an indexed
+FASTA file) and FallbackProteinSource, which asks one source first and a
+second one for whatever the first lacks.
+
+A source implements search_with_sequences and iter_sequences; the other
+lookups are built on those two unless the source has a faster way.
+"""
+
+from abc import ABC, abstractmethod
+
+from .fasta_parser import normalize_accession
+
+# Values accepted for config.PROTEIN_SOURCE
+SOURCES = ("ncbi", "local", "local+ncbi")
+
+
+class ProteinSource(ABC):
+    """Base class for protein sources."""
+    
+    @abstractmethod
+    def search_with_sequences(self, protein_name, organism, max_results=5):
+        """
+        Search for a protein in one organism.
+        
+        Args:
+            protein_name (str): Name of the protein
+            organism (str): Scientific organism name
+            max_results (int): Maximum number of results to return
+        
+        Returns:
+            list: ProteinRecords, best matches first
+        """
+    
+    @abstractmethod
+    def iter_sequences(self, accession_ids):
+        """
+        Stream sequences for many accessions.
+        
+        Args:
+            accession_ids (list): Protein accessions
+        
+        Yields:
+            tuple: (accession without version, sequence) for the
+                accessions the source has
+        """
+    
+    def fetch_sequence(self, accession_id):
+        """Return the sequence of one accession, or None if the source lacks it."""
+        for _, sequence in self.iter_sequences([accession_id]):
+            return sequence
+        return None
+    
+    def fetch_sequences(self, accession_ids):
+        """Return a dict of accession (without version) -> sequence."""
+        return dict(self.iter_sequences(accession_ids))
+    
+    def get_proteins(self, protein_names, organisms):
+        """
+        Find several proteins in several organisms.
+        
+        Returns:
+            dict: Protein name -> {organism: ProteinRecord or None}
+        """
+        results = {}
+        for name in protein_names:
+            results[name] = {}
+            for organism in organisms:
+                hits = self.search_with_sequences(name, organism, max_results=1)
+                results[name][organism] = hits[0] if hits and hits[0]['sequence'] else None
+        return results
+    
+    def get_protein_in_organisms(self, protein_name, organisms):
+        """Return organism -> ProteinRecord or None for one protein."""
+        return self.get_proteins([protein_name], organisms)[protein_name]
+
+
+class FallbackProteinSource(ProteinSource):
+    """Ask a primary source first and a fallback source for what it lacks."""
+    
+    def __init__(self, primary, fallback):
+        """
+        Args:
+            primary (ProteinSource): Source asked first (e.g. a local file)
+            fallback (ProteinSource): Source for misses (e.g. NCBI)
+        """
+        self.primary = primary
+        self.fallback = fallback
+    
+    def search_with_sequences(self, protein_name, organism, max_results=5):
+        hits = self.primary.search_with_sequences(protein_name, organism, max_results)
+        return hits or self.fallback.search_with_sequences(protein_name, organism, max_results)
+    
+    def iter_sequences(self, accession_ids):
+        accession_ids = list(accession_ids)  # iterated twice; a generator would be exhausted
+        returned = set()
+        for accession, sequence in self.primary.iter_sequences(accession_ids):
+            returned.add(accession)
+            yield accession, sequence
+        missing = [accession for accession in accession_ids if normalize_accession(accession) not in returned]
+        if missing:
+            yield from self.fallback.iter_sequences(missing)
+    
+    def fetch_sequence(self, accession_id):
+        sequence = self.primary.fetch_sequence(accession_id)
+        return sequence if sequence is not None else self.fallback.fetch_sequence(accession_id)
+    
+    def get_proteins(self, protein_names, organisms):
+        protein_names = list(protein_names)
+        results = self.primary.get_proteins(protein_names, organisms)
+        # One batched fallback call per set of missing organisms (usually just one),
+        # so the fallback's own concurrency sees every miss at once
+        misses = {}
+        for name in protein_names:
+            missing = tuple(organism for organism in organisms if results[name][organism] is None)
+            if missing:
+                misses.setdefault(missing, []).append(name)
+        for missing, names in misses.items():
+            for name, found in self.fallback.get_proteins(names, list(missing)).items():
+                results[name].update(found)
+        return results
@@ -0,0 +1,222 @@
+"""
+Rate Limiter Module
+
+Token-bucket limiters for NCBI E-utilities requests. NCBI allows 3 requests
+per second per host, or 10 with an API key.
+
+TokenBucket is shared by the threads of one process. SharedTokenBucket
+keeps the bucket state in a small file locked with flock, so every process
+on the host (several GUI windows, a worker pool) draws from the same
+bucket. The file also records the bucket's rate: a process configured
+with another rate is refused while the bucket is in use, instead of
+refilling the shared tokens at its own rate. Both record how long callers
+had to wait.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+NCBI_RATE = 3.0           # requests per second without an API key
+NCBI_API_KEY_RATE = 10.0  # requests per second with an API key
+
+# Bucket state file contents: tokens, monotonic time of the last update, rate
+_STATE = struct.Struct("<ddd")
+
+
+def ncbi_rate(delay=None, api_key=None):
+    """
+    Choose the allowed request rate.
+    
+    Args:
+        delay (float): Minimum delay between requests in seconds (None or
+            0 for NCBI's maximum)
+        api_key (str): NCBI API key, which raises the limit to 10/s
+    
+    Returns:
+        float: Requests per second
+    """
+    limit = NCBI_API_KEY_RATE if api_key else NCBI_RATE
+    if delay and not api_key:
+        return min(limit, 1.0 / delay)
+    return limit
+
+
+class TokenBucket:
+    """Thread-safe token bucket; each request takes one token."""
+    
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket size (requests allowed back to back)
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def _refill(self, tokens, updated, now):
+        """Return the token count after refilling from updated to now."""
+        if now < updated:  # clock restarted (e.g. state from before a reboot)
+            return float(self.burst)
+        return min(self.burst, tokens + (now - updated) * self.rate)
+    
+    def _take(self):
+        """Take a token (possibly going into debt) and return the wait in seconds."""
+        now = time.monotonic()
+        self._tokens = self._refill(self._tokens, self._updated, now) - 1
+        self._updated = now
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def acquire(self):
+        """
+        Take a token, sleeping until one is available.
+        
+        A caller that has to wait reserves its token first, so waiting
+        callers are served in order and never oversubscribe the rate.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            wait = self._take()
+            self.requests += 1
+            if wait:
+                self.waits += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+    
+    def metrics(self):
+        """
+        Return wait-time figures for this process.
+        
+        Returns:
+            dict: 'rate', 'requests', 'waits' (requests that had to wait),
+                'total_wait', 'mean_wait' and 'max_wait' in seconds
+        """
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'requests': self.requests,
+                'waits': self.waits,
+                'total_wait': self.total_wait,
+                'mean_wait': self.total_wait / self.requests if self.requests else 0.0,
+                'max_wait': self.max_wait
+            }
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket shared by all processes on the host through a locked state file."""
+    
+    def __init__(self, rate, burst=1, path=None):
+        """
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket size (requests allowed back to back)
+            path (str): State file; processes using the same file share
+                the bucket (default: one file per rate in the temp folder)
+        """
+        super().__init__(rate, burst)
+        self.path = path or os.path.join(tempfile.gettempdir(), f"ncbi_rate_{rate:g}.bucket")
+        self._handle = None
+        self._pid = None
+    
+    def _file(self):
+        """Return this process's handle on the state file."""
+        if self._handle is None or self._pid != os.getpid():
+            self._handle = open(self.path, "a+b")
+            self._pid = os.getpid()
+        return self._handle
+    
+    def _take(self):
+        """
+        Take a token from the shared state under an exclusive file lock.
+        
+        Raises:
+            ValueError: If the bucket is in use by a process with another rate
+        """
+        handle = self._file()
+        _lock_file(handle)
+        try:
+            handle.seek(0)
+            data = handle.read(_STATE.size)
+            now = time.monotonic()
+            tokens = float(self.burst)
+            if len(data) == _STATE.size:
+                stored, updated, rate = _STATE.unpack(data)
+                if rate == self.rate:
+                    tokens = self._refill(stored, updated, now)
+                elif updated <= now and stored + (now - updated) * rate < self.burst:
+                    # Not yet refilled, so its owner is still sending requests
+                    raise ValueError(f"Rate limiter {self.path} is in use at {rate:g} requests/s, "
+                                     f"not {self.rate:g}")
+            tokens -= 1
+            handle.seek(0)
+            handle.truncate()
+            handle.write(_STATE.pack(tokens, now, self.rate))
+            handle.flush()
+        finally:
+            _unlock_file(handle)
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+
+def _lock_file(handle):
+    """Block until this process holds an exclusive lock on the file."""
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(handle):
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def shared_limiter(delay=None, api_key=None, path=None):
+    """
+    Create the host-wide limiter for a rate tier.
+    
+    Without an API key the tier follows delay (e.g.
+    config.NCBI_RATE_LIMIT_DELAY), capped at 3 requests/s. With a key the
+    limit is 10 requests/s, and processes using the same key share a bucket.
+    Processes sharing a bucket must use the same rate; the bucket refuses
+    a different one until it has been idle long enough to refill.
+    
+    Args:
+        delay (float): Minimum delay between requests in seconds
+        api_key (str): NCBI API key
+        path (str): Optional state file (overrides the tier's default)
+    
+    Returns:
+        SharedTokenBucket: Limiter for ProteinFetcher
+    """
+    rate = ncbi_rate(delay, api_key)
+    if path is None:
+        tier = hashlib.blake2b(api_key.encode(), digest_size=6).hexdigest() if api_key else "host"
+        path = os.path.join(tempfile.gettempdir(), f"ncbi_rate_{tier}.bucket")
+    return SharedTokenBucket(rate, path=path)
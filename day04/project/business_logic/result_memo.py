@@ -0,0 +1,124 @@
+"""
+Result Memo Module
+
+Content-addressed memo for comparison results and sequence statistics.
+Keys are BLAKE2 digests of the residues plus the parameters that affect
+the result, so the same pair compared again (from another search, or with
+a different title) is answered without recomputing.
+
+Entries live in a bounded in-memory LRU. With a ProteinCache the memo is
+also persisted, so results survive restarts and are shared between
+processes. Callers get their own copy of a result, so changing it does not
+change what later lookups return.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def sequence_digest(sequence):
+    """Return the BLAKE2 digest (hex) identifying a sequence's residues (str or bytes-like)."""
+    residues = sequence.encode("ascii", "replace") if isinstance(sequence, str) else sequence
+    return hashlib.blake2b(residues, digest_size=16).hexdigest()
+
+
+def memo_key(kind, *parts):
+    """
+    Build a memo key from a result kind and the values it depends on.
+    
+    Args:
+        kind (str): Result kind (e.g. "compare", "stats")
+        *parts: Sequence digests and parameters, in a fixed order
+    
+    Returns:
+        str: Key such as "memo:compare:<digest>"
+    """
+    payload = "\x1f".join(str(part) for part in parts)
+    digest = hashlib.blake2b(payload.encode(), digest_size=16, person=kind.encode()[:16]).hexdigest()
+    return f"memo:{kind}:{digest}"
+
+
+class ResultMemo:
+    """Bounded, thread-safe LRU of computed results, optionally backed by a ProteinCache."""
+    
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache=None, ttl=None):
+        """
+        Args:
+            max_entries (int): Results kept in memory
+            cache (ProteinCache): Optional persistent store
+            ttl (float): Seconds persisted results stay valid (default:
+                the cache's ttl)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.cache = cache
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, compute):
+        """
+        Return the memoized value for key, computing and storing it on a miss.
+        
+        Args:
+            key (str): Key from memo_key
+            compute: Function without arguments returning a JSON-serializable
+                value
+        
+        Returns:
+            The stored or newly computed value (a copy the caller may change)
+        """
+        with self._lock:
+            found = key in self._entries
+            if found:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = self._entries[key]
+        if found:
+            return copy.deepcopy(value)  # stored values are never changed
+        
+        found, value = self.cache.lookup(key) if self.cache else (False, None)
+        if found:
+            with self._lock:
+                self.hits += 1
+        else:
+            value = compute()
+            with self._lock:
+                self.misses += 1
+            if self.cache:
+                self.cache.store(key, value, ttl=self.ttl)
+        
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Forget the in-memory entries (persisted ones are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """
+        Return memo figures.
+        
+        Returns:
+            dict: 'entries' in memory, 'max_entries', 'hits' and 'misses'
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
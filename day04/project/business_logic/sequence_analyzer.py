@@ -1,30 +1,65 @@
 """
 Sequence Analyzer Module
 
-Analyzes and compares protein sequences using string matching algorithms.
-Calculates identity percentages and similarity scores.
+Analyzes and compares protein sequences using string matching algorithms
+or a real pairwise alignment (see alignment.py). Calculates identity
+percentages and similarity scores.
 """
 
 from difflib import SequenceMatcher
 
+import numpy as np
+
+from .alignment import DEFAULT_GAP_EXTEND, DEFAULT_GAP_OPEN, DEFAULT_MATRIX, align
+from .composition import DEFAULT_ALPHABET, composition_from_buffer, composition_matrix, statistics_view
+from .lcs import lcs_identity, lcs_length
+from .protein_record import ProteinSet
+from .result_memo import memo_key, sequence_digest
+
+# Comparison methods: difflib string matching, exact longest common
+# subsequence, or global/local alignment
+METHODS = ("difflib", "lcs", "global", "local")
+
+
+def _text(sequence):
+    """Return a sequence given as str, bytes or memoryview (ProteinSet.residues) as str."""
+    return sequence if isinstance(sequence, str) else bytes(sequence).decode("ascii")
+
 
 class SequenceAnalyzer:
     """Analyzes protein sequences and performs comparisons."""
     
     @staticmethod
-    def calculate_identity_percentage(seq1, seq2):
+    def calculate_identity_percentage(seq1, seq2, method="difflib"):
         """
         Calculate the percentage of identical positions between two sequences.
         
+        Backends:
+            "difflib": residues in SequenceMatcher's matching blocks (fast,
+                heuristic; long sequences lose matches to its junk rule)
+            "lcs": residues in the longest common subsequence, computed
+                exactly with a bit-parallel kernel (see lcs.py)
+            "global"/"local": identical pairs per column of an alignment
+        
         Args:
             seq1 (str): First protein sequence
             seq2 (str): Second protein sequence
+            method (str): "difflib", "lcs", "global" or "local"
         
         Returns:
             float: Identity percentage (0-100), rounded to 2 decimal places
+        
+        Raises:
+            ValueError: If the method is unknown
         """
+        if method not in METHODS:
+            raise ValueError(f"Unknown comparison method: {method}")
         if not seq1 or not seq2:
             return 0.0
+        if method == "lcs":
+            return lcs_identity(seq1, seq2)
+        if method != "difflib":
+            return align(seq1, seq2, method)['identity_percentage']
         
         matcher = SequenceMatcher(None, seq1, seq2)
         matching_chars = sum(block.size for block in matcher.get_matching_blocks())
@@ -52,52 +87,148 @@ class SequenceAnalyzer:
         return round(matcher.ratio(), 4)
     
     @staticmethod
-    def get_sequence_statistics(sequence):
+    def get_sequence_statistics(sequence, alphabet=DEFAULT_ALPHABET):
         """
         Generate amino acid composition statistics for a sequence.
         
         Args:
             sequence (str): Protein sequence
+            alphabet (str): Residues counted in one vectorized pass (others
+                are counted individually; the result is the same)
+        
+        Returns:
+            dict: Statistics including length and composition (residues in
+                order of first appearance)
+        """
+        return statistics_view(sequence, alphabet=alphabet)
+    
+    @staticmethod
+    def get_batch_statistics(sequences, alphabet=DEFAULT_ALPHABET):
+        """
+        Amino acid composition of many sequences at once.
+        
+        A ProteinSet is counted straight from its residue buffer, without
+        building a string per protein.
+        
+        Args:
+            sequences (list or ProteinSet): Protein sequences
+            alphabet (str): Residue letters, one column each
         
         Returns:
-            dict: Statistics including length and composition
+            dict: 'alphabet' (column labels: the alphabet's letters, then
+                'other'), 'lengths' (n), 'counts' (n x columns int64) and
+                'percentages' (n x columns float64)
+        """
+        if isinstance(sequences, ProteinSet):
+            counts = composition_from_buffer(sequences.buffer, sequences.offsets, alphabet)
+        else:
+            counts = composition_matrix(sequences, alphabet)
+        lengths = counts.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentages = np.where(lengths[:, None] > 0, 100.0 * counts / lengths[:, None], 0.0)
+        return {
+            'alphabet': list(alphabet) + ['other'],
+            'lengths': lengths,
+            'counts': counts,
+            'percentages': percentages
+        }
+    
+    @staticmethod
+    def align_sequences(seq1, seq2, mode="global", matrix=DEFAULT_MATRIX,
+                        gap_open=DEFAULT_GAP_OPEN, gap_extend=DEFAULT_GAP_EXTEND):
         """
-        if not sequence:
-            return {'length': 0, 'composition': {}}
+        Align two sequences with a substitution matrix and affine gaps.
+        
+        Args:
+            seq1 (str): First protein sequence
+            seq2 (str): Second protein sequence
+            mode (str): "global" (Needleman-Wunsch) or "local" (Smith-Waterman)
+            matrix (str): "BLOSUM62" or "PAM250"
+            gap_open (int): Penalty for the first position of a gap
+            gap_extend (int): Penalty for each further gap position
         
-        composition = {}
-        for aa in sequence:
-            if aa not in composition:
-                composition[aa] = {'count': 0, 'percentage': 0.0}
-            composition[aa]['count'] += 1
+        Returns:
+            dict: Alignment score, identities, positives, gaps, gap
+                openings, length and percentages (see alignment.align)
+        """
+        return align(seq1, seq2, mode, matrix, gap_open, gap_extend)
+    
+    @staticmethod
+    def measure(seq1, seq2, method="difflib", matrix=DEFAULT_MATRIX,
+                gap_open=DEFAULT_GAP_OPEN, gap_extend=DEFAULT_GAP_EXTEND):
+        """
+        Compute identity and similarity for two non-empty sequences in one pass.
         
-        seq_length = len(sequence)
-        for aa in composition:
-            composition[aa]['percentage'] = round(
-                (composition[aa]['count'] / seq_length) * 100, 2
-            )
+        Args:
+            seq1 (str): First protein sequence
+            seq2 (str): Second protein sequence
+            method (str): "difflib", "lcs", "global" or "local"
+            matrix (str): Substitution matrix for alignment methods
+            gap_open (int): Gap opening penalty for alignment methods
+            gap_extend (int): Gap extension penalty for alignment methods
         
+        Returns:
+            dict: 'identity_percentage', 'similarity_ratio', and
+                'alignment' details for alignment methods
+        """
+        if method == "difflib":
+            # One matcher: its ratio is 2 * matches / (len1 + len2)
+            common = sum(block.size for block in SequenceMatcher(None, seq1, seq2).get_matching_blocks())
+        elif method == "lcs":
+            common = lcs_length(seq1, seq2)
+        else:
+            alignment = align(seq1, seq2, method, matrix, gap_open, gap_extend)
+            return {
+                'identity_percentage': alignment['identity_percentage'],
+                'similarity_ratio': round(alignment['similarity_percentage'] / 100, 4),
+                'alignment': alignment
+            }
         return {
-            'length': seq_length,
-            'composition': composition
+            'identity_percentage': round(100.0 * common / max(len(seq1), len(seq2)), 2),
+            'similarity_ratio': round(2.0 * common / (len(seq1) + len(seq2)), 4)
         }
     
     @staticmethod
-    def compare_sequences(seq1_data, seq2_data):
+    def compare_sequences(seq1_data, seq2_data, method="difflib", matrix=DEFAULT_MATRIX,
+                          gap_open=DEFAULT_GAP_OPEN, gap_extend=DEFAULT_GAP_EXTEND, memo=None,
+                          alphabet=DEFAULT_ALPHABET):
         """
         Comprehensive comparison of two protein sequences.
         
+        All metrics come from a single pass over the pair. With a memo,
+        the metrics and each sequence's statistics are looked up by a
+        digest of the residues (and the scoring parameters) first, so a
+        pair compared before is not recomputed.
+        
+        With method "global" or "local" the identity and similarity come
+        from an actual alignment: identity is identical pairs and
+        similarity is positive-scoring pairs, both per alignment column.
+        With "lcs" identity is the longest common subsequence relative to
+        the longer sequence and similarity is 2 * LCS / (len1 + len2),
+        the exact counterpart of difflib's ratio.
+        
         Args:
-            seq1_data (dict): Dictionary with keys 'sequence' and 'title'
-            seq2_data (dict): Dictionary with keys 'sequence' and 'title'
+            seq1_data (dict): Dictionary (or ProteinRecord) with keys
+                'sequence' and 'title'
+            seq2_data (dict): Dictionary (or ProteinRecord) with keys
+                'sequence' and 'title'
+            method (str): "difflib", "lcs", "global" or "local"
+            matrix (str): Substitution matrix for alignment methods
+            gap_open (int): Gap opening penalty for alignment methods
+            gap_extend (int): Gap extension penalty for alignment methods
+            memo (ResultMemo): Optional memo for metrics and statistics
+            alphabet (str): Residue alphabet for the composition statistics
         
         Returns:
-            dict: Comparison results including identity, similarity, and stats
+            dict: Comparison results including identity, similarity, and
+                stats (plus 'alignment' details for alignment methods)
         """
         try:
-            seq1 = seq1_data.get('sequence', '')
-            seq2 = seq2_data.get('sequence', '')
+            seq1 = _text(seq1_data.get('sequence', ''))
+            seq2 = _text(seq2_data.get('sequence', ''))
             
+            if method not in METHODS:
+                raise ValueError(f"Unknown comparison method: {method}")
             if not seq1 or not seq2:
                 return {
                     'error': 'One or both sequences are empty',
@@ -105,15 +236,26 @@ class SequenceAnalyzer:
                     'similarity_ratio': 0.0
                 }
             
-            identity = SequenceAnalyzer.calculate_identity_percentage(seq1, seq2)
-            similarity = SequenceAnalyzer.calculate_similarity_score(seq1, seq2)
+            def metrics():
+                return SequenceAnalyzer.measure(seq1, seq2, method, matrix, gap_open, gap_extend)
             
-            seq1_stats = SequenceAnalyzer.get_sequence_statistics(seq1)
-            seq2_stats = SequenceAnalyzer.get_sequence_statistics(seq2)
+            if memo:
+                digest1, digest2 = sequence_digest(seq1), sequence_digest(seq2)
+                params = (matrix.upper(), gap_open, gap_extend) if method in ("global", "local") else ()
+                measured = memo.get(memo_key("compare", method, digest1, digest2, *params), metrics)
+                seq1_stats = memo.get(memo_key("stats", digest1),
+                                      lambda: SequenceAnalyzer.get_sequence_statistics(seq1, alphabet))
+                seq2_stats = memo.get(memo_key("stats", digest2),
+                                      lambda: SequenceAnalyzer.get_sequence_statistics(seq2, alphabet))
+            else:
+                measured = metrics()
+                seq1_stats = SequenceAnalyzer.get_sequence_statistics(seq1, alphabet)
+                seq2_stats = SequenceAnalyzer.get_sequence_statistics(seq2, alphabet)
             
-            return {
-                'identity_percentage': identity,
-                'similarity_ratio': similarity,
+            results = {
+                'identity_percentage': measured['identity_percentage'],
+                'similarity_ratio': measured['similarity_ratio'],
+                'method': method,
                 'seq1': {
                     'title': seq1_data.get('title', 'Sequence 1'),
                     'length': len(seq1),
@@ -125,6 +267,9 @@ class SequenceAnalyzer:
                     'stats': seq2_stats
                 }
             }
+            if 'alignment' in measured:
+                results['alignment'] = measured['alignment']
+            return results
         
         except Exception as e:
             return {
@@ -4,11 +4,27 @@ Configuration Module
 Central configuration for NCBI settings, GUI theme, and organisms.
 """
 
+import os
+
 # NCBI Settings
 NCBI_EMAIL = "student@python-course.com"
 NCBI_RATE_LIMIT_DELAY = 0.4  # seconds between requests
 NCBI_RETMAX = 5  # maximum results per search
 NCBI_TIMEOUT = 30  # connection timeout in seconds
+NCBI_BASE_URL = os.environ.get("NCBI_BASE_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/")
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY") or None  # raises the limit from 3 to 10 requests/s
+
+# NCBI lookup cache (shared by all processes on this machine)
+NCBI_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "protein_comparator", "ncbi_cache.sqlite3")
+NCBI_CACHE_MAX_BYTES = 256 * 1024 * 1024  # evict least recently used entries above this
+NCBI_CACHE_TTL = 7 * 24 * 3600  # seconds a found protein or search stays cached
+NCBI_CACHE_NEGATIVE_TTL = 24 * 3600  # seconds a "not found" result stays cached
+
+# Where proteins come from: "ncbi", "local" (LOCAL_FASTA_PATH only) or
+# "local+ncbi" (the local file first, NCBI for anything it lacks)
+PROTEIN_SOURCE = os.environ.get("PROTEIN_SOURCE", "ncbi")
+LOCAL_FASTA_PATH = os.environ.get("LOCAL_FASTA_PATH")  # RefSeq/UniProt FASTA dump
+LOCAL_FASTA_INDEX_PATH = None  # None keeps the index next to the FASTA file (<file>.idx)
 
 # Organisms to compare
 PRIMARY_ORGANISM = "Homo sapiens"
@@ -43,6 +59,23 @@ GUI_FONT_SIZE = {
     "mono": ("Courier", 9)
 }
 
+# Sequence comparison: "global" (Needleman-Wunsch), "local" (Smith-Waterman),
+# "lcs" (exact longest common subsequence) or "difflib" (string matching,
+# fast but not an alignment). The alignments are opt-in: they are quadratic
+# (about 1 s at 2000 residues, minutes for titin-sized proteins)
+COMPARISON_METHOD = "difflib"
+SUBSTITUTION_MATRIX = "BLOSUM62"  # or "PAM250"
+GAP_OPEN_PENALTY = 11  # first position of a gap
+GAP_EXTEND_PENALTY = 1  # each further position
+
+# All-vs-all comparison matrices (ProteinComparator.compare_all)
+MATRIX_METHOD = "lcs"  # linear-time per pair; "global"/"local" are quadratic per pair
+MATRIX_WORKERS = None  # processes; None uses every CPU
+
+# Comparison results memoized by sequence content
+COMPARISON_MEMO_SIZE = 256  # results kept in memory
+COMPARISON_MEMO_PERSIST = True  # also store them in the NCBI lookup cache
+
 # Comparison Thresholds
 IDENTITY_THRESHOLD_HIGH = 80.0      # >80% = high similarity
 IDENTITY_THRESHOLD_MODERATE = 50.0  # 50-80% = moderate similarity
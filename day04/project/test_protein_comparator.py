@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""Test script to validate Protein Comparator business logic"""
+
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from business_logic.alignment import align
+from business_logic.composition import composition_matrix
+from business_logic.fasta_parser import parse_fasta
+from business_logic.lcs import lcs_length
+from business_logic.local_protein_source import LocalProteinSource
+from business_logic.ncbi_protein_fetcher import ProteinFetcher
+from business_logic.pairwise_matrix import all_vs_all, condensed_index, pair_at, pair_count
+from business_logic.protein_cache import ProteinCache
+from business_logic.protein_record import ProteinRecord, ProteinSet, pack_residues, unpack_residues
+from business_logic.protein_source import FallbackProteinSource, ProteinSource
+from business_logic.rate_limiter import SharedTokenBucket, TokenBucket
+from business_logic.result_memo import ResultMemo, memo_key
+from business_logic.sequence_analyzer import SequenceAnalyzer
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+def random_protein(rng, length):
+    """Return a random protein sequence"""
+    return "".join(rng.choice(AMINO_ACIDS) for _ in range(length))
+
+class FakeResponse:
+    """Streaming response stand-in returned by FakeTransport"""
+    
+    def __init__(self, body):
+        self.raw = io.BytesIO(body)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def iter_content(self, chunk_size):
+        return iter(lambda: self.raw.read(chunk_size), b"")
+
+class FakeTransport:
+    """E-utilities stand-in serving FASTA records by versioned accession"""
+    
+    def __init__(self, records):
+        self.records = records
+        self.requests = 0
+    
+    def open(self, function, **params):
+        self.requests += 1
+        body = "".join(
+            f">{accession} {title}\n{sequence}\n"
+            for accession, (title, sequence) in self.records.items()
+            if accession in params["id"].split(",") or accession.split(".")[0] in params["id"].split(",")
+        )
+        return FakeResponse(body.encode())
+
+class SearchTransport:
+    """E-utilities stand-in answering esearch and efetch with a delay, one organism failing"""
+    
+    def __init__(self, failing, delay=0.02):
+        self.failing = failing
+        self.delay = delay
+        self.times = []
+        self._lock = threading.Lock()
+    
+    def open(self, function, **params):
+        with self._lock:
+            self.times.append(time.monotonic())
+        time.sleep(self.delay)
+        if function == "esearch":
+            organism = params["term"].split(" AND ")[1][:-len("[Organism]")]
+            if organism == self.failing:
+                raise ConnectionError(f"no reply for {organism}")
+            body = ('<?xml version="1.0" ?>\n<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" '
+                    '"https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">\n'
+                    f'<eSearchResult><Count>1</Count><RetMax>1</RetMax><RetStart>0</RetStart>'
+                    f'<IdList><Id>{organism.replace(" ", "_")}.1</Id></IdList></eSearchResult>')
+        else:
+            body = f">{params['id']} protein\nMKV{params['id'].split('.')[0].upper()[:3]}\n"
+        return FakeResponse(body.encode())
+
+def test_versioned_accession_cache():
+    """Test that a versioned accession is cached as found, not as missing"""
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            cache = ProteinCache(os.path.join(folder, "cache.sqlite3"))
+            transport = FakeTransport({"NP_000509.1": ("hemoglobin subunit beta", "MVHLTPEEKSAVTALWGK")})
+            fetcher = ProteinFetcher(cache=cache, limiter=TokenBucket(1000), transport=transport)
+            
+            first = fetcher.fetch_sequences(["NP_000509.1"])
+            second = fetcher.fetch_sequences(["NP_000509.1"])
+            assert first == second == {"NP_000509": "MVHLTPEEKSAVTALWGK"}, f"unexpected {first}, {second}"
+            assert fetcher.fetch_sequence("NP_000509.1") == "MVHLTPEEKSAVTALWGK", "cached as not found"
+            assert transport.requests == 1, f"expected 1 request, got {transport.requests}"
+            cache.close()
+        print("✓ PASS: Versioned accession cached and answered from the cache")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Versioned accession cache failed - {e}")
+        return False
+
+def test_cache_threads_and_sizes():
+    """Test cache counters under threads, close() and sizes in bytes"""
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            cache = ProteinCache(os.path.join(folder, "cache.sqlite3"))
+            cache.store("present", True)
+            
+            def look_up():
+                for i in range(200):
+                    cache.lookup("present" if i % 2 else "absent")
+            
+            threads = [threading.Thread(target=look_up) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = cache.stats()
+            assert (stats['hits'], stats['misses']) == (800, 800), f"counted {stats['hits']}, {stats['misses']}"
+            assert len(cache._connections) == 9, f"{len(cache._connections)} connections"
+            
+            cache.close()
+            assert cache._connections == [], "connections left open"
+            assert cache.lookup("present") == (True, True), "cache unusable after close()"
+            
+            cache.clear()
+            cache.store("é", "Ωμέγα")  # the key is 2 UTF-8 bytes, the escaped JSON value 32
+            assert cache.stats()['bytes'] == 2 + 32, f"size {cache.stats()['bytes']}"
+            cache.close()
+        print("✓ PASS: Cache counts every thread's lookups, closes connections, sizes in bytes")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Cache threads and sizes failed - {e}")
+        return False
+
+class DictSource(ProteinSource):
+    """Protein source serving sequences from a dict"""
+    
+    def __init__(self, sequences):
+        self.sequences = sequences
+    
+    def search_with_sequences(self, protein_name, organism, max_results=5):
+        return []
+    
+    def iter_sequences(self, accession_ids):
+        for accession in accession_ids:
+            if accession in self.sequences:
+                yield accession, self.sequences[accession]
+
+def test_fallback_source_generator():
+    """Test that the fallback source is asked for misses given a generator"""
+    try:
+        try:
+            ProteinSource()
+            raise AssertionError("abstract ProteinSource was instantiated")
+        except TypeError:
+            pass
+        source = FallbackProteinSource(DictSource({"P1": "MKV"}), DictSource({"P2": "MAL", "P3": "MGG"}))
+        found = source.fetch_sequences(accession for accession in ["P1", "P2", "P3", "P4"])
+        assert found == {"P1": "MKV", "P2": "MAL", "P3": "MGG"}, f"unexpected {found}"
+        print("✓ PASS: Fallback source answers misses for a generator of accessions")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Fallback source failed - {e}")
+        return False
+
+class TableSource(ProteinSource):
+    """Protein source answering get_proteins from a (name, organism) table and logging calls"""
+    
+    def __init__(self, table):
+        self.table = table
+        self.calls = []
+    
+    def search_with_sequences(self, protein_name, organism, max_results=5):
+        return []
+    
+    def iter_sequences(self, accession_ids):
+        return iter(())
+    
+    def get_proteins(self, protein_names, organisms):
+        self.calls.append((list(protein_names), list(organisms)))
+        return {name: {organism: self.table.get((name, organism)) for organism in organisms}
+                for name in protein_names}
+
+def test_fallback_get_proteins_batched():
+    """Test that the fallback source gets the misses in batched get_proteins calls"""
+    try:
+        record = lambda accession: ProteinRecord(accession, "MKV", accession)
+        primary = TableSource({("A", "human"): record("A1"), ("B", "human"): record("B1")})
+        fallback = TableSource({(name, organism): record(name + organism[0])
+                                for name in "ABC" for organism in ("human", "mouse")})
+        results = FallbackProteinSource(primary, fallback).get_proteins(iter("ABC"), ["human", "mouse"])
+        
+        assert fallback.calls == [(["A", "B"], ["mouse"]), (["C"], ["human", "mouse"])], \
+            f"fallback calls {fallback.calls}"
+        assert {name: {organism: hit['accession'] for organism, hit in found.items()}
+                for name, found in results.items()} == {
+            "A": {"human": "A1", "mouse": "Am"},
+            "B": {"human": "B1", "mouse": "Bm"},
+            "C": {"human": "Ch", "mouse": "Cm"}}, f"unexpected {results}"
+        print("✓ PASS: Fallback source is asked for the misses only, in batches")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Fallback batched lookups failed - {e}")
+        return False
+
+def test_parse_fasta_chunk_boundaries():
+    """Test that records parse the same however the input is chunked"""
+    try:
+        rng = random.Random(1)
+        records = [(f"NP_{i:06d}", random_protein(rng, rng.randint(0, 300))) for i in range(20)]
+        text = "".join(f">{accession}.2 protein {i}\r\n"
+                       + "\n".join(sequence[j:j + 60] for j in range(0, len(sequence), 60)) + "\n"
+                       for i, (accession, sequence) in enumerate(records)).encode()
+        for size in (1, 2, 7, 61, 1000, len(text)):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            parsed = [(accession, sequence) for accession, _, sequence in parse_fasta(chunks)]
+            assert parsed == records, f"records differ with {size}-byte chunks"
+        print(f"✓ PASS: {len(records)} records parsed identically for every chunk size")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: FASTA chunk boundaries failed - {e}")
+        return False
+
+def test_alignment_scores():
+    """Test that alignment scores match Biopython's PairwiseAligner"""
+    try:
+        from Bio.Align import PairwiseAligner, substitution_matrices
+        rng = random.Random(2)
+        aligner = PairwiseAligner()
+        aligner.substitution_matrix = substitution_matrices.load("BLOSUM62")
+        aligner.open_gap_score = -11
+        aligner.extend_gap_score = -1
+        pairs = 0
+        for _ in range(10):
+            seq1 = random_protein(rng, rng.randint(1, 120))
+            seq2 = seq1[rng.randint(0, 20):] + random_protein(rng, rng.randint(0, 20))
+            for mode in ("global", "local"):
+                aligner.mode = mode
+                result = align(seq1, seq2, mode=mode)
+                assert result['score'] == aligner.score(seq1, seq2), f"{mode} score differs"
+                pairs += 1
+        print(f"✓ PASS: {pairs} global/local scores match Biopython")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Alignment scores failed - {e}")
+        return False
+
+def test_lcs_length():
+    """Test the bit-parallel LCS against the dynamic programming definition"""
+    try:
+        rng = random.Random(3)
+        for _ in range(50):
+            seq1 = "".join(rng.choice("ACDE") for _ in range(rng.randint(0, 40)))
+            seq2 = "".join(rng.choice("ACDE") for _ in range(rng.randint(0, 40)))
+            row = [0] * (len(seq2) + 1)
+            for a in seq1:
+                previous = row[:]
+                for j, b in enumerate(seq2, start=1):
+                    row[j] = previous[j - 1] + 1 if a == b else max(previous[j], row[j - 1])
+            assert lcs_length(seq1, seq2) == row[-1], f"LCS of {seq1!r} and {seq2!r}"
+        print("✓ PASS: LCS lengths match dynamic programming for 50 pairs")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: LCS length failed - {e}")
+        return False
+
+def test_pair_index_and_checkpoint_resume():
+    """Test condensed pair indexing and resuming an interrupted all-vs-all run"""
+    try:
+        for n in range(2, 40):
+            for k in range(pair_count(n)):
+                assert condensed_index(*pair_at(k, n), n) == k, f"pair_at({k}, {n})"
+        
+        rng = random.Random(4)
+        sequences = [random_protein(rng, 60) for _ in range(12)]
+        full = all_vs_all(sequences, method="lcs", workers=1, chunk_size=5)
+        
+        class Interrupted(Exception):
+            pass
+        
+        def stop_after_two_chunks(done, total):
+            if done >= 10:
+                raise Interrupted()
+        
+        with tempfile.TemporaryDirectory() as folder:
+            checkpoint = os.path.join(folder, "matrix.ckpt")
+            try:
+                all_vs_all(sequences, method="lcs", workers=1, chunk_size=5,
+                           checkpoint=checkpoint, progress=stop_after_two_chunks)
+                raise AssertionError("run was not interrupted")
+            except Interrupted:
+                pass
+            progress = []
+            resumed = all_vs_all(sequences, method="lcs", workers=1, chunk_size=5, checkpoint=checkpoint,
+                                 progress=lambda done, total: progress.append(done))
+        assert progress[0] == 15, f"resume should start after 10 pairs, got {progress[0]}"
+        assert (resumed['identity'] == full['identity']).all(), "resumed identities differ"
+        assert (resumed['similarity'] == full['similarity']).all(), "resumed similarities differ"
+        print(f"✓ PASS: Resumed run matches the full run ({pair_count(12)} pairs)")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Pair index / checkpoint resume failed - {e}")
+        return False
+
+def test_local_protein_source():
+    """Test accession lookups and searches in an indexed local FASTA file"""
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "proteins.fa")
+            with open(path, "w") as handle:
+                handle.write(">sp|P69905|HBA_HUMAN Hemoglobin subunit alpha OS=Homo sapiens OX=9606\n"
+                             "MVLSPADKTNVKAAWGKVGAHAGEYGAE\nALERMFLSF\n"
+                             ">NP_000509.1 hemoglobin subunit beta [Homo sapiens]\nMVHLTPEEKSAVTALWGK\n"
+                             ">NP_571095.1 hemoglobin beta A1 [Danio rerio]\nMVEWTDAERTAILGLWGK\n")
+            source = LocalProteinSource(path)
+            assert os.path.exists(path + ".idx"), "index was not written"
+            index_mtime = os.stat(path + ".idx").st_mtime_ns
+            source.close()
+            source = LocalProteinSource(path)
+            assert os.stat(path + ".idx").st_mtime_ns == index_mtime, "index was rebuilt"
+            
+            alpha = "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSF"
+            assert len(source) == 3, f"expected 3 records, got {len(source)}"
+            assert source.fetch_sequence("P69905") == alpha, "UniProt accession lookup failed"
+            assert source.fetch_sequence("sp|P69905|HBA_HUMAN") == alpha, "UniProt identifier lookup failed"
+            assert source.fetch_sequence("NP_000509.3") == "MVHLTPEEKSAVTALWGK", "versioned lookup failed"
+            assert source.fetch_sequence("NP_999999") is None, "missing accession found"
+            assert source.fetch_sequences(["NP_571095.1", "XX_1", "P69905"]) == {
+                "NP_571095": "MVEWTDAERTAILGLWGK", "P69905": alpha}, "batch lookup failed"
+            
+            hits = source.get_protein_in_organisms("hemoglobin", ["Homo sapiens", "Danio rerio"])
+            assert hits["Homo sapiens"]['accession'] == "P69905", f"unexpected hit {hits}"
+            assert hits["Danio rerio"]['accession'] == "NP_571095", f"unexpected hit {hits}"
+            source.close()
+            
+            with open(path + ".idx", "wb") as handle:
+                handle.write(b"LPSI")  # shorter than the header
+            source = LocalProteinSource(path)
+            assert len(source) == 3, "short index was not rebuilt"
+            source.close()
+        print("✓ PASS: Local FASTA lookups by accession and searches work")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Local protein source failed - {e}")
+        return False
+
+class CountingLimiter:
+    """Limiter stand-in that counts acquired tokens"""
+    
+    def __init__(self):
+        self.tokens = 0
+    
+    def acquire(self):
+        self.tokens += 1
+        return 0.0
+
+def serve_eutils(replies):
+    """Start a local E-utilities stand-in answering with scripted (status, headers, body) replies"""
+    times = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            times.append(time.monotonic())
+            status, headers, body = replies.pop(0)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, times
+
+def test_eutils_retries_are_rate_limited():
+    """Test that 429/5xx replies are retried by the fetcher, through the limiter"""
+    try:
+        fasta = b">NP_000509.1 hemoglobin subunit beta\nMVHLTPEEKSAVTALWGK\n"
+        server, times = serve_eutils([(429, {"Retry-After": "1"}, b""), (200, {}, fasta)])
+        limiter = CountingLimiter()
+        fetcher = ProteinFetcher(base_url=f"http://127.0.0.1:{server.server_port}/", limiter=limiter)
+        try:
+            sequence = fetcher.fetch_sequence("NP_000509.1")
+        finally:
+            server.shutdown()
+        assert sequence == "MVHLTPEEKSAVTALWGK", f"unexpected sequence {sequence}"
+        assert len(times) == 2 and limiter.tokens == 2, f"{len(times)} requests, {limiter.tokens} tokens"
+        assert times[1] - times[0] >= 0.9, "Retry-After was not honoured"
+        
+        server, times = serve_eutils([(500, {}, b""), (503, {}, b""), (200, {}, fasta)])
+        limiter = CountingLimiter()
+        fetcher = ProteinFetcher(base_url=f"http://127.0.0.1:{server.server_port}/", limiter=limiter, retries=1)
+        try:
+            fetcher.fetch_sequence("NP_000509.1")
+            raise AssertionError("error reply was not raised")
+        except Exception as e:
+            assert "503" in str(e), f"unexpected error {e}"
+        finally:
+            server.shutdown()
+        assert len(times) == 2 and limiter.tokens == 2, f"{len(times)} requests, {limiter.tokens} tokens"
+        print("✓ PASS: Error replies retried after Retry-After, each with a limiter token")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: E-utilities retries failed - {e}")
+        return False
+
+def test_all_vs_all_duplicates_and_protein_set():
+    """Test all-vs-all over repeated sequences, from a list and from a ProteinSet"""
+    try:
+        rng = random.Random(5)
+        distinct = [random_protein(rng, rng.randint(5, 40)) for _ in range(6)]
+        sequences = [rng.choice(distinct) for _ in range(20)]
+        proteins = ProteinSet(capacity=16)
+        for index, sequence in enumerate(sequences):
+            proteins.add(f"P{index}", sequence)
+        
+        expected = []
+        for i in range(len(sequences)):
+            for j in range(i + 1, len(sequences)):
+                expected.append(all_vs_all([sequences[i], sequences[j]], workers=1)['identity'][0])
+        for source, workers in ((sequences, 1), (proteins, 1), (proteins, 2)):
+            result = all_vs_all(source, workers=workers, chunk_size=3)
+            assert result['unique'] == len(set(sequences)), f"unique count {result['unique']}"
+            assert result['identity'].tolist() == expected, f"identities differ with {workers} workers"
+        assert result['labels'][:2] == ["P0", "P1"], f"unexpected labels {result['labels'][:2]}"
+        print(f"✓ PASS: {len(expected)} label pairs expanded from {result['unique']} distinct sequences")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: All-vs-all duplicates failed - {e}")
+        return False
+
+def test_concurrent_searches():
+    """Test that concurrent searches keep input order, isolate errors and respect the rate"""
+    try:
+        organisms = ["Homo sapiens", "Danio rerio", "Mus musculus", "Gallus gallus", "Xenopus laevis", "Rattus norvegicus"]
+        transport = SearchTransport(failing="Gallus gallus")
+        rate = 25.0
+        fetcher = ProteinFetcher(limiter=TokenBucket(rate), transport=transport, max_workers=4)
+        results = fetcher.get_proteins(["hemoglobin", "myoglobin"], organisms)
+        
+        assert list(results) == ["hemoglobin", "myoglobin"], f"protein order {list(results)}"
+        for name in results:
+            assert list(results[name]) == organisms, f"organism order {list(results[name])}"
+            for organism, hit in results[name].items():
+                if organism == "Gallus gallus":
+                    assert hit is None, "failing organism has a result"
+                else:
+                    assert hit['accession'] == organism.replace(" ", "_"), f"{organism} got {hit}"
+        
+        # TokenBucket(rate) allows one request at once, then one per 1/rate seconds
+        times = sorted(transport.times)
+        assert len(times) == 2 * (2 * len(organisms) - 1), f"{len(times)} requests"
+        for k, sent in enumerate(times):
+            assert sent - times[0] >= (k - 1) / rate - 0.005, f"request {k} sent too early"
+        print(f"✓ PASS: {len(times)} requests from 4 threads in order, errors isolated, within {rate:g}/s")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Concurrent searches failed - {e}")
+        return False
+
+def take_shared_tokens(task):
+    """Acquire tokens from a shared bucket file and return when each was granted"""
+    path, rate, count = task
+    limiter = SharedTokenBucket(rate, path=path)
+    times = []
+    for _ in range(count):
+        limiter.acquire()
+        times.append(time.monotonic())
+    return times
+
+def test_shared_limiter_across_processes():
+    """Test that two processes sharing a bucket file stay within its rate together"""
+    try:
+        rate = 20.0
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "ncbi.bucket")
+            with multiprocessing.Pool(2) as pool:
+                granted = pool.map(take_shared_tokens, [(path, rate, 10), (path, rate, 10)])
+            times = sorted(granted[0] + granted[1])
+            for k, sent in enumerate(times):
+                assert sent - times[0] >= (k - 1) / rate - 0.005, f"token {k} granted too early"
+            
+            SharedTokenBucket(rate, path=path).acquire()  # in use: empty until 1/rate from now
+            try:
+                SharedTokenBucket(2 * rate, path=path).acquire()
+                raise AssertionError("bucket in use accepted another rate")
+            except ValueError:
+                pass
+            time.sleep(1.5 / rate)
+            SharedTokenBucket(2 * rate, path=path).acquire()  # idle and refilled: taken over
+        print(f"✓ PASS: {len(times)} tokens across 2 processes within {rate:g}/s; other rates refused")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Shared limiter failed - {e}")
+        return False
+
+def test_result_memo():
+    """Test memo hits and misses, LRU eviction, persistence and result isolation"""
+    try:
+        calls = []
+        
+        def compute(value):
+            return lambda: calls.append(value) or {'value': value, 'items': [value]}
+        
+        memo = ResultMemo(max_entries=2)
+        keys = [memo_key("test", n) for n in range(3)]
+        memo.get(keys[0], compute(0))
+        memo.get(keys[1], compute(1))
+        memo.get(keys[0], compute(0))
+        memo.get(keys[2], compute(2))  # evicts keys[1], the least recently used
+        memo.get(keys[1], compute(1))
+        assert calls == [0, 1, 2, 1], f"computed {calls}"
+        assert memo.stats() == {'entries': 2, 'max_entries': 2, 'hits': 1, 'misses': 4}, f"stats {memo.stats()}"
+        
+        first = memo.get(keys[1], compute(1))
+        first['items'].append("changed")
+        assert memo.get(keys[1], compute(1)) == {'value': 1, 'items': [1]}, "changing a result changed the memo"
+        
+        with tempfile.TemporaryDirectory() as folder:
+            cache = ProteinCache(os.path.join(folder, "cache.sqlite3"))
+            ResultMemo(cache=cache).get(keys[0], compute(0))
+            restarted = ResultMemo(cache=cache)
+            assert restarted.get(keys[0], compute(0)) == {'value': 0, 'items': [0]}, "persisted value differs"
+            assert restarted.stats()['hits'] == 1 and calls.count(0) == 2, "persisted value was recomputed"
+            
+            seq = {'sequence': "MVHLTPEEKSAVTALWGKVNVDEVGGEALGRLL", 'title': "beta"}
+            results = SequenceAnalyzer.compare_sequences(seq, seq, method="global", memo=restarted)
+            results['alignment']['score'] = -1
+            results['seq1']['stats']['length'] = -1
+            again = SequenceAnalyzer.compare_sequences(seq, seq, method="global", memo=restarted)
+            assert again['alignment']['score'] > 0 and again['seq1']['stats']['length'] > 0, \
+                "changing a comparison changed later memo hits"
+            cache.close()
+        print("✓ PASS: Memo counts, evicts, persists and hands out independent results")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Result memo failed - {e}")
+        return False
+
+def test_protein_set():
+    """Test ProteinSet storage, buffer growth, packing and hashable records"""
+    try:
+        rng = random.Random(6)
+        sequences = [random_protein(rng, rng.randint(1, 50)) for _ in range(40)]
+        proteins = ProteinSet(capacity=16)
+        proteins.add("P0", sequences[0], "first")
+        view = proteins.residues(0)
+        for index, sequence in enumerate(sequences[1:], start=1):
+            proteins.add(f"P{index}", sequence.encode())
+        
+        assert len(proteins) == len(sequences), f"{len(proteins)} proteins"
+        assert proteins.buffer.nbytes == sum(map(len, sequences)) > 16, "buffer did not grow past its capacity"
+        assert view.tobytes().decode() == sequences[0], "residues handed out before growing changed"
+        assert [proteins.residues(i).tobytes().decode() for i in range(len(proteins))] == sequences, "residues differ"
+        assert proteins.residues(-1).tobytes().decode() == sequences[-1], "negative index failed"
+        assert proteins.lengths.tolist() == [len(sequence) for sequence in sequences], "lengths differ"
+        assert proteins[0] == ProteinRecord("P0", sequences[0], "first"), "record differs"
+        
+        text = "ACDEFGHIKLMNPQRSTVWYBZXUOJ*-"
+        odd = (text + "ax?").encode()
+        assert bytes(unpack_residues(pack_residues(odd), len(odd))) == (text + "XXX").encode(), "5-bit round trip"
+        packed, offsets = proteins.packed()
+        assert len(packed) == (5 * len(proteins.buffer) + 7) // 8, f"{len(packed)} packed bytes"
+        restored = ProteinSet.from_packed(proteins.accessions, proteins.titles, packed, offsets)
+        assert list(restored) == list(proteins), "unpacked set differs"
+        
+        records = {proteins[0], ProteinRecord("P0", sequences[0], "first"), proteins[1]}
+        assert len(records) == 2, f"{len(records)} distinct records in a set"
+        print(f"✓ PASS: {len(proteins)} proteins stored, grown, packed and hashed")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Protein set failed - {e}")
+        return False
+
+def test_composition_matches_counting():
+    """Test the bincount composition against counting residue by residue"""
+    try:
+        rng = random.Random(7)
+        alphabet = "ARNDCQEGHILKMFPSTWYV"
+        sequences = [random_protein(rng, rng.randint(0, 80)) + rng.choice(["", "X", "UXB", "a"]) for _ in range(30)]
+        counts = composition_matrix(sequences, alphabet)
+        for sequence, row in zip(sequences, counts):
+            composition = {}
+            for residue in sequence:  # the per-residue loop the matrix replaced
+                composition[residue] = composition.get(residue, 0) + 1
+            assert row[:-1].tolist() == [composition.get(residue, 0) for residue in alphabet], "alphabet columns"
+            assert row[-1] == sum(n for residue, n in composition.items() if residue not in alphabet), "other column"
+            
+            stats = SequenceAnalyzer.get_sequence_statistics(sequence, alphabet)
+            assert list(stats['composition']) == list(composition), "residues not in first-appearance order"
+            assert {residue: value['count'] for residue, value in stats['composition'].items()} == composition, \
+                "statistics counts differ"
+        print(f"✓ PASS: Composition of {len(sequences)} sequences matches per-residue counting")
+        return True
+    except Exception as e:
+        print(f"✗ FAIL: Composition failed - {e}")
+        return False
+
+def main():
+    print("=" * 60)
+    print("Protein Comparator Validation Tests")
+    print("=" * 60)
+    print()
+    
+    tests = [
+        ("Versioned accession cache", test_versioned_accession_cache),
+        ("Cache threads and sizes", test_cache_threads_and_sizes),
+        ("Fallback protein source", test_fallback_source_generator),
+        ("Fallback batched lookups", test_fallback_get_proteins_batched),
+        ("FASTA chunk boundaries", test_parse_fasta_chunk_boundaries),
+        ("Alignment scores", test_alignment_scores),
+        ("LCS length", test_lcs_length),
+        ("Pair index and checkpoint resume", test_pair_index_and_checkpoint_resume),
+        ("Local protein source", test_local_protein_source),
+        ("E-utilities retries", test_eutils_retries_are_rate_limited),
+        ("All-vs-all duplicates", test_all_vs_all_duplicates_and_protein_set),
+        ("Concurrent searches", test_concurrent_searches),
+        ("Shared limiter across processes", test_shared_limiter_across_processes),
+        ("Result memo", test_result_memo),
+        ("Protein set", test_protein_set),
+        ("Composition", test_composition_matches_counting),
+    ]
+    
+    results = []
+    for test_name, test_func in tests:
+        print(f"\n{test_name}:")
+        print("-" * 60)
+        result = test_func()
+        results.append(result)
+    
+    print()
+    print("=" * 60)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    print("=" * 60)
+    
+    return all(results)
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if main() else 1)
@@ -1,13 +1,17 @@
 """
 Protein Comparator GUI Application
 
-User interface for comparing protein sequences between humans and zebrafish.
+User interface for comparing protein sequences between the organisms in
+config.ORGANISMS (humans and zebrafish by default).
 """
 
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
 import threading
+
+import config
 from business_logic import ProteinComparator
+from business_logic.pairwise_matrix import square
 
 
 class ProteinComparatorApp:
@@ -137,10 +141,9 @@ class ProteinComparatorApp:
     def _search_worker(self, protein_name):
         """Background worker for search."""
         try:
-            organisms = ["Homo sapiens", "Danio rerio"]
             self.search_results = self.comparator.search_and_compare(
                 protein_name,
-                organisms
+                config.ORGANISMS
             )
             
             self.root.after(0, self.display_search_results, protein_name)
@@ -148,6 +151,11 @@ class ProteinComparatorApp:
         except Exception as e:
             self.root.after(0, self.display_error, str(e))
     
+    @staticmethod
+    def _display_name(organism):
+        """Return the short display name of an organism (e.g. "Human")."""
+        return config.ORGANISM_DISPLAY_NAMES.get(organism, organism)
+    
     def display_search_results(self, protein_name):
         """Display search results."""
         self.results_text.delete(1.0, tk.END)
@@ -155,73 +163,70 @@ class ProteinComparatorApp:
         self.results_text.insert(tk.END, f"Search Results for: {protein_name}\n", "header")
         self.results_text.insert(tk.END, "=" * 80 + "\n\n")
         
-        human_data = self.search_results.get("Homo sapiens")
-        zebrafish_data = self.search_results.get("Danio rerio")
-        
-        # Human results
-        self.results_text.insert(tk.END, "HOMO SAPIENS (Human)\n", "header")
-        if human_data:
-            self.results_text.insert(tk.END, "Status: ", "info")
-            self.results_text.insert(tk.END, "FOUND\n", "success")
-            self.results_text.insert(tk.END, f"Accession: {human_data['accession']}\n", "info")
-            self.results_text.insert(tk.END, f"Sequence Length: {human_data['length']} amino acids\n", "info")
-            self.results_text.insert(tk.END, f"Title: {human_data['title']}\n", "info")
-        else:
-            self.results_text.insert(tk.END, "Status: ", "info")
-            self.results_text.insert(tk.END, "NOT FOUND\n", "error")
-        
-        self.results_text.insert(tk.END, "\n" + "-" * 80 + "\n\n")
-        
-        # Zebrafish results
-        self.results_text.insert(tk.END, "DANIO RERIO (Zebrafish)\n", "header")
-        if zebrafish_data:
-            self.results_text.insert(tk.END, "Status: ", "info")
-            self.results_text.insert(tk.END, "FOUND\n", "success")
-            self.results_text.insert(tk.END, f"Accession: {zebrafish_data['accession']}\n", "info")
-            self.results_text.insert(tk.END, f"Sequence Length: {zebrafish_data['length']} amino acids\n", "info")
-            self.results_text.insert(tk.END, f"Title: {zebrafish_data['title']}\n", "info")
-        else:
+        found = []
+        for index, organism in enumerate(config.ORGANISMS):
+            if index:
+                self.results_text.insert(tk.END, "\n" + "-" * 80 + "\n\n")
+            data = self.search_results.get(organism)
+            self.results_text.insert(
+                tk.END, f"{organism.upper()} ({self._display_name(organism)})\n", "header"
+            )
             self.results_text.insert(tk.END, "Status: ", "info")
-            self.results_text.insert(tk.END, "NOT FOUND\n", "error")
+            if data:
+                found.append(organism)
+                self.results_text.insert(tk.END, "FOUND\n", "success")
+                self.results_text.insert(tk.END, f"Accession: {data['accession']}\n", "info")
+                self.results_text.insert(tk.END, f"Sequence Length: {data['length']} amino acids\n", "info")
+                self.results_text.insert(tk.END, f"Title: {data['title']}\n", "info")
+            else:
+                self.results_text.insert(tk.END, "NOT FOUND\n", "error")
         
         # Comparison section
-        if human_data and zebrafish_data:
-            self.results_text.insert(tk.END, "\n" + "=" * 80 + "\n\n")
-            self.perform_comparison(human_data, zebrafish_data)
+        self.results_text.insert(tk.END, "\n" + "=" * 80 + "\n\n")
+        if len(found) >= 2:
+            self.perform_comparison(found)
         else:
-            self.results_text.insert(tk.END, "\n" + "=" * 80 + "\n\n")
             self.results_text.insert(tk.END, "Note: ", "info")
             self.results_text.insert(
                 tk.END,
-                "Protein must be found in both organisms for comparison.\n",
+                "Protein must be found in at least two organisms for comparison.\n",
                 "error"
             )
-            self.status_label.config(text="Search complete: Protein not found in both organisms", fg="#FF6B6B")
+            self.status_label.config(text="Search complete: Protein not found in enough organisms", fg="#FF6B6B")
     
-    def perform_comparison(self, human_data, zebrafish_data):
-        """Perform sequence comparison."""
+    def perform_comparison(self, organisms):
+        """Perform sequence comparison between the organisms where the protein was found."""
         self.status_label.config(text="Comparing sequences...", fg="#FFD700")
         
         thread = threading.Thread(
             target=self._comparison_worker,
-            args=(human_data, zebrafish_data),
+            args=(organisms,),
             daemon=True
         )
         thread.start()
     
-    def _comparison_worker(self, human_data, zebrafish_data):
-        """Background worker for comparison."""
+    def _comparison_worker(self, organisms):
+        """Background worker for comparison (pairwise for two organisms, all-vs-all for more)."""
         try:
-            self.comparison_results = self.comparator.compare_sequences(
-                human_data,
-                zebrafish_data
-            )
-            self.root.after(0, self.display_comparison_results)
+            if len(organisms) == 2:
+                self.comparison_results = self.comparator.compare_sequences(
+                    self.search_results[organisms[0]],
+                    self.search_results[organisms[1]]
+                )
+                self.root.after(0, self.display_comparison_results, organisms)
+            else:
+                # A handful of organisms runs in this thread: a process pool
+                # would fork the multithreaded Tk process
+                self.comparison_results = self.comparator.compare_all(
+                    {organism: self.search_results[organism] for organism in organisms},
+                    workers=1
+                )
+                self.root.after(0, self.display_matrix_results)
         
         except Exception as e:
             self.root.after(0, self.display_error, str(e))
     
-    def display_comparison_results(self):
+    def display_comparison_results(self, organisms):
         """Display comparison results."""
         if not self.comparison_results:
             return
@@ -263,16 +268,28 @@ class ProteinComparatorApp:
         # Sequence lengths
         self.results_text.insert(tk.END, "\n" + "-" * 80 + "\n\n")
         self.results_text.insert(tk.END, "Sequence Information:\n", "header")
-        self.results_text.insert(
-            tk.END,
-            f"Human sequence length: {results['seq1']['length']} amino acids\n",
-            "info"
-        )
-        self.results_text.insert(
-            tk.END,
-            f"Zebrafish sequence length: {results['seq2']['length']} amino acids\n",
-            "info"
-        )
+        for organism, key in zip(organisms, ('seq1', 'seq2')):
+            self.results_text.insert(
+                tk.END,
+                f"{self._display_name(organism)} sequence length: {results[key]['length']} amino acids\n",
+                "info"
+            )
+        
+        self.status_label.config(text="Comparison complete", fg="#90EE90")
+    
+    def display_matrix_results(self):
+        """Display the all-vs-all identity matrix."""
+        results = self.comparison_results
+        names = [self._display_name(organism) for organism in results['labels']]
+        identity = square(results['identity'], len(names), 100.0)
+        
+        self.results_text.insert(tk.END, "ALL-VS-ALL COMPARISON (identity %)\n", "header")
+        self.results_text.insert(tk.END, "-" * 80 + "\n\n")
+        width = max(8, max(len(name) for name in names) + 2)
+        self.results_text.insert(tk.END, " " * width + "".join(f"{name[:width - 2]:>{width}}" for name in names) + "\n", "info")
+        for name, row in zip(names, identity):
+            self.results_text.insert(tk.END, f"{name:<{width}}", "info")
+            self.results_text.insert(tk.END, "".join(f"{value:>{width}.2f}" for value in row) + "\n", "success")
         
         self.status_label.config(text="Comparison complete", fg="#90EE90")
     